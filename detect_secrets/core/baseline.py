@@ -1,4 +1,6 @@
 import json
+import os
+import subprocess
 import time
 from typing import Any
 from typing import Callable
@@ -10,13 +12,18 @@ from typing import Union
 
 from . import upgrades
 from ..__version__ import VERSION
+from ..exceptions import InvalidBaselineError
 from ..exceptions import UnableToReadBaselineError
 from ..settings import configure_settings_from_baseline
 from ..settings import get_settings
+from ..util import git
 from ..util.importlib import import_modules_from_package
 from ..util.semver import Version
+from .cache import ScanCache
+from .pool import PROCESSES
 from .scan import get_files_to_scan
 from .secrets_collection import SecretsCollection
+from .shard import Shard
 
 
 def create(
@@ -24,21 +31,124 @@ def create(
     should_scan_all_files: bool = False,
     root: str = '',
     num_processors: Optional[int] = None,
+    cache: Optional[ScanCache] = None,
+    shard: Optional[Shard] = None,
+    prefetch: bool = False,
+    backend: str = PROCESSES,
 ) -> SecretsCollection:
-    """Scans all the files recursively in path to initialize a baseline."""
-    kwargs = {}
+    """
+    Scans all the files recursively in path to initialize a baseline.
+
+    :param cache: if provided, files that have been scanned before will not be rescanned.
+    :param shard: if provided, only the files in this shard are scanned.
+    :param prefetch: if True, files are scanned while they are still being listed (see
+        `SecretsCollection.scan_files_pipelined`).
+    :param backend: whether to scan with processes or threads (see `ScanPool`).
+    """
+    # NOTE: Baselines never include plaintext secrets, so there's no need to collect them.
+    kwargs: Dict[str, Any] = {'include_secret_values': False, 'backend': backend}
     if num_processors:
         kwargs['num_processors'] = num_processors
 
-    secrets = SecretsCollection(root=root)
-    secrets.scan_files(
-        *get_files_to_scan(*paths, should_scan_all_files=should_scan_all_files, root=root),
-        **kwargs,
+    if cache:
+        kwargs['cache'] = cache
+        cache.load_git_index(root)
+
+    filenames = (
+        filename
+        for filename in get_files_to_scan(
+            *paths,
+            should_scan_all_files=should_scan_all_files,
+            root=root,
+        )
+        if not shard or shard.contains(filename)
     )
 
+    secrets = SecretsCollection(root=root)
+    if prefetch:
+        secrets.scan_files_pipelined(filenames, **kwargs)
+    else:
+        secrets.scan_files(*filenames, **kwargs)
+
     return secrets
 
 
+def refresh(
+    secrets: SecretsCollection,
+    commit: str,
+    *paths: str,
+    root: str = '',
+    num_processors: Optional[int] = None,
+    cache: Optional[ScanCache] = None,
+    shard: Optional[Shard] = None,
+    backend: str = PROCESSES,
+) -> SecretsCollection:
+    """
+    Like `create`, but only scans the (git tracked) files that have changed since the baseline
+    was generated. Results for all other files are carried over from it.
+
+    This assumes that the baseline was generated with the same settings.
+
+    :param secrets: results of the existing baseline.
+    :param commit: the commit that the existing baseline was generated at.
+    :param shard: if provided, only the files in this shard are included.
+    :raises: CalledProcessError
+    """
+    changed_files = git.get_changed_files(git.get_root_directory(root), commit)
+
+    # NOTE: Baselines never include plaintext secrets, so there's no need to collect them.
+    kwargs: Dict[str, Any] = {'include_secret_values': False, 'backend': backend}
+    if num_processors:
+        kwargs['num_processors'] = num_processors
+
+    if cache:
+        kwargs['cache'] = cache
+        cache.load_git_index(root)
+
+    output = SecretsCollection(root=root)
+    filenames = []
+    for filename in get_files_to_scan(*paths, root=root):
+        if shard and not shard.contains(filename):
+            continue
+
+        if filename in changed_files:
+            filenames.append(filename)
+        elif filename in secrets.files:
+            output[filename] = set(secrets[filename])
+
+    # NOTE: Deleted files are taken care of, since they are no longer files to scan.
+    if filenames:
+        output.scan_files(*filenames, **kwargs)
+
+    return output
+
+
+def get_commit_to_record(root: str = '', baseline_filename: str = '') -> Optional[str]:
+    """
+    For `refresh` to work, the baseline needs to record the commit that it was generated at.
+    However, this is only meaningful if it was generated from that commit (rather than from
+    uncommitted changes on top of it).
+
+    :param baseline_filename: changes to the baseline itself are not considered.
+    :returns: None, if the commit cannot be recorded.
+    """
+    try:
+        git_root = git.get_root_directory(root)
+        commit = git.get_head_commit(git_root)
+        changed_files = git.get_changed_files(git_root, commit)
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return None
+
+    baseline_path = os.path.realpath(baseline_filename) if baseline_filename else ''
+    if any(
+        os.path.realpath(os.path.join(git_root, filename)) != baseline_path
+        for filename in changed_files
+    ):
+        return None
+
+    return commit
+
+
 def load(baseline: Dict[str, Any], filename: str = '') -> SecretsCollection:
     """
     With a given baseline file, load all settings and discovered secrets from it.
@@ -64,8 +174,19 @@ def load_from_file(filename: str) -> Dict[str, Any]:
         raise UnableToReadBaselineError from e
 
 
-def format_for_output(secrets: SecretsCollection, is_slim_mode: bool = False) -> Dict[str, Any]:
-    output = {
+def format_for_output(
+    secrets: SecretsCollection,
+    is_slim_mode: bool = False,
+    commit: Optional[str] = None,
+    shard: Optional[Shard] = None,
+) -> Dict[str, Any]:
+    """
+    :param commit: if provided, the commit that the baseline was generated at (so that it can
+        be refreshed incrementally).
+    :param shard: if provided, the shard that the (partial) baseline was generated for (so
+        that `merge` can check that none are missing).
+    """
+    output: Dict[str, Any] = {
         'version': VERSION,
 
         # This will populate settings of filters and plugins,
@@ -86,6 +207,63 @@ def format_for_output(secrets: SecretsCollection, is_slim_mode: bool = False) ->
             for secret_dict in secret_list:
                 secret_dict.pop('line_number')
 
+    if commit:
+        output['generated_at_commit'] = commit
+
+    if shard:
+        output['shard'] = str(shard)
+
+    return output
+
+
+def merge(*baselines: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Combines partial baselines (see `Shard`) into the baseline that a scan of all their files
+    would have produced.
+
+    :raises: InvalidBaselineError
+    """
+    if not baselines:
+        raise InvalidBaselineError('No baselines to merge.')
+
+    for key in ('version', 'plugins_used', 'filters_used', 'generated_at_commit'):
+        if any(baseline.get(key) != baselines[0].get(key) for baseline in baselines):
+            raise InvalidBaselineError(f'Baselines have different `{key}`.')
+
+    shards = [baseline.get('shard') for baseline in baselines]
+    if any(shards):
+        try:
+            parsed_shards = sorted(Shard.parse(shard or '') for shard in shards)
+            count = parsed_shards[0].count
+            if parsed_shards != [Shard(index, count) for index in range(1, count + 1)]:
+                raise ValueError
+        except ValueError:
+            raise InvalidBaselineError(
+                f'Expected one baseline for each shard, but got: {", ".join(map(str, shards))}',
+            )
+
+    results: Dict[str, Any] = {}
+    for baseline in baselines:
+        for filename, secrets in baseline['results'].items():
+            if filename in results:
+                raise InvalidBaselineError(f'{filename} is in more than one baseline.')
+
+            results[filename] = secrets
+
+    # NOTE: We keep the keys in the same order, so that the output is just like a full scan's.
+    output = {
+        key: value
+        for key, value in baselines[0].items()
+        if key != 'shard'
+    }
+    output['results'] = dict(sorted(results.items()))
+    if 'generated_at' in output:
+        output['generated_at'] = max(
+            baseline['generated_at']
+            for baseline in baselines
+            if 'generated_at' in baseline
+        )
+
     return output
 
 
@@ -0,0 +1,435 @@
+"""
+Most files in a repository don't change between scans, and neither do their results. This
+module offers an (opt-in) persistent cache of scan results, so that a rescan only needs to
+scan files that have changed since the last time they were scanned.
+
+Results are keyed by the file's path and content hash, and a fingerprint of everything else that
+can affect them (the settings, the detect-secrets version, and the files that the settings refer
+to, such as wordlists and custom plugins). The path is part of the key because results depend on
+it too (e.g. through filters, and the file's type), so files with the same contents at different
+paths don't share results. To avoid reading (and hashing) files that have not
+changed, we also remember each file's stat information, in the same way that git's index does.
+Better still, for files tracked by git, we can use the content hashes that git has already
+computed (their blob IDs).
+
+NOTE: The cache never stores secrets in plaintext, so secrets loaded from the cache are just
+like secrets loaded from a baseline (i.e. `secret_value` is None). Similarly, the results of
+verification (if enabled) are cached alongside them, and will not be refreshed until the file
+changes.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import subprocess
+import threading
+import time
+from typing import Any
+from typing import cast
+from typing import Dict
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+from urllib.parse import urlparse
+
+from . import scan
+from ..__version__ import VERSION
+from ..filters.util import compute_file_hash
+from ..settings import get_settings
+from ..util import git
+from .log import log
+from .potential_secret import PotentialSecret
+from .stats import CacheStats
+
+
+DEFAULT_CACHE_DIRECTORY = '.detect-secrets-cache'
+
+# Bump this when the layout of the database changes, so that old caches are discarded.
+SCHEMA_VERSION = 1
+
+
+class ScanCache:
+    DATABASE_FILENAME = 'cache.db'
+
+    # Number of writes before they are committed, so that an interrupted scan still benefits
+    # the next one.
+    COMMIT_INTERVAL = 1000
+
+    def __init__(
+        self,
+        directory: str = DEFAULT_CACHE_DIRECTORY,
+        max_size: int = 256 * 1024 * 1024,
+    ) -> None:
+        """
+        :param directory: where the cache is stored. It will be created if it does not exist.
+        :param max_size: approximate upper bound (in bytes) for the stored results. When
+            exceeded, the least recently used results are evicted.
+
+        :raises: OSError
+        """
+        self.directory = os.path.abspath(directory)
+        self.database = os.path.join(self.directory, self.DATABASE_FILENAME)
+        self.max_size = max_size
+
+        self.hits = 0
+        self.misses = 0
+
+        self._fingerprint: Optional[str] = None
+
+        # Mapping of absolute paths to their content hashes, if known ahead of time.
+        self._known_digests: Dict[str, str] = {}
+
+        # Mapping of filenames to their stat information (or known content hashes), before
+        # they were scanned.
+        self._pending_stats: Dict[str, Tuple[int, int, int]] = {}
+        self._pending_digests: Dict[str, str] = {}
+        self._used_keys: List[Tuple[str, str]] = []
+        self._num_writes = 0
+
+        os.makedirs(self.directory, exist_ok=True)
+        gitignore = os.path.join(self.directory, '.gitignore')
+        if not os.path.exists(gitignore):
+            with open(gitignore, 'w') as f:
+                f.write('# Created by detect-secrets.\n*\n')
+
+        self._connection = _connect(self.database)
+
+    @property
+    def fingerprint(self) -> str:
+        if self._fingerprint is None:
+            self._fingerprint = get_settings_fingerprint()
+
+        return self._fingerprint
+
+    @property
+    def stats(self) -> CacheStats:
+        return CacheStats('Scan cache', self.hits, self.misses)
+
+    def get_reader(self) -> 'CacheReader':
+        """
+        :returns: a lightweight (and picklable) object, so that child processes can look up
+            results by their content hash.
+        """
+        return CacheReader(database=self.database, fingerprint=self.fingerprint)
+
+    def load_git_index(self, path: str = '') -> None:
+        """
+        Uses the blob IDs of (unmodified) tracked files as their content hashes, so that we
+        don't need to read them to know whether they have been scanned before.
+
+        :param path: any path in the git repository. Defaults to the current working directory.
+        """
+        try:
+            root = git.get_root_directory(path)
+        except (subprocess.CalledProcessError, FileNotFoundError):
+            return
+
+        self._known_digests.update(git.get_tracked_file_digests(root))
+
+    def get_known_digest(self, filename: str) -> Optional[str]:
+        if not self._known_digests:
+            return None
+
+        return self._known_digests.get(os.path.realpath(filename))
+
+    def is_cache_file(self, filename: str) -> bool:
+        """The cache directory should never be scanned itself."""
+        path = os.path.abspath(filename)
+        return os.path.commonpath([path, self.directory]) == self.directory
+
+    def get(self, filename: str) -> Optional[List[PotentialSecret]]:
+        """
+        Looks up results without reading the file, if it hasn't changed since it was last
+        scanned.
+
+        :returns: None, if the file needs to be read. In that case, callers are expected to
+            call either `record_hit` or `put` once they have its contents.
+        """
+        digest = self.get_known_digest(filename)
+        if digest:
+            return self._get_by_known_digest(filename, digest)
+
+        try:
+            stat = os.stat(filename)
+        except OSError:
+            return None
+
+        key = (stat.st_size, stat.st_mtime_ns, stat.st_ino)
+        self._pending_stats[filename] = key
+
+        row = self._connection.execute(
+            'SELECT results.digest, results.secrets FROM stats '
+            'JOIN results ON results.filename = stats.filename '
+            'AND results.digest = stats.digest '
+            'WHERE stats.filename = ? AND stats.size = ? AND stats.mtime_ns = ? '
+            'AND stats.inode = ? AND results.fingerprint = ?',
+            (filename, *key, self.fingerprint),
+        ).fetchone()
+        if not row:
+            return None
+
+        cached_digest, data = row
+        self._pending_stats.pop(filename)
+        self._used_keys.append((cached_digest, filename))
+        self.hits += 1
+
+        return _load_secrets(filename, data)
+
+    def record_hit(self, filename: str, digest: str) -> None:
+        """
+        For results that were found through `CacheReader.get`, since the file's stat
+        information has changed, but its contents haven't.
+        """
+        self.hits += 1
+        self._used_keys.append((digest, filename))
+        self._pending_digests.pop(filename, None)
+        self._record_stat(filename, digest)
+
+    def put(self, filename: str, digest: str, secrets: List[PotentialSecret]) -> None:
+        """
+        :param digest: the content hash of the file, as it was scanned.
+        """
+        self.misses += 1
+        digest = self._pending_digests.pop(filename, digest)
+
+        data = json.dumps([
+            {
+                key: value
+                for key, value in secret.json().items()
+                if key != 'filename'
+            }
+            for secret in secrets
+        ])
+        self._connection.execute(
+            'INSERT OR REPLACE INTO results '
+            '(digest, filename, fingerprint, secrets, size, last_used) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            (digest, filename, self.fingerprint, data, len(data), time.time()),
+        )
+        self._record_stat(filename, digest)
+
+    def close(self) -> None:
+        """Persists the results, and evicts old entries if the cache grows too large."""
+        now = time.time()
+        self._connection.executemany(
+            'UPDATE results SET last_used = ? '
+            'WHERE digest = ? AND filename = ? AND fingerprint = ?',
+            ((now, *key, self.fingerprint) for key in self._used_keys),
+        )
+        self._used_keys = []
+
+        self._evict()
+        self._connection.commit()
+        self._connection.close()
+
+    def _get_by_known_digest(self, filename: str, digest: str) -> Optional[List[PotentialSecret]]:
+        row = self._connection.execute(
+            'SELECT secrets FROM results WHERE digest = ? AND filename = ? AND fingerprint = ?',
+            (digest, filename, self.fingerprint),
+        ).fetchone()
+        if not row:
+            # Results will be stored with this digest, so that they can be found next time.
+            self._pending_digests[filename] = digest
+            return None
+
+        self._used_keys.append((digest, filename))
+        self.hits += 1
+
+        return _load_secrets(filename, row[0])
+
+    def _record_stat(self, filename: str, digest: str) -> None:
+        stat = self._pending_stats.pop(filename, None)
+        if stat:
+            # NOTE: Like git's "racily clean" entries, if the file was modified in the same
+            # instant that we recorded it, a later modification may not change its stat
+            # information. Since we can't trust those, we don't record them (and the file will
+            # be hashed next time).
+            size, mtime_ns, inode = stat
+            if mtime_ns < time.time_ns() - 1_000_000_000:
+                self._connection.execute(
+                    'INSERT OR REPLACE INTO stats (filename, size, mtime_ns, inode, digest) '
+                    'VALUES (?, ?, ?, ?, ?)',
+                    (filename, size, mtime_ns, inode, digest),
+                )
+
+        self._num_writes += 1
+        if self._num_writes % self.COMMIT_INTERVAL == 0:
+            self._connection.commit()
+
+    def _evict(self) -> None:
+        total_size = self._connection.execute(
+            'SELECT COALESCE(SUM(size), 0) FROM results',
+        ).fetchone()[0]
+        if total_size <= self.max_size:
+            return
+
+        excess = total_size - self.max_size
+        for rowid, size in self._connection.execute(
+            'SELECT rowid, size FROM results ORDER BY last_used',
+        ).fetchall():
+            if excess <= 0:
+                break
+
+            self._connection.execute('DELETE FROM results WHERE rowid = ?', (rowid,))
+            excess -= size
+
+        # Stat information is only useful if it leads to results.
+        self._connection.execute(
+            'DELETE FROM stats WHERE NOT EXISTS ('
+            'SELECT 1 FROM results WHERE results.filename = stats.filename '
+            'AND results.digest = stats.digest)',
+        )
+
+    def __enter__(self) -> 'ScanCache':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+
+class CacheReader(NamedTuple):
+    database: str
+    fingerprint: str
+
+    def get(self, filename: str, digest: str) -> Optional[List[PotentialSecret]]:
+        """
+        :returns: None, if there are no cached results for these contents.
+        """
+        try:
+            row = _get_read_only_connection(self.database).execute(
+                'SELECT secrets FROM results '
+                'WHERE digest = ? AND filename = ? AND fingerprint = ?',
+                (digest, filename, self.fingerprint),
+            ).fetchone()
+        except sqlite3.Error:
+            return None
+
+        if not row:
+            return None
+
+        return _load_secrets(filename, row[0])
+
+
+def get_settings_fingerprint() -> str:
+    """
+    :returns: a hash of everything (other than the file itself) that may affect the results
+        of scanning a file.
+    """
+    settings = get_settings()
+
+    files = {}
+    for path in [
+        *(config.get('path', '') for config in settings.plugins.values()),
+        *settings.filters,
+    ]:
+        if path.startswith('file://'):
+            files[path] = _get_file_hash(urlparse(path).path)
+
+    for config in settings.filters.values():
+        for key in ('file_name', 'model'):
+            if key in config:
+                files[config[key]] = _get_file_hash(config[key])
+
+    return hashlib.sha1(  # noqa: S324
+        json.dumps(
+            {
+                'version': VERSION,
+                'plugins': settings.json()['plugins_used'],
+
+                # NOTE: We use all the configured filters (rather than those in
+                # `settings.json()`), since default filters can also be disabled.
+                'filters': settings.filters,
+                'files': files,
+                'line_length': [scan.MIN_LINE_LENGTH, scan.MAX_LINE_LENGTH],
+            },
+            sort_keys=True,
+            default=str,
+        ).encode(),
+    ).hexdigest()
+
+
+def _load_secrets(filename: str, data: str) -> List[PotentialSecret]:
+    return [
+        PotentialSecret.load_secret_from_dict({'filename': filename, **item})
+        for item in json.loads(data)
+    ]
+
+
+def _get_file_hash(filename: str) -> str:
+    try:
+        return compute_file_hash(filename)
+    except OSError:
+        return ''
+
+
+# The read-only connection of each thread (see `_get_read_only_connection`).
+_read_only_connection = threading.local()
+
+
+def _get_read_only_connection(database: str) -> sqlite3.Connection:
+    """
+    NOTE: SQLite connections can only be used by the thread that opened them, so each thread
+    (e.g. of a `ScanPool` with the thread backend) opens its own.
+    """
+    cached = getattr(_read_only_connection, 'value', None)
+    if cached and cached[0] == database:
+        return cast(sqlite3.Connection, cached[1])
+
+    connection = sqlite3.connect(f'file:{database}?mode=ro', uri=True, timeout=30)
+    _read_only_connection.value = (database, connection)
+    return connection
+
+
+def _connect(filename: str) -> sqlite3.Connection:
+    """
+    :raises: OSError
+    """
+    try:
+        return _initialize_database(filename)
+    except sqlite3.DatabaseError as e:
+        # The cache is disposable, so we can just start over.
+        log.warning(f'Unable to use scan cache ({e}). Recreating it.')
+        os.remove(filename)
+        return _initialize_database(filename)
+
+
+def _initialize_database(filename: str) -> sqlite3.Connection:
+    """
+    :raises: sqlite3.DatabaseError
+    """
+    connection = sqlite3.connect(filename, timeout=30)
+
+    # This allows child processes to read from the cache, while it's being written to.
+    connection.execute('PRAGMA journal_mode = WAL')
+
+    if connection.execute('PRAGMA user_version').fetchone()[0] != SCHEMA_VERSION:
+        connection.executescript(
+            f"""
+            DROP TABLE IF EXISTS results;
+            DROP TABLE IF EXISTS stats;
+
+            CREATE TABLE results (
+                digest TEXT NOT NULL,
+                filename TEXT NOT NULL,
+                fingerprint TEXT NOT NULL,
+                secrets TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (digest, filename, fingerprint)
+            );
+            CREATE INDEX results_last_used ON results (last_used);
+
+            CREATE TABLE stats (
+                filename TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                inode INTEGER NOT NULL,
+                digest TEXT NOT NULL
+            );
+
+            PRAGMA user_version = {SCHEMA_VERSION};
+            """,
+        )
+
+    return connection
@@ -0,0 +1,91 @@
+"""
+Repositories often contain many copies of the same file (e.g. vendored dependencies, or
+generated code). Rather than scanning each of them, we can scan one of them, and attribute the
+results to all of them.
+
+However, results don't depend only on the file's contents: plugins and filters may also
+consider its name (e.g. its file type, or whether it's a lock file). As such, we only consider
+files to be duplicates if they have the same contents *and* the same basename, and have all
+passed the filename-based filters.
+"""
+import os
+from collections import defaultdict
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+
+from ..settings import get_settings
+from .file_context import FileContext
+
+
+class FileGroup(NamedTuple):
+    # The first filename is the one that will be scanned.
+    filenames: List[str]
+    size: int = 0
+    digest: Optional[str] = None
+
+    @property
+    def duplicates(self) -> List[str]:
+        return self.filenames[1:]
+
+
+def group_duplicate_files(
+    filenames: List[str],
+    get_known_digest: Optional[Callable[[str], Optional[str]]] = None,
+) -> List[FileGroup]:
+    """
+    To avoid reading every file, we only compute the content hashes of files which have the
+    same basename and size as another file.
+
+    :param get_known_digest: for content hashes that are already known (so that those files
+        don't need to be read).
+    """
+    candidates: Dict[Tuple[str, int], List[str]] = defaultdict(list)
+    output = []
+    for filename in filenames:
+        try:
+            size = os.stat(filename).st_size
+        except OSError:
+            output.append(FileGroup([filename]))
+            continue
+
+        candidates[(os.path.basename(filename), size)].append(filename)
+
+    for (_, size), group in candidates.items():
+        if len(group) == 1:
+            output.append(FileGroup(group, size=size))
+            continue
+
+        duplicates: Dict[str, List[str]] = defaultdict(list)
+        for filename in group:
+            digest = get_known_digest(filename) if get_known_digest else None
+            if not digest:
+                try:
+                    digest = FileContext.read(filename).digest
+                except OSError:
+                    output.append(FileGroup([filename], size=size))
+                    continue
+
+            duplicates[digest].append(filename)
+
+        output.extend(
+            FileGroup(group, size=size, digest=digest)
+            for digest, group in duplicates.items()
+        )
+
+    return output
+
+
+def is_deduplication_supported() -> bool:
+    """
+    Custom plugins and filters may depend on a file's name in ways that we can't anticipate,
+    so we can't assume that files with the same contents will have the same results.
+    """
+    settings = get_settings()
+    return not (
+        any('path' in config for config in settings.plugins.values())
+        or any(path.startswith('file://') for path in settings.filters)
+    )
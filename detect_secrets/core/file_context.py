@@ -0,0 +1,106 @@
+"""
+A single scan may need a file's contents in several forms: the raw lines (for context), the
+lines produced by transformers, and the full text (e.g. for PrivateKeyDetector). Rather than
+having each of them read the file from disk, we read it once, and share it for as long as
+the file is being scanned.
+"""
+import hashlib
+import io
+from typing import cast
+from typing import Dict
+from typing import List
+from typing import Optional
+
+from ..custom_types import NamedIO
+from ..transformers import get_transformed_file
+
+
+class FileContext:
+    def __init__(self, filename: str, content: bytes) -> None:
+        self.filename = filename
+        self.content = content
+
+        self._digest: Optional[str] = None
+        self._text: Optional[str] = None
+        self._lines: Optional[List[str]] = None
+        self._transformed_lines: Dict[bool, Optional[List[str]]] = {}
+
+    @classmethod
+    def read(cls, filename: str) -> 'FileContext':
+        """
+        :raises: OSError
+        """
+        with open(filename, 'rb') as f:
+            return cls(filename, f.read())
+
+    @property
+    def size(self) -> int:
+        return len(self.content)
+
+    @property
+    def digest(self) -> str:
+        """
+        A content hash, in the same format as git's blob object IDs (i.e. the output of
+        `git hash-object <filename>`), so that it can be compared against git's index.
+        """
+        if self._digest is None:
+            self._digest = compute_blob_digest(self.content)
+
+        return self._digest
+
+    @property
+    def text(self) -> str:
+        """
+        The decoded contents, as if the file was read with `open(filename).read()`.
+
+        :raises: UnicodeDecodeError
+        """
+        if self._text is None:
+            # This uses the same decoding (and newline translation) as `open` in text mode.
+            self._text = io.TextIOWrapper(io.BytesIO(self.content)).read()
+
+        return self._text
+
+    @property
+    def lines(self) -> List[str]:
+        """
+        Same as `open(filename).readlines()`.
+
+        :raises: UnicodeDecodeError
+        """
+        if self._lines is None:
+            self._lines = self.open().readlines()
+
+        return self._lines
+
+    def open(self) -> NamedIO:
+        """
+        :returns: an in-memory file object with the decoded contents, for functions that
+            expect a file (e.g. transformers).
+        :raises: UnicodeDecodeError
+        """
+        # NOTE: Newlines have already been translated when decoding.
+        file = io.StringIO(self.text)
+        file.name = self.filename
+
+        return cast(NamedIO, file)
+
+    def get_transformed_lines(self, use_eager_transformers: bool = False) -> Optional[List[str]]:
+        """
+        :returns: None, if no transformer could parse this file.
+        :raises: UnicodeDecodeError
+        """
+        if use_eager_transformers not in self._transformed_lines:
+            self._transformed_lines[use_eager_transformers] = get_transformed_file(
+                self.open(),
+                use_eager_transformers=use_eager_transformers,
+            )
+
+        return self._transformed_lines[use_eager_transformers]
+
+
+def compute_blob_digest(content: bytes) -> str:
+    sha1 = hashlib.sha1(f'blob {len(content)}\0'.encode())  # noqa: S324
+    sha1.update(content)
+
+    return sha1.hexdigest()
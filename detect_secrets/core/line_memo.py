@@ -0,0 +1,148 @@
+"""
+Some lines (e.g. license headers, imports, and other boilerplate) repeat many times, across
+many files. Rather than running every plugin's regular expressions on them again, we remember
+what each plugin's `analyze_string` found on the lines that we have recently seen.
+
+NOTE: Only the raw candidates are remembered. Everything that depends on where the line was
+found (e.g. the filename, line number, context and verification) is still computed for every
+occurrence, by the plugin's `analyze_line`.
+
+Since every entry holds its line, long lines (which are rarely repeated anyway, e.g. minified
+code) are not remembered, and neither are any other strings that plugins analyze along the way
+(e.g. `PrivateKeyDetector` analyzes whole files). This keeps the memo's size in check.
+"""
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+from typing import Callable
+from typing import FrozenSet
+from typing import Generator
+from typing import Hashable
+from typing import Iterable
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+from typing import TYPE_CHECKING
+
+from .stats import CacheStats
+
+if TYPE_CHECKING:
+    from detect_secrets.plugins.base import BasePlugin
+
+
+class _Scope(NamedTuple):
+    memo: 'LineMemo'
+    plugin: 'BasePlugin'
+    file_type: Hashable
+    line: str
+
+
+# This is set (by the scan engine) for the duration of a single `analyze_line` call, so that
+# plugins don't need to pass anything through to `analyze_string`.
+_active_scope: 'ContextVar[Optional[_Scope]]' = ContextVar('_active_scope', default=None)
+
+
+class LineMemo:
+    """
+    A bounded, least-recently-used mapping of (plugin, file type, line) to the raw candidates
+    that the plugin found on the line.
+
+    NOTE: This belongs to a single `ScanPlan`, so its entries never outlive the plugins (and
+    configuration) that produced them. It is also shared by all threads that scan with the plan.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        plugins: Iterable['BasePlugin'] = (),
+        max_line_length: int = 256,
+    ) -> None:
+        """
+        :param capacity: the maximum number of entries to hold.
+        :param plugins: the plugins to remember results for. All other plugins are run as per
+            usual.
+        :param max_line_length: longer lines are analyzed as per usual.
+        """
+        self.capacity = capacity
+        self.max_line_length = max_line_length
+        self.hits = 0
+        self.misses = 0
+
+        self._plugin_ids: FrozenSet[int] = frozenset(id(plugin) for plugin in plugins)
+        self._entries: 'OrderedDict[Tuple[int, Hashable, str], Tuple[str, ...]]' = OrderedDict()
+
+        # NOTE: Lines are analyzed outside of the lock, so a line may be analyzed by several
+        # threads at once. That's a small price, compared to serializing all plugins.
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self) -> CacheStats:
+        return CacheStats('Line memo', self.hits, self.misses)
+
+    @contextmanager
+    def scope(
+        self,
+        plugin: 'BasePlugin',
+        file_type: Hashable,
+        line: str,
+    ) -> Generator[None, None, None]:
+        """
+        Within this scope, `analyze_string` results of `plugin` on `line` are remembered (for
+        lines within files of `file_type`).
+        """
+        if (
+            not self.capacity
+            or len(line) > self.max_line_length
+            or id(plugin) not in self._plugin_ids
+        ):
+            yield
+            return
+
+        token = _active_scope.set(_Scope(self, plugin, file_type, line))
+        try:
+            yield
+        finally:
+            _active_scope.reset(token)
+
+    def get(
+        self,
+        key: Tuple[int, Hashable, str],
+        compute: Callable[[], Iterable[str]],
+    ) -> Tuple[str, ...]:
+        with self._lock:
+            try:
+                value = self._entries[key]
+            except KeyError:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return value
+
+        value = tuple(compute())
+        with self._lock:
+            self._entries[key] = value
+            if len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+        return value
+
+
+def analyze_string(plugin: 'BasePlugin', string: str, **kwargs: Any) -> Iterable[str]:
+    """
+    Used by plugins in place of `plugin.analyze_string`, so that repeated lines are only
+    analyzed once (when the scan engine allows it, through `LineMemo.scope`).
+
+    NOTE: This assumes that `analyze_string` only depends on the string, the plugin's own
+    configuration, and the file type (which is what `kwargs` are derived from).
+    """
+    scope = _active_scope.get()
+    if not scope or scope.plugin is not plugin or string != scope.line:
+        return plugin.analyze_string(string, **kwargs)
+
+    return scope.memo.get(
+        (id(plugin), scope.file_type, string),
+        lambda: plugin.analyze_string(string, **kwargs),
+    )
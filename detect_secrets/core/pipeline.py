@@ -0,0 +1,179 @@
+"""
+Scanning a repository takes three kinds of work: listing its files, reading them, and scanning
+them. `SecretsCollection.scan_files` does them one after the other: all files are listed before
+any of them is scanned, and each worker blocks whenever it reads a file. On network filesystems
+(or with cold caches), this leaves the workers waiting on I/O for much of the scan.
+
+Instead, these stages can run concurrently:
+
+    1. Files are listed in a background thread.
+    2. A few threads read the files ahead of the workers (since reads release the GIL).
+    3. The workers scan the files that have already been read (see `ScanPool.imap_unordered`).
+
+Each stage only runs ahead of the next by a bounded number of files, so that a fast producer
+(e.g. a large repository on a fast disk) doesn't buffer the whole repository in memory.
+"""
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+from queue import Full
+from queue import Queue
+from typing import Any
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Set
+from typing import TypeVar
+
+from .file_context import compute_blob_digest
+
+
+# Number of threads that read files ahead of the workers.
+PREFETCH_THREADS = int(os.getenv('CHECKOV_PREFETCH_THREADS', '4'))
+
+# Number of files that each stage may run ahead of the next.
+PREFETCH_QUEUE_SIZE = int(os.getenv('CHECKOV_PREFETCH_QUEUE_SIZE', '64'))
+
+# In bytes. Larger files are read by the workers themselves, rather than sent to them.
+MAX_PREFETCH_SIZE = int(os.getenv('CHECKOV_MAX_PREFETCH_SIZE', str(1024 * 1024)))
+
+# NOTE: Since files are scanned as they are found, batches are kept small, so that workers
+# get to them early (rather than waiting for a batch to fill up).
+BATCH_SIZE = 256 * 1024
+BATCH_LENGTH = 64
+
+T = TypeVar('T')
+
+
+class PrefetchedFile(NamedTuple):
+    path: str
+
+    # If None, the file could not be read (or was too large to send to workers), so workers
+    # will read it themselves.
+    content: Optional[bytes] = None
+    digest: Optional[str] = None
+
+
+def iterate_in_thread(iterable: Iterable[T], maxsize: int = PREFETCH_QUEUE_SIZE) -> Iterator[T]:
+    """
+    Consumes the iterable in a background thread (e.g. so that files are still being listed
+    while others are scanned). Exceptions are raised to the caller.
+    """
+    queue: 'Queue[Any]' = Queue(maxsize)
+    is_stopped = threading.Event()
+    done = object()
+
+    def put(item: Any) -> bool:
+        while not is_stopped.is_set():
+            try:
+                queue.put(item, timeout=0.1)
+                return True
+            except Full:
+                pass
+
+        return False
+
+    def run() -> None:
+        iterator = iter(iterable)
+        try:
+            for item in iterator:
+                if not put(item):
+                    return
+        except Exception as e:
+            put(_Error(e))
+            return
+        finally:
+            # e.g. so that generators can clean up, if the caller stopped early.
+            close = getattr(iterator, 'close', None)
+            if close:
+                close()
+
+        put(done)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = queue.get()
+            if item is done:
+                return
+            if isinstance(item, _Error):
+                raise item.error
+
+            yield item
+    finally:
+        is_stopped.set()
+        thread.join()
+
+
+def prefetch(
+    paths: Iterable[str],
+    should_hash: bool = False,
+    num_threads: int = PREFETCH_THREADS,
+    max_pending: int = PREFETCH_QUEUE_SIZE,
+) -> Iterator[PrefetchedFile]:
+    """
+    Reads files in a thread pool, and yields them as soon as they are read (rather than in
+    order, so that a slow read doesn't hold up the others).
+
+    :param should_hash: if True, also computes their content hashes (see `FileContext.digest`).
+    """
+    with ThreadPoolExecutor(max_workers=num_threads) as executor:
+        pending: Set['Future[PrefetchedFile]'] = set()
+        for path in paths:
+            pending.add(executor.submit(_read_file, path, should_hash))
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+
+def batch(
+    files: Iterable[PrefetchedFile],
+    max_size: int = BATCH_SIZE,
+    max_length: int = BATCH_LENGTH,
+) -> Iterator[List[PrefetchedFile]]:
+    output: List[PrefetchedFile] = []
+    size = 0
+    for file in files:
+        output.append(file)
+        size += len(file.content or b'')
+        if size >= max_size or len(output) >= max_length:
+            yield output
+            output = []
+            size = 0
+
+    if output:
+        yield output
+
+
+def _read_file(path: str, should_hash: bool) -> PrefetchedFile:
+    try:
+        if os.stat(path).st_size > MAX_PREFETCH_SIZE:
+            return PrefetchedFile(path)
+
+        with open(path, 'rb') as f:
+            content = f.read()
+    except OSError:
+        # NOTE: Workers take care of logging this (unless the file is filtered out anyway).
+        return PrefetchedFile(path)
+
+    return PrefetchedFile(
+        path,
+        content=content,
+        digest=compute_blob_digest(content) if should_hash else None,
+    )
+
+
+class _Error(NamedTuple):
+    error: Exception
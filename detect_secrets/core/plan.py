@@ -0,0 +1,164 @@
+"""
+Everything that the scan engine derives from the configured plugins and filters, computed once
+(rather than for every file, line, and secret that we scan).
+"""
+from __future__ import annotations
+
+import os
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import FrozenSet
+from typing import Sequence
+from typing import Tuple
+from typing import TYPE_CHECKING
+
+from ..settings import get_filters
+from ..settings import get_plugins
+from ..settings import get_settings
+from ..util.inject import get_call_adapter
+from ..util.threads import synchronized_cache
+from .line_memo import LineMemo
+from .prefilter import Prefilter
+
+if TYPE_CHECKING:
+    from detect_secrets.custom_types import SelfAwareCallable
+    from detect_secrets.plugins.base import BasePlugin
+
+
+# These are the combinations of parameters that the scan engine asks for filters with.
+FILTER_BUCKETS = (
+    ('filename',),
+    ('line',),
+    ('secret',),
+    ('context',),
+)
+
+# The maximum number of (plugin, file type, line) results to remember (see `LineMemo`).
+# Setting this to 0 disables it.
+LINE_MEMO_SIZE = int(os.getenv('CHECKOV_LINE_MEMO_SIZE', '100000'))
+
+# Longer lines are not remembered. Together with the above, this bounds the memory that the line
+# memo takes up (i.e. the lines that it holds) to a few dozen megabytes.
+LINE_MEMO_MAX_LINE_LENGTH = int(os.getenv('CHECKOV_LINE_MEMO_MAX_LINE_LENGTH', '256'))
+
+
+class ScanPlan:
+    """
+    NOTE: This should be treated as read-only. If the settings change, a new plan is built
+    (see `get_scan_plan`).
+    """
+
+    def __init__(
+        self,
+        plugins: Sequence[BasePlugin],
+        filters: Sequence[SelfAwareCallable],
+    ) -> None:
+        self.plugins = plugins
+        self.filters = filters
+        self.prefilter = Prefilter(plugins)
+
+        # NOTE: We can't make assumptions about how custom plugins analyze strings, so we
+        # don't remember their results.
+        plugin_configs = get_settings().plugins
+        self.line_memo = LineMemo(
+            LINE_MEMO_SIZE,
+            plugins=[
+                plugin
+                for plugin in plugins
+                if 'path' not in plugin_configs.get(type(plugin).__name__, {})
+            ],
+            max_line_length=LINE_MEMO_MAX_LINE_LENGTH,
+        )
+
+        # Mapping of required filter parameters to the filters that accept them.
+        self.filter_buckets: Dict[FrozenSet[str], Tuple[SelfAwareCallable, ...]] = {}
+        for parameters in FILTER_BUCKETS:
+            self.get_filters_with_parameter(*parameters)
+
+        # These are populated as the scan engine asks for them, since the parameters depend on
+        # the call site (see `get_call_adapter`). Threads may race to populate the same entry,
+        # which is harmless, since they compute the same value.
+        self.filter_adapters: Dict[
+            Tuple[FrozenSet[str], Tuple[str, ...]],
+            Tuple[Tuple[SelfAwareCallable, Callable[..., Any]], ...],
+        ] = {}
+        self.plugin_adapters: Dict[
+            Tuple[int, str, Tuple[str, ...]],
+            Tuple[BasePlugin, Callable[..., Any]],
+        ] = {}
+
+    def get_filters_with_parameter(self, *parameters: str) -> Tuple[SelfAwareCallable, ...]:
+        """See `detect_secrets.core.scan.get_filters_with_parameter`."""
+        key = frozenset(parameters)
+        try:
+            return self.filter_buckets[key]
+        except KeyError:
+            pass
+
+        self.filter_buckets[key] = tuple(
+            filter_fn
+            for filter_fn in self.filters
+            if key <= filter_fn.injectable_variables
+        )
+        return self.filter_buckets[key]
+
+    def get_filter_adapters(
+        self,
+        required_parameters: Sequence[str],
+        parameters: Tuple[str, ...],
+    ) -> Tuple[Tuple[SelfAwareCallable, Callable[..., Any]], ...]:
+        """
+        :returns: the filters that accept `required_parameters`, along with functions to call
+            them with `parameters` (positionally).
+        """
+        key = (frozenset(required_parameters), parameters)
+        try:
+            return self.filter_adapters[key]
+        except KeyError:
+            pass
+
+        self.filter_adapters[key] = tuple(
+            (filter_fn, get_call_adapter(filter_fn, parameters))
+            for filter_fn in self.get_filters_with_parameter(*required_parameters)
+        )
+        return self.filter_adapters[key]
+
+    def get_plugin_adapter(
+        self,
+        plugin: BasePlugin,
+        method_name: str,
+        parameters: Tuple[str, ...],
+    ) -> Callable[..., Any]:
+        """
+        :returns: a function to call `plugin.<method_name>` with `parameters` (positionally).
+        """
+        # NOTE: Plugins aren't hashable, so we key by their identity instead. We also hold on
+        # to the plugin itself, so that its id can't be reused by another object.
+        key = (id(plugin), method_name, parameters)
+        try:
+            return self.plugin_adapters[key][1]
+        except KeyError:
+            pass
+
+        adapter = get_call_adapter(getattr(plugin, method_name), parameters)
+        self.plugin_adapters[key] = (plugin, adapter)
+        return adapter
+
+
+def get_scan_plan() -> ScanPlan:
+    """
+    The plan is rebuilt whenever the plugins or filters are re-initialized (e.g. through
+    `Settings.configure_plugins`, `Settings.configure_filters`, or `cache_bust`).
+    """
+    plan = _get_scan_plan()
+    if plan.plugins is not get_plugins() or plan.filters is not get_filters():
+        _get_scan_plan.cache_clear()
+        plan = _get_scan_plan()
+
+    return plan
+
+
+@synchronized_cache
+def _get_scan_plan() -> ScanPlan:
+    return ScanPlan(get_plugins(), get_filters())
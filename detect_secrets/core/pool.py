@@ -0,0 +1,255 @@
+"""
+Starting a pool of workers is expensive: each worker needs to be configured with the scan's
+settings, which means importing plugins, building the wordlist's automaton, and loading the
+gibberish model. For a single scan, this is a small price to pay. However, services that scan
+many (small) repositories pay it for every scan.
+
+A `ScanPool` keeps its workers warm across scans. Workers are configured once, when they start,
+and are only replaced when the settings (or the files that they refer to) change between scans.
+
+Alternatively, workers can be threads. On free-threaded builds of Python, threads scan in
+parallel, without any of these costs: they share the settings (and plugins) of the process, and
+files and results don't need to be sent between processes.
+"""
+import atexit
+import contextvars
+import json
+import multiprocessing as mp
+from functools import lru_cache
+from functools import partial
+from multiprocessing.pool import Pool
+from multiprocessing.pool import ThreadPool
+from queue import Queue
+from typing import Any
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+from typing import Optional
+from typing import Tuple
+from typing import TYPE_CHECKING
+from typing import TypeVar
+
+from . import scan
+from . import verification
+from ..plugins.base import scan_scope
+from ..settings import cache_bust
+from ..settings import configure_settings_from_baseline
+from ..settings import get_settings
+from ..util.threads import is_gil_enabled
+from .cache import get_settings_fingerprint
+from .cache import ScanCache
+from .log import log
+from .plan import get_scan_plan
+from .potential_secret import PotentialSecret
+
+if TYPE_CHECKING:
+    from .secrets_collection import SecretsCollection
+
+
+T = TypeVar('T')
+
+_DONE = object()
+
+# Kinds of workers.
+PROCESSES = 'processes'
+THREADS = 'threads'
+BACKENDS = (PROCESSES, THREADS)
+
+
+class ScanPool:
+    def __init__(self, num_processors: Optional[int] = None, backend: str = PROCESSES) -> None:
+        """
+        :param num_processors: defaults to the number of CPUs.
+        :param backend: whether workers are processes, or threads (which only scan in parallel
+            on free-threaded builds of Python).
+        :raises: ValueError
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f'Invalid backend: {backend}')
+
+        self.num_processors = num_processors or mp.cpu_count()
+        self.backend = backend
+
+        # NOTE: Workers are only started once they are needed.
+        self._pool: Optional[Pool] = None
+
+        # The fingerprint of the settings that the workers were started with.
+        self._fingerprint = ''
+
+    def scan_files(
+        self,
+        *filenames: str,
+        root: str = '',
+        cache: Optional[ScanCache] = None,
+    ) -> 'SecretsCollection':
+        """See `SecretsCollection.scan_files`."""
+        # We need to import this here, otherwise it will result in a circular dependency.
+        from .secrets_collection import SecretsCollection
+
+        secrets = SecretsCollection(root=root)
+        secrets.scan_files(*filenames, cache=cache, pool=self)
+        return secrets
+
+    def scan_diff(self, diff: str) -> 'SecretsCollection':
+        """
+        See `SecretsCollection.scan_diff`.
+
+        :raises: UnidiffParseError
+        """
+        from .secrets_collection import SecretsCollection
+
+        secrets = SecretsCollection()
+        for secret in self.apply(_scan_diff, diff):
+            secrets[secret.filename].add(secret)
+
+        return secrets
+
+    def imap_unordered(
+        self,
+        func: Callable[..., T],
+        iterable: Iterable[Any],
+        max_pending: Optional[int] = None,
+    ) -> Iterator[T]:
+        """
+        Like `Pool.imap_unordered`, but `func` is run with the current settings.
+
+        NOTE: `func` needs to be picklable (i.e. a module-level function, or a partial of one).
+
+        :param max_pending: if provided, `iterable` is only consumed while fewer than this many
+            of its items are waiting on results. Otherwise, it is consumed as fast as possible,
+            which lets lazy producers (see `pipeline`) run arbitrarily far ahead of the workers.
+        """
+        func = self._wrap(func)
+        if not max_pending:
+            return self._get_pool().imap_unordered(func, iterable)
+
+        return self._imap_bounded(func, iterable, max_pending)
+
+    def apply(self, func: Callable[..., T], *args: Any) -> T:
+        """Runs `func` in a worker, with the current settings."""
+        return self._get_pool().apply(self._wrap(func), args)
+
+    def close(self) -> None:
+        """Waits for outstanding work to finish, and stops the workers."""
+        if self._pool:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def _imap_bounded(
+        self,
+        func: Callable[..., T],
+        iterable: Iterable[Any],
+        max_pending: int,
+    ) -> Iterator[T]:
+        pool = self._get_pool()
+        results: 'Queue[Tuple[bool, Any]]' = Queue()
+        num_pending = 0
+        iterator = iter(iterable)
+        while True:
+            # NOTE: We wait on results before consuming the next item, rather than after.
+            while num_pending >= max_pending or not results.empty():
+                yield _get_result(results)
+                num_pending -= 1
+
+            item = next(iterator, _DONE)
+            if item is _DONE:
+                break
+
+            pool.apply_async(
+                func,
+                (item,),
+                callback=lambda result: results.put((True, result)),
+                error_callback=lambda error: results.put((False, error)),
+            )
+            num_pending += 1
+
+        for _ in range(num_pending):
+            yield _get_result(results)
+
+    def _wrap(self, func: Callable[..., T]) -> Callable[..., T]:
+        if self.backend == THREADS:
+            return partial(_run_in_thread, func)
+
+        return func
+
+    def _get_pool(self) -> Pool:
+        fingerprint = get_settings_fingerprint() if self.backend == PROCESSES else ''
+        if self._pool and fingerprint != self._fingerprint:
+            # Workers can't be sent new settings, so we start new ones with them instead.
+            self.close()
+
+        if self._pool:
+            return self._pool
+
+        if self.backend == THREADS:
+            if is_gil_enabled():
+                log.warning(
+                    'The GIL is enabled, so threads will not scan in parallel. '
+                    'Scanning with processes is likely faster.',
+                )
+
+            # NOTE: Threads share the scan plan (and the plugins and filters that it holds), so
+            # we build it upfront, rather than having threads race to do so.
+            get_scan_plan()
+            self._pool = ThreadPool(processes=self.num_processors)
+        else:
+            self._pool = mp.Pool(
+                processes=self.num_processors,
+                initializer=_configure_worker,
+                initargs=(json.dumps(get_settings().json()),),
+            )
+            self._fingerprint = fingerprint
+
+        return self._pool
+
+    def __enter__(self) -> 'ScanPool':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+
+@lru_cache(maxsize=1)
+def get_scan_pool() -> ScanPool:
+    """
+    For long-lived processes, this offers a pool that is shared by all their scans (and is
+    stopped when they exit).
+    """
+    pool = ScanPool()
+    atexit.register(pool.close)
+    return pool
+
+
+def _get_result(results: 'Queue[Tuple[bool, Any]]') -> Any:
+    """
+    :raises: whatever the worker raised.
+    """
+    is_successful, result = results.get()
+    if not is_successful:
+        raise result
+
+    return result
+
+
+def _configure_worker(settings: str) -> None:
+    """
+    NOTE: This is only ever called within workers, when they start.
+    """
+    cache_bust()
+    configure_settings_from_baseline(json.loads(settings))
+
+
+def _run_in_thread(func: Callable[..., T], *args: Any) -> T:
+    """
+    Threads already share the current settings, so unlike processes, they don't need to be
+    configured. However, they run `func` in an empty context, just like processes would (e.g.
+    rather than sharing the caller's verification memo, as threads may inherit it).
+    """
+    return contextvars.Context().run(func, *args)
+
+
+@verification.memoize()
+@scan_scope()
+def _scan_diff(diff: str) -> Iterable[PotentialSecret]:
+    return list(scan.scan_diff(diff))
@@ -2,12 +2,33 @@ import hashlib
 from typing import Any
 from typing import Dict
 from typing import Optional
+from typing import Tuple
 from typing import Union
 
 from ..util.color import AnsiColor
 from ..util.color import colorize
 
 
+# If two PotentialSecrets have the same values for these fields, they are considered equal.
+# Note that line numbers aren't included in this, because line numbers are subject to change.
+FIELDS_TO_COMPARE = ('filename', 'secret_hash', 'type')
+
+# The fields that are sent between processes (see `PotentialSecret.pack`), in this order. The
+# filename is left out, since it's shared by all the secrets found in the same file.
+PACKED_FIELDS = (
+    'type',
+    'secret_hash',
+    'line_number',
+    'is_secret',
+    'is_verified',
+    'is_added',
+    'is_removed',
+    'is_multiline',
+    'check_id',
+    'secret_value',
+)
+
+
 class PotentialSecret:
     """This custom data type represents a string found, matching the
     plugin rules defined in SecretsCollection, that has the potential
@@ -55,10 +76,7 @@ class PotentialSecret:
         self.is_multiline = is_multiline
         self.check_id = check_id
 
-        # If two PotentialSecrets have the same values for these fields,
-        # they are considered equal. Note that line numbers aren't included
-        # in this, because line numbers are subject to change.
-        self.fields_to_compare = ['filename', 'secret_hash', 'type']
+        self.fields_to_compare = list(FIELDS_TO_COMPARE)
 
     def set_secret(self, secret: str) -> None:
         self.secret_hash: str = self.hash_secret(secret)
@@ -106,6 +124,31 @@ class PotentialSecret:
 
         return output
 
+    def pack(self, include_secret_value: bool = True) -> Tuple[Any, ...]:
+        """
+        Pickling a PotentialSecret copies all of its attributes (by name). When sending many
+        of them between processes, this is a far more compact alternative.
+
+        :param include_secret_value: the plaintext secret is usually not needed once the scan
+            is over, so there's no need to send it along.
+        """
+        output = tuple(getattr(self, field) for field in PACKED_FIELDS)
+        if not include_secret_value:
+            output = (*output[:-1], None)
+
+        return output
+
+    @classmethod
+    def unpack(cls, filename: str, data: Tuple[Any, ...]) -> 'PotentialSecret':
+        """The reverse of `pack`."""
+        # NOTE: We skip `__init__`, since the secret has already been hashed.
+        output = cls.__new__(cls)
+        output.__dict__.update(zip(PACKED_FIELDS, data))
+        output.filename = filename
+        output.fields_to_compare = list(FIELDS_TO_COMPARE)
+
+        return output
+
     def json(self) -> Dict[str, Union[str, int, bool]]:
         """Custom JSON encoder"""
         attributes: Dict[str, Union[str, int, bool]] = {
@@ -0,0 +1,350 @@
+"""
+The vast majority of lines in a codebase don't contain anything that our plugins are looking for.
+Rather than running every plugin on every line, we use cheaper checks to determine which plugins
+are worth running on a given line:
+
+    1. Plugins can declare literals that must be present in a line for them to find anything
+       (see `BasePlugin.required_literals`). We look for all of them at once, with a single
+       multi-substring index.
+
+    2. The `denylist` patterns of regex based plugins are combined into a single regex, so we
+       only hand a line to the plugins that own a pattern matching it.
+
+    3. Plugins that support it are run over the whole file at once, and we only hand them the
+       lines that their patterns matched.
+
+Plugins that we can't reason about are run on every line, as usual.
+"""
+from __future__ import annotations
+
+import re
+from bisect import bisect_right
+from itertools import accumulate
+from typing import AbstractSet
+from typing import Callable
+from typing import cast
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Pattern
+from typing import Sequence
+from typing import Set
+from typing import Tuple
+from typing import TYPE_CHECKING
+
+from ..plugins.base import RegexBasedDetector
+
+if TYPE_CHECKING:
+    from detect_secrets.plugins.base import BasePlugin
+
+
+# Yields the values of all literals found in a given string.
+Matcher = Callable[[str], Iterable[int]]
+
+# These can be scoped to a single group (e.g. `(?i:...)`), without affecting other patterns.
+SCOPED_FLAGS = {
+    re.IGNORECASE: 'i',
+    re.MULTILINE: 'm',
+    re.DOTALL: 's',
+    re.VERBOSE: 'x',
+}
+
+
+class Prefilter:
+    def __init__(self, plugins: Sequence[BasePlugin]) -> None:
+        self.plugins = plugins
+
+        # Mapping of plugin index to the patterns that are run over the whole buffer at once,
+        # for plugins that support it (see `RegexBasedDetector.supports_buffer_scan`).
+        self.buffer_patterns: Dict[int, Sequence[Pattern]] = {}
+        for index, plugin in enumerate(plugins):
+            patterns = _get_buffer_patterns(plugin)
+            if patterns is not None:
+                self.buffer_patterns[index] = patterns
+
+        line_plugins = [
+            None if index in self.buffer_patterns else plugin
+            for index, plugin in enumerate(plugins)
+        ]
+
+        # If every plugin scans the whole buffer, we only ever need to look at candidate lines.
+        self.scans_every_line = any(plugin is not None for plugin in line_plugins)
+
+        self.literals = LiteralIndex(line_plugins)
+
+        # Mapping of plugin index (to preserve the order of plugins) to its patterns.
+        self.patterns: Dict[int, Sequence[Pattern]] = {}
+
+        alternatives: List[str] = []
+        for index, line_plugin in enumerate(line_plugins):
+            if line_plugin is None:
+                continue
+
+            patterns = _get_combinable_patterns(line_plugin)
+            if patterns is None:
+                continue
+
+            self.patterns[index] = patterns
+
+            # Anchored plugins are already filtered by the literal index, so we only need
+            # to check their patterns on the (rare) lines that contain one of their literals.
+            if index not in self.literals.plugin_indices:
+                alternatives.extend(_scope_pattern(pattern) for pattern in patterns)
+
+        self.regex: Optional[Pattern] = None
+        if alternatives:
+            self.regex = re.compile('|'.join(alternatives))
+
+        # Plugins that we can't reason about, and therefore, need to run on every line.
+        self.unfiltered_plugins = [
+            line_plugin
+            for index, line_plugin in enumerate(line_plugins)
+            if (
+                line_plugin is not None
+                and index not in self.patterns
+                and index not in self.literals.plugin_indices
+            )
+        ]
+
+    def scan_buffer(self, lines: Sequence[str]) -> Dict[int, Set[int]]:
+        """
+        Runs the patterns of buffer scanning plugins over all lines at once, rather than
+        line by line.
+
+        :returns: mapping of line position (in `lines`) to the indices of buffer scanning
+            plugins which should be run on that line.
+        """
+        if not self.buffer_patterns or not lines:
+            return {}
+
+        contents = [line[:-1] if line.endswith('\n') else line for line in lines]
+        buffer = '\n'.join(contents)
+        if buffer.count('\n') != len(lines) - 1:
+            # Some lines contain newlines of their own (e.g. through transformers), so we can't
+            # map offsets back to lines. Scan them line by line instead.
+            return {
+                position: set(self.buffer_patterns)
+                for position in range(len(lines))
+            }
+
+        line_offsets = [0]
+        line_offsets.extend(accumulate(len(content) + 1 for content in contents))
+
+        lowered_buffer: Optional[str] = None
+        output: Dict[int, Set[int]] = {}
+        for index, patterns in self.buffer_patterns.items():
+            plugin = self.plugins[index]
+            if plugin.required_literals or plugin.required_literals_ignore_case:
+                if lowered_buffer is None and plugin.required_literals_ignore_case:
+                    lowered_buffer = buffer.lower()
+
+                # Not finding any of them is a cheap way to know that we can skip this plugin.
+                if not (
+                    any(literal in buffer for literal in plugin.required_literals)
+                    or any(
+                        literal.lower() in cast(str, lowered_buffer)
+                        for literal in plugin.required_literals_ignore_case
+                    )
+                ):
+                    continue
+
+            for pattern in patterns:
+                for match in pattern.finditer(buffer):
+                    position = bisect_right(line_offsets, match.start()) - 1
+                    output.setdefault(position, set()).add(index)
+
+        return output
+
+    def get_plugins_for_line(
+        self,
+        line: str,
+        buffer_indices: AbstractSet[int] = frozenset(),
+    ) -> Sequence[BasePlugin]:
+        """
+        :param buffer_indices: buffer scanning plugins that matched this line,
+            as returned by `scan_buffer`.
+        :returns: the plugins (in configured order) that may find secrets on this line.
+        """
+        anchored_indices = self.literals.search(line)
+        has_regex_match = bool(self.regex and self.regex.search(line))
+        if not anchored_indices and not has_regex_match and not buffer_indices:
+            return self.unfiltered_plugins
+
+        return [
+            plugin
+            for index, plugin in enumerate(self.plugins)
+            if (
+                index in buffer_indices
+                if index in self.buffer_patterns
+                else self._should_scan_line(index, line, anchored_indices, has_regex_match)
+            )
+        ]
+
+    def _should_scan_line(
+        self,
+        index: int,
+        line: str,
+        anchored_indices: Set[int],
+        has_regex_match: bool,
+    ) -> bool:
+        is_anchored = index in self.literals.plugin_indices
+        if is_anchored and index not in anchored_indices:
+            return False
+
+        if index not in self.patterns:
+            return True
+
+        if not is_anchored and not has_regex_match:
+            return False
+
+        # Since lines with hits are rare, we can afford to check each plugin's patterns
+        # individually. This is needed anyway, since the combined regex only reports the
+        # first alternative that matches, and patterns of different plugins may overlap.
+        return any(pattern.search(line) for pattern in self.patterns[index])
+
+
+class LiteralIndex:
+    """Finds all plugins with a required literal in a given line, in a single pass."""
+
+    def __init__(self, plugins: Sequence[Optional[BasePlugin]]) -> None:
+        """
+        :param plugins: None values are placeholders, so that indices line up with the
+            configured plugins.
+        """
+        # Mapping of literal to the indices of plugins that require it.
+        case_sensitive: Dict[str, Set[int]] = {}
+        case_insensitive: Dict[str, Set[int]] = {}
+        for index, plugin in enumerate(plugins):
+            if plugin is None:
+                continue
+
+            for literal in plugin.required_literals:
+                case_sensitive.setdefault(literal, set()).add(index)
+
+            for literal in plugin.required_literals_ignore_case:
+                case_insensitive.setdefault(literal.lower(), set()).add(index)
+
+        self.plugin_indices: Set[int] = {
+            index
+            for mapping in (case_sensitive, case_insensitive)
+            for indices in mapping.values()
+            for index in indices
+        }
+
+        self.case_sensitive = _build_matcher(case_sensitive)
+        self.case_insensitive = _build_matcher(case_insensitive)
+
+    def search(self, line: str) -> Set[int]:
+        """
+        :returns: indices of plugins which have (at least) one required literal in this line.
+        """
+        output: Set[int] = set()
+        if self.case_sensitive:
+            output.update(self.case_sensitive(line))
+
+        if self.case_insensitive:
+            output.update(self.case_insensitive(line.lower()))
+
+        return output
+
+
+def _build_matcher(literals: Dict[str, Set[int]]) -> Optional[Matcher]:
+    """
+    :returns: a function that yields the values of all literals found in a given string.
+        We use the Aho-Corasick algorithm if it's installed (through the `word_list` extra),
+        otherwise, we fallback to substring checks (which are still performed in C).
+    """
+    if not literals:
+        return None
+
+    try:
+        import ahocorasick  # type:ignore[import-not-found]
+    except ImportError:
+        return _SubstringMatcher(literals)
+
+    automaton = ahocorasick.Automaton()
+    for literal, indices in literals.items():
+        automaton.add_word(literal, indices)
+
+    automaton.make_automaton()
+
+    def search(string: str) -> Iterable[int]:
+        for _, indices in automaton.iter(string):
+            yield from indices
+
+    return search
+
+
+class _SubstringMatcher:
+    def __init__(self, literals: Dict[str, Set[int]]) -> None:
+        self.literals: List[Tuple[str, Set[int]]] = list(literals.items())
+
+    def __call__(self, string: str) -> Iterable[int]:
+        for literal, indices in self.literals:
+            if literal in string:
+                yield from indices
+
+
+def _get_buffer_patterns(plugin: BasePlugin) -> Optional[Sequence[Pattern]]:
+    """
+    :returns: None if this plugin needs to be run line by line.
+    """
+    if (
+        not isinstance(plugin, RegexBasedDetector)
+        or not plugin.supports_buffer_scan
+        or not plugin.is_denylist_exhaustive
+    ):
+        return None
+
+    patterns = tuple(plugin.denylist)
+    if not all(isinstance(pattern, Pattern) for pattern in patterns):
+        return None
+
+    return patterns
+
+
+def _get_combinable_patterns(plugin: BasePlugin) -> Optional[Sequence[Pattern]]:
+    """
+    :returns: None if this plugin's patterns can't be safely merged into the combined regex.
+    """
+    if not isinstance(plugin, RegexBasedDetector) or not plugin.is_denylist_exhaustive:
+        return None
+
+    patterns = tuple(plugin.denylist)
+    for pattern in patterns:
+        if (
+            not isinstance(pattern, Pattern)
+            or not isinstance(pattern.pattern, str)
+
+            # Group names must be unique across the combined regex, and back-references
+            # would point to the wrong groups once combined.
+            or pattern.groupindex
+            or re.search(r'\\[1-9]|\(\?P=', pattern.pattern)
+
+            # Global inline flags (e.g. a leading `(?i)`) would apply to the other patterns.
+            or re.search(r'\(\?[aiLmsux]+\)', pattern.pattern)
+            or pattern.flags & ~(re.UNICODE | sum(SCOPED_FLAGS))
+        ):
+            return None
+
+        try:
+            re.compile(_scope_pattern(pattern))
+        except re.error:
+            return None
+
+    return patterns
+
+
+def _scope_pattern(pattern: Pattern) -> str:
+    flags = ''.join(
+        letter
+        for flag, letter in SCOPED_FLAGS.items()
+        if pattern.flags & flag
+    )
+    if not flags:
+        return f'(?:{pattern.pattern})'
+
+    # A trailing comment in a verbose pattern would otherwise swallow the closing bracket.
+    suffix = '\n' if pattern.flags & re.VERBOSE else ''
+    return f'(?{flags}:{pattern.pattern}{suffix})'
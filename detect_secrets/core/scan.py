@@ -2,32 +2,43 @@ from __future__ import annotations
 
 import os
 import subprocess
-from functools import lru_cache
+import threading
+from contextlib import nullcontext
+from pathlib import Path
 from typing import Any
 from typing import cast
 from typing import Generator
 from typing import Iterable
 from typing import List
+from typing import Mapping
 from typing import Optional
+from typing import Sequence
 from typing import Set
 from typing import Tuple
 from typing import TYPE_CHECKING
-from typing import Union
 
-from ..custom_types import NamedIO
+from . import verification
+from ..constants import VerifiedResult
 from ..custom_types import SelfAwareCallable
 from ..filters.allowlist import is_line_allowlisted
+from ..plugins.base import ScanHooks
+from ..plugins.base import set_scan_hooks
 from ..settings import get_filters
 from ..settings import get_plugins
 from ..settings import get_settings
-from ..transformers import get_transformed_file
 from ..util import git
 from ..util.code_snippet import CodeSnippet
 from ..util.code_snippet import get_code_snippet
-from ..util.inject import call_function_with_arguments
 from ..util.path import get_relative_path
+from .file_context import FileContext
+from .line_memo import analyze_string
+from .line_memo import LineMemo
 from .log import log
+from .plan import get_scan_plan
 from .potential_secret import PotentialSecret
+from .verification import Candidate
+from .walk import walk
+from .walk import walk_tracked_files
 from detect_secrets.util.filetype import determine_file_type
 from detect_secrets.util.filetype import FileType
 
@@ -38,15 +49,60 @@ MIN_LINE_LENGTH = int(os.getenv('CHECKOV_MIN_LINE_LENGTH', '5'))
 MAX_LINE_LENGTH = int(os.getenv('CHECKOV_MAX_LINE_LENGTH', '100000'))
 
 
-@lru_cache(maxsize=1)
+class _ScanHooks(ScanHooks):
+    def analyze_string(self, plugin: BasePlugin, string: str, **kwargs: Any) -> Iterable[str]:
+        # NOTE: Repeated lines are only analyzed once, when scanning files (see `LineMemo`).
+        return analyze_string(plugin, string, **kwargs)
+
+    def should_verify(self) -> bool:
+        # NOTE: When scanning files, secrets are verified afterwards (and concurrently), so
+        # plugins don't do it themselves (see `_process_line_based_plugins`).
+        return verification.is_enabled() and not verification.is_deferred()
+
+    def verify_secret(
+        self,
+        plugin: BasePlugin,
+        secret: str,
+        context: Optional[CodeSnippet] = None,
+        raw_context: Optional[CodeSnippet] = None,
+    ) -> Optional[VerifiedResult]:
+        return verification.verify_secret(
+            plugin,
+            secret=secret,
+            context=context,
+            raw_context=raw_context,
+        )
+
+    def uses_context(self, plugin: BasePlugin) -> bool:
+        return verification.uses_context(plugin)
+
+
+set_scan_hooks(_ScanHooks())
+
+
+# The most recently read file (and its lines), by each thread (see `read_raw_lines`).
+_raw_lines = threading.local()
+
+
 def read_raw_lines(file_name: str) -> List[str]:
+    """
+    NOTE: Each thread remembers the last file it read, since secrets are usually found in the
+    same file one after another (whereas a shared cache would be evicted by other threads).
+    """
+    cached = getattr(_raw_lines, 'value', None)
+    if cached and cached[0] == file_name:
+        return cast(List[str], cached[1])
+
     try:
         with open(file_name) as f:
-            return f.readlines()
+            lines = f.readlines()
     except OSError:
         log.debug(f"Can't open file {file_name}")
         return []
 
+    _raw_lines.value = (file_name, lines)
+    return lines
+
 
 def get_files_to_scan(
     *paths: str,
@@ -76,56 +132,82 @@ def get_files_to_scan(
 
     :param root: if not specified, will assume current repository as root.
     """
+    # NOTE: The scan prepends the root (as given) to files before filtering them.
+    filter_root = root
     if root:
         root = os.path.realpath(root)
 
-    # First, we determine the appropriate filtering mode to be used.
-    # If this is True, then it will consider everything to be valid.
-    # Otherwise, it will only list the files that are valid.
-    valid_paths: Union[bool, Set[str]] = True
+    # If we only scan the files tracked by git (in some directory), we ask git for them, rather
+    # than walking the directories.
+    tracked_files: Optional[Set[str]] = None
+    if not should_scan_all_files and any(os.path.isdir(path) for path in paths):
+        try:
+            git_root = git.get_root_directory(root)
+        except subprocess.CalledProcessError:
+            log.warning('Did not detect git repository. Try scanning all files instead.')
+            return
+
+        # NOTE: If the files need to be relative to a different directory than git's (which
+        # they're listed relative to), they're just used to filter the walked files.
+        if Path(git_root) == Path(root or os.path.realpath(os.getcwd())):
+            yield from walk_tracked_files(
+                *(
+                    path
+                    for path in (
+                        _get_path_in_repository(path, root=root, git_root=git_root)
+                        for path in paths
+                    )
+                    if path is not None
+                ),
+                root=git_root,
+            )
+            return
+
+        tracked_files = git.get_tracked_files(git_root)
+        if not tracked_files:
+            return
+
     for path in paths:
-        # Since this is not a directory, we assume that it is a file proper, and automatically
-        # consider it valid.
-        if not os.path.isdir(path):
+        if not os.path.isfile(path):
+            yield from walk(
+                path,
+                root=root or os.getcwd(),
+                tracked_files=tracked_files,
+                filter_root=filter_root,
+            )
             continue
 
-        if not should_scan_all_files:
-            try:
-                valid_paths = git.get_tracked_files(git.get_root_directory(root))
-            except subprocess.CalledProcessError:
-                log.warning('Did not detect git repository. Try scanning all files instead.')
-                valid_paths = False
+        relative_path = get_relative_path(
+            root=root or os.getcwd(),
+            path=os.path.join(root or os.getcwd(), path),
+        )
+        if not relative_path:
+            # e.g. symbolic links may be pointing outside the root directory
+            continue
 
-        # Since valid_paths attempts to get *all* tracked files in the repository, we just need
-        # to initialize it once.
-        break
+        if (
+            tracked_files is None
+            or relative_path in tracked_files
+        ):
+            yield relative_path
 
-    if not valid_paths:
-        yield from []
-        return
 
-    for path in paths:
-        iterator = (
-            cast(List[Tuple], [(root or os.getcwd(), None, [path])])
-            if os.path.isfile(path)
-            else os.walk(path)
-        )
+def _get_path_in_repository(path: str, root: str, git_root: str) -> Optional[str]:
+    """
+    :returns: the path relative to the root of the git repository, if it is in it.
+    """
+    # NOTE: Just like `get_files_to_scan`, files are relative to the root, whereas directories
+    # are relative to the current directory.
+    if os.path.isfile(path):
+        path = os.path.join(root or os.getcwd(), path)
 
-        for path_root, _, filenames in iterator:
-            for filename in filenames:
-                relative_path = get_relative_path(
-                    root=root or os.getcwd(),
-                    path=os.path.join(path_root, filename),
-                )
-                if not relative_path:
-                    # e.g. symbolic links may be pointing outside the root directory
-                    continue
+    path = os.path.realpath(path)
+    if path == git_root:
+        return '.'
+    elif path.startswith(os.path.join(git_root, '')):
+        return path[len(git_root) + 1:]
 
-                if (
-                    valid_paths is True
-                    or relative_path in valid_paths
-                ):
-                    yield relative_path
+    return None
 
 
 def scan_line(line: str) -> Generator[PotentialSecret, None, None]:
@@ -159,7 +241,28 @@ def scan_line(line: str) -> Generator[PotentialSecret, None, None]:
     )
 
 
-def scan_file(filename: str) -> Generator[PotentialSecret, None, None]:
+def scan_file(
+    filename: str,
+    file_context: Optional[FileContext] = None,
+) -> Generator[PotentialSecret, None, None]:
+    """
+    :param file_context: if the file has already been read, its contents.
+    """
+    yield from (
+        candidate.secret
+        for candidate in _scan_file_for_candidates(filename, file_context=file_context)
+    )
+
+
+def _scan_file_for_candidates(
+    filename: str,
+    file_context: Optional[FileContext] = None,
+    verify: bool = True,
+) -> Generator[Candidate, None, None]:
+    """
+    :param verify: if False, secrets are not verified (nor filtered by the verification
+        policy), so that the caller can do so instead (see `verification.Candidate.detach`).
+    """
     if not get_plugins():  # pragma: no cover
         log.error('No plugins to scan with!')
         return
@@ -167,37 +270,61 @@ def scan_file(filename: str) -> Generator[PotentialSecret, None, None]:
     if _is_filtered_out(required_filter_parameters=['filename'], filename=filename):
         return
 
-    try:
-        has_secret = False
-        for lines in _get_lines_from_file(filename):
-            lines_list = [
-                (number, value, False, False)
-                for number, value in enumerate(lines, start=1)
-            ]
-            for secret in _process_line_based_plugins(
-                    lines=lines_list,
-                    filename=filename,
-            ):
-                has_secret = True
-                yield secret
+    if not file_context:
+        try:
+            file_context = FileContext.read(filename)
+        except OSError:
+            log.warning(f'Unable to open file: {filename}')
+            return
 
-            if has_secret:
-                break
-    except OSError:
-        log.warning(f'Unable to open file: {filename}')
-        return
+    has_secret = False
+    for lines in _get_lines_from_file(file_context):
+        lines_list = [
+            (number, value, False, False)
+            for number, value in enumerate(lines, start=1)
+        ]
+        for candidate in _process_line_based_plugins(
+                lines=lines_list,
+                filename=filename,
+                file_context=file_context,
+                verify=verify,
+        ):
+            has_secret = True
+            yield candidate
+
+        if has_secret:
+            break
 
 
-def scan_diff(diff: str, commit_hash: Optional[str] = '') -> Generator[PotentialSecret, None, None]:
+def scan_diff(
+    diff: str,
+    commit_hash: Optional[str] = '',
+    only_added_lines: bool = False,
+    file_contexts: Optional[Mapping[str, FileContext]] = None,
+) -> Generator[PotentialSecret, None, None]:
     """
+    :param only_added_lines: if True, removed lines are not scanned, and the diff's context
+        lines are used as the context of the added lines (instead of their neighboring changes).
+    :param file_contexts: mapping of filenames (as they appear in the diff) to the contents of
+        the files that the diff results in. Plugins that look at whole files (e.g.
+        PrivateKeyDetector) use these, rather than reading the files from disk.
     :raises: ImportError
     """
     if not get_plugins():   # pragma: no cover
         log.error('No plugins to scan with!')
         return
 
-    for filename, lines in _get_lines_from_diff(diff):
-        yield from _process_line_based_plugins(lines, filename=filename, commit_hash=commit_hash)
+    for filename, lines in _get_lines_from_diff(diff, only_added_lines=only_added_lines):
+        yield from (
+            candidate.secret
+            for candidate in _process_line_based_plugins(
+                lines,
+                filename=filename,
+                commit_hash=commit_hash,
+                file_context=file_contexts.get(filename) if file_contexts else None,
+                only_added_lines=only_added_lines,
+            )
+        )
 
 
 def scan_for_allowlisted_secrets_in_file(filename: str) -> Generator[PotentialSecret, None, None]:
@@ -222,17 +349,19 @@ def scan_for_allowlisted_secrets_in_file(filename: str) -> Generator[PotentialSe
     # NOTE: Unlike `scan_file`, we don't ever have to use eager file transformers, since we already
     # know which lines we want to scan.
     try:
-        for lines in _get_lines_from_file(filename):
-            lines_list = [
-                (number, value, False, False)
-                for number, value in enumerate(lines, start=1)
-            ]
-            yield from _scan_for_allowlisted_secrets_in_lines(lines_list, filename)
-            break
+        file_context = FileContext.read(filename)
     except OSError:
         log.warning(f'Unable to open file: {filename}')
         return
 
+    for lines in _get_lines_from_file(file_context):
+        lines_list = [
+            (number, value, False, False)
+            for number, value in enumerate(lines, start=1)
+        ]
+        yield from _scan_for_allowlisted_secrets_in_lines(lines_list, filename)
+        break
+
 
 def scan_for_allowlisted_secrets_in_diff(diff: str) -> Generator[PotentialSecret, None, None]:
     if not get_plugins():   # pragma: no cover
@@ -276,47 +405,39 @@ def _scan_for_allowlisted_secrets_in_lines(
             )
 
 
-def _get_lines_from_file(filename: str) -> Generator[List[str], None, None]:
+def _get_lines_from_file(file_context: FileContext) -> Generator[List[str], None, None]:
     """
     This attempts to get lines in a given file. If no more lines are needed, the caller
     is responsible for breaking out of this loop.
-
-    :raises: IOError
-    :raises: FileNotFoundError
     """
-    with open(filename) as f:
-        log.info(f'Checking file: {filename}')
+    log.info(f'Checking file: {file_context.filename}')
 
-        try:
-            lines = get_transformed_file(cast(NamedIO, f))
-            if not lines:
-                lines = f.readlines()
-        except UnicodeDecodeError:
-            # We flat out ignore binary files
-            return
+    try:
+        lines = file_context.get_transformed_lines()
+        if not lines:
+            lines = file_context.lines
+    except UnicodeDecodeError:
+        # We flat out ignore binary files
+        return
 
-        yield lines
+    yield lines
 
-        # If the above lines don't prove to be useful to the caller, try using eager transformers.
-        f.seek(0)
-        lines = get_transformed_file(cast(NamedIO, f), use_eager_transformers=True)
-        if not lines:
-            return
+    # If the above lines don't prove to be useful to the caller, try using eager transformers.
+    lines = file_context.get_transformed_lines(use_eager_transformers=True)
+    if not lines:
+        return
 
-        yield lines
+    yield lines
 
 
-def _get_lines_from_diff(diff: str) -> \
+def _get_lines_from_diff(diff: str, only_added_lines: bool = False) -> \
         Generator[Tuple[str, List[Tuple[int, str, bool, bool]]], None, None]:
     """
+    :param only_added_lines: if True, this yields the new side of the diff instead (i.e. added
+        lines, along with their context lines), so that it reads like an excerpt of the file.
     :raises: ImportError
     """
-    # Local imports, so that we don't need to require unidiff for versions of
-    # detect-secrets that don't use it.
-    from unidiff import PatchSet  # type:ignore[import-untyped]
-
-    patch_set = PatchSet.from_string(diff)
-    for patch_file in patch_set:
+    for patch_file in parse_diff(diff):
         filename = patch_file.path
         if _is_filtered_out(required_filter_parameters=['filename'], filename=filename):
             continue
@@ -330,44 +451,116 @@ def _get_lines_from_diff(diff: str) -> \
                 )
                 for chunk in patch_file
                 # target_lines refers to incoming (new) changes
-                for line in list(chunk)
-                if line.is_added or line.is_removed
+                for line in (chunk.target_lines() if only_added_lines else list(chunk))
+                if line.is_added or line.is_removed or only_added_lines
             ],
         )
 
 
+def parse_diff(diff: str) -> Any:
+    """
+    :returns: the changes to each file (see `unidiff.PatchSet`).
+    :raises: ImportError
+    :raises: UnidiffParseError
+    """
+    # Local imports, so that we don't need to require unidiff for versions of
+    # detect-secrets that don't use it.
+    from unidiff import PatchSet  # type:ignore[import-untyped]
+
+    return PatchSet.from_string(diff)
+
+
 def _process_line_based_plugins(
     lines: List[Tuple[int, str, bool, bool]],
     filename: str,
     commit_hash: Optional[str] = '',
-) -> Generator[PotentialSecret, None, None]:
+    file_context: Optional[FileContext] = None,
+    verify: bool = True,
+    only_added_lines: bool = False,
+) -> Generator[Candidate, None, None]:
+    """
+    :param file_context: if scanning a file, this saves us from reading it again.
+    :param verify: see `_scan_file_for_candidates`.
+    :param only_added_lines: if True, the other lines are only used for context.
+    """
+    if not verification.is_enabled():
+        yield from _find_line_based_candidates(
+            lines,
+            filename,
+            commit_hash,
+            file_context,
+            only_added_lines,
+        )
+        return
+
+    # NOTE: We find all secrets before verifying any of them, so that they can be verified
+    # concurrently.
+    with verification.deferred():
+        candidates = list(
+            _find_line_based_candidates(
+                lines,
+                filename,
+                commit_hash,
+                file_context,
+                only_added_lines,
+            ),
+        )
+
+    if verify:
+        yield from verification.apply_verification_policy(candidates)
+    else:
+        yield from candidates
+
+
+def _find_line_based_candidates(
+    lines: List[Tuple[int, str, bool, bool]],
+    filename: str,
+    commit_hash: Optional[str] = '',
+    file_context: Optional[FileContext] = None,
+    only_added_lines: bool = False,
+) -> Generator[Candidate, None, None]:
+    """
+    :returns: the secrets found, along with what's needed to verify them.
+    """
     line_content = [line[1] for line in lines]
+    plan = get_scan_plan()
+    prefilter = plan.prefilter
+    file_type = determine_file_type(filename)
+    buffer_candidates = prefilter.scan_buffer(line_content)
 
     # NOTE: We iterate through lines *then* plugins, because we want to quit early if any of the
     # filters return True.
-    index = 0
-    for line_number, line, is_added, is_removed in lines:
+    positions: Iterable[int] = (
+        range(len(lines))
+        if prefilter.scans_every_line
+        else sorted(buffer_candidates)
+    )
+    for position in positions:
+        line_number, line, is_added, is_removed = lines[position]
+        if only_added_lines and not is_added:
+            continue
+
         line = line.strip()
-        index += 1
+        index = position + 1
         if len(line) < MIN_LINE_LENGTH or len(line) > MAX_LINE_LENGTH:
             # skip lines which have too few or too many none whitespace chars
             continue
 
-        if not is_added and not is_removed:
-            code_snippet_line_number = line_number
-            raw_code_snippet_lines = read_raw_lines(filename)
-        else:
-            code_snippet_line_number = index
-            raw_code_snippet_lines = line_content
+        plugins = prefilter.get_plugins_for_line(
+            line,
+            buffer_indices=buffer_candidates.get(position, frozenset()),
+        )
+        if not plugins:
+            continue
+
+        code_snippet_line_number = line_number if not is_added and not is_removed else index
 
+        # NOTE: Snippets are views over the lines (see `CodeSnippet.from_lines`), so they're
+        # cheap to create.
         code_snippet = get_code_snippet(
             lines=line_content,
             line_number=code_snippet_line_number,
         )
-        raw_code_snippet = get_code_snippet(
-            lines=raw_code_snippet_lines,
-            line_number=code_snippet_line_number,
-        )
 
         # We apply line-specific filters, and see whether that allows us to quit early.
         if _is_filtered_out(
@@ -378,7 +571,21 @@ def _process_line_based_plugins(
         ):
             continue
 
-        for plugin in get_plugins():
+        if not is_added and not is_removed:
+            raw_code_snippet_lines = (
+                file_context.lines
+                if file_context
+                else read_raw_lines(filename)
+            )
+        else:
+            raw_code_snippet_lines = line_content
+
+        raw_code_snippet = get_code_snippet(
+            lines=raw_code_snippet_lines,
+            line_number=code_snippet_line_number,
+        )
+
+        for plugin in plugins:
             for secret in _scan_line(
                     plugin=plugin,
                     filename=filename,
@@ -387,6 +594,9 @@ def _process_line_based_plugins(
                     context=code_snippet,
                     raw_context=raw_code_snippet,
                     commit_hash=commit_hash,
+                    file_type=file_type,
+                    file_context=file_context,
+                    line_memo=plan.line_memo,
             ):
                 secret.is_removed = is_removed
                 secret.is_added = is_added
@@ -398,17 +608,20 @@ def _process_line_based_plugins(
                         line=line,
                         context=code_snippet,
                 ):
-                    if determine_file_type(filename) == FileType.YAML and secret.secret_value:
+                    if file_type == FileType.YAML and secret.secret_value:
                         # YAML specifically has multi-line string parsing that groups the
                         # different lines as 1.
                         # Calculate actual line number in case of YAML multi-line string
+                        # NOTE: For diffs, lines are looked up by their position in the diff.
                         actual_line_number = line_number
-                        for i, cline in enumerate(raw_code_snippet_lines[actual_line_number - 1:]):
+                        for i, cline in enumerate(
+                            raw_code_snippet_lines[code_snippet_line_number - 1:],
+                        ):
                             if secret.secret_value in cline:
                                 actual_line_number += i
                                 break
                         secret.line_number = actual_line_number
-                    yield secret
+                    yield Candidate(secret, plugin, code_snippet)
 
 
 def _scan_line(
@@ -417,18 +630,28 @@ def _scan_line(
     line: str,
     line_number: int,
     context: CodeSnippet,
+    line_memo: Optional[LineMemo] = None,
     **kwargs: Any,
 ) -> Generator[PotentialSecret, None, None]:
+    """
+    :param line_memo: if supplied, the plugin's analysis of this line is remembered (for other
+        files of the same `file_type`), and reused if the line was seen before.
+    """
     # NOTE: We don't apply filter functions here yet, because we don't have any filters
     # that operate on (filename, line, plugin) without `secret`
-    secrets = call_function_with_arguments(
-        plugin.analyze_line,
-        filename=filename,
-        line=line,
-        line_number=line_number,
-        context=context,
-        **kwargs,
+    analyze_line = get_scan_plan().get_plugin_adapter(
+        plugin,
+        'analyze_line',
+        ('filename', 'line', 'line_number', 'context', *kwargs),
     )
+    scope = (
+        line_memo.scope(plugin, kwargs.get('file_type'), line)
+        if line_memo
+        else nullcontext()
+    )
+    with scope:
+        secrets = analyze_line(filename, line, line_number, context, *kwargs.values())
+
     if not secrets:
         return
 
@@ -445,10 +668,12 @@ def _scan_line(
     )
 
 
-def _is_filtered_out(required_filter_parameters: Iterable[str], **kwargs: Any) -> bool:
-    for filter_fn in get_filters_with_parameter(*required_filter_parameters):
+def _is_filtered_out(required_filter_parameters: Sequence[str], **kwargs: Any) -> bool:
+    filters = get_scan_plan().get_filter_adapters(required_filter_parameters, tuple(kwargs))
+    values = kwargs.values()
+    for filter_fn, adapter in filters:
         try:
-            if call_function_with_arguments(filter_fn, **kwargs):
+            if adapter(*values):
                 if 'secret' in kwargs:
                     debug_msg = f'Skipping "{kwargs["secret"]}" due to `{filter_fn.path}`.'
                 elif list(kwargs.keys()) == ['filename']:
@@ -467,7 +692,7 @@ def _is_filtered_out(required_filter_parameters: Iterable[str], **kwargs: Any) -
     return False
 
 
-def get_filters_with_parameter(*parameters: str) -> List[SelfAwareCallable]:
+def get_filters_with_parameter(*parameters: str) -> Sequence[SelfAwareCallable]:
     """
     The issue of our method of dependency injection is that functions will be called multiple
     times. For example, if we have two functions:
@@ -483,12 +708,9 @@ def get_filters_with_parameter(*parameters: str) -> List[SelfAwareCallable]:
     that accept a minimum set of parameters, to avoid duplicative work. For instance,
 
     >>> get_filters_with_parameter('secret')
-    [bar]
-    """
-    minimum_parameters = set(parameters)
+    (bar,)
 
-    return [
-        filter
-        for filter in get_filters()
-        if minimum_parameters <= filter.injectable_variables
-    ]
+    NOTE: These are resolved once per configuration (see `ScanPlan`), since this is called
+    for every line and secret that we scan.
+    """
+    return get_scan_plan().get_filters_with_parameter(*parameters)
@@ -0,0 +1,71 @@
+"""
+How long a file takes to scan is (roughly) proportional to its size, and file sizes in a
+repository are heavily skewed: a handful of large files (e.g. minified bundles, or generated
+code) can take as long to scan as thousands of small ones.
+
+If files are handed out to workers in the order they were found, a large file that happens to
+be found last keeps one worker busy, long after all the others have run out of work. Conversely,
+handing out small files one at a time means that each of them costs a round trip between
+processes. Instead, we hand out the largest files first (on their own), and batch the small
+files that follow, so that the batches get smaller as the scan nears its end.
+"""
+import contextlib
+import os
+from typing import Iterable
+from typing import List
+from typing import Tuple
+
+from .duplicates import FileGroup
+
+
+# In bytes. Batches of small files are never larger than this, so that the last batches are
+# small enough to even out the workers' loads.
+MAX_BATCH_SIZE = int(os.getenv('CHECKOV_SCAN_MAX_BATCH_SIZE', str(1024 * 1024)))
+
+# Even if the files are tiny, we don't want a single batch to hold up the results of too many
+# of them.
+MAX_BATCH_LENGTH = int(os.getenv('CHECKOV_SCAN_MAX_BATCH_LENGTH', '256'))
+
+# Number of batches to aim for, per worker.
+BATCHES_PER_WORKER = 4
+
+
+def schedule(groups: Iterable[FileGroup], num_workers: int) -> List[List[str]]:
+    """
+    :param groups: the files to scan (only the first of each group is scanned).
+    :returns: batches of filenames, in the order that they should be handed out to workers.
+    """
+    files = sorted(_get_sizes(groups), key=lambda item: item[1], reverse=True)
+    if not files:
+        return []
+
+    # Batches should be small enough so that every worker gets several of them.
+    total_size = sum(size for _, size in files)
+    batch_size = max(1, min(MAX_BATCH_SIZE, total_size // (num_workers * BATCHES_PER_WORKER)))
+
+    output: List[List[str]] = []
+    batch: List[str] = []
+    current_size = 0
+    for filename, size in files:
+        if batch and (current_size + size > batch_size or len(batch) >= MAX_BATCH_LENGTH):
+            output.append(batch)
+            batch = []
+            current_size = 0
+
+        batch.append(filename)
+        current_size += size
+
+    output.append(batch)
+    return output
+
+
+def _get_sizes(groups: Iterable[FileGroup]) -> Iterable[Tuple[str, int]]:
+    for group in groups:
+        filename = group.filenames[0]
+        size = group.size
+        if not size:
+            # Deduplication (which stats every file) may have been skipped.
+            with contextlib.suppress(OSError):
+                size = os.stat(filename).st_size
+
+        yield filename, size
@@ -1,18 +1,42 @@
-import multiprocessing as mp
+import copy
 import os
 from collections import defaultdict
+from contextlib import nullcontext
+from functools import partial
 from typing import Any
+from typing import ContextManager
 from typing import Dict
 from typing import Generator
+from typing import Iterable
+from typing import Iterator
 from typing import List
+from typing import Mapping
+from typing import NamedTuple
 from typing import Optional
 from typing import Set
 from typing import Tuple
 
+from . import pipeline
 from . import scan
+from . import verification
+from ..plugins.base import scan_scope
+from ..util.code_snippet import CodeSnippet
+from .cache import CacheReader
+from .cache import ScanCache
+from .duplicates import FileGroup
+from .duplicates import group_duplicate_files
+from .duplicates import is_deduplication_supported
+from .file_context import FileContext
+from .log import log
+from .plan import get_scan_plan
+from .pool import PROCESSES
+from .pool import ScanPool
 from .potential_secret import PotentialSecret
-from detect_secrets.settings import configure_settings_from_baseline
-from detect_secrets.settings import get_settings
+from .schedule import schedule
+from .stats import CacheStats
+from .stats import report_stats
+from .verification import Candidate
+from detect_secrets.settings import get_plugins
 
 
 class SecretsCollection:
@@ -40,39 +64,187 @@ class SecretsCollection:
     def files(self) -> Set[str]:
         return set(self.data.keys())
 
-    def scan_files(self, *filenames: str, num_processors: Optional[int] = None) -> None:
-        """Just like scan_file, but optimized through parallel processing."""
+    @verification.memoize()
+    def scan_files(
+        self,
+        *filenames: str,
+        num_processors: Optional[int] = None,
+        cache: Optional[ScanCache] = None,
+        pool: Optional[ScanPool] = None,
+        include_secret_values: bool = True,
+        backend: str = PROCESSES,
+    ) -> None:
+        """
+        Just like scan_file, but optimized through parallel processing. Files with identical
+        contents are only scanned once, and secrets are only verified once.
+
+        :param pool: if provided, its (warm) workers are used, rather than starting new ones.
+            In that case, `num_processors` and `backend` are ignored.
+        :param include_secret_values: if False, the plaintext secrets found by other
+            processes are not sent back (so their `secret_value` is None), since they are
+            usually not needed once the scan is over (e.g. for baselines).
+        :param backend: whether to scan with processes or threads (see `ScanPool`).
+        """
         if len(filenames) == 1:
-            self.scan_file(filenames[0])
+            self.scan_file(filenames[0], cache=cache)
+            _report_stats(get_scan_plan().line_memo.stats, cache)
+            return
+
+        paths = [os.path.join(self.root, filename) for filename in filenames]
+        if cache:
+            paths = self._load_from_cache(paths, cache)
+
+        groups = self._group_files(paths, cache)
+        if not groups:
+            _report_stats(CacheStats('Line memo'), cache)
             return
 
-        if not num_processors:
-            num_processors = mp.cpu_count()
+        # Mapping of worker process IDs to their (cumulative) line memo statistics.
+        line_memo_stats: Dict[int, CacheStats] = {}
+        unverified_results = []
+        with _use_pool(pool, num_processors, backend) as p:
+            # NOTE: Workers leave verification to us, so that secrets that occur in many files
+            # (and therefore, in different workers) are still only verified once.
+            for results, (pid, stats) in p.imap_unordered(
+                partial(
+                    _scan_files_in_worker,
+                    reader=cache.get_reader() if cache else None,
+                    verify=False,
+                    include_secret_values=include_secret_values,
+                ),
+                schedule(groups.values(), num_workers=p.num_processors),
+            ):
+                _update_line_memo_stats(line_memo_stats, pid, stats)
+                for result in map(_PackedScanResult.unpack, results):
+                    if result.unverified is not None:
+                        unverified_results.append(result)
+                    else:
+                        self._add_result(groups[result.filename], result, cache)
+
+        for result in _verify_results(unverified_results):
+            self._add_result(groups[result.filename], result, cache)
+
+        _report_stats(sum(line_memo_stats.values(), CacheStats('Line memo')), cache)
+
+    @verification.memoize()
+    def scan_files_pipelined(
+        self,
+        filenames: Iterable[str],
+        num_processors: Optional[int] = None,
+        cache: Optional[ScanCache] = None,
+        pool: Optional[ScanPool] = None,
+        include_secret_values: bool = True,
+        backend: str = PROCESSES,
+    ) -> None:
+        """
+        Like scan_files, but files are scanned while they are still being listed, and read
+        ahead of the workers (see `pipeline`). This hides the latency of reading files (e.g. on
+        network filesystems), though since files aren't known in advance, the largest of them
+        can't be scheduled first.
+        """
+        deduplicate = is_deduplication_supported()
 
-        child_process_settings = get_settings().json()
+        # Mapping of (basename, digest) to the first file with those contents.
+        originals: Dict[Tuple[str, str], str] = {}
+        groups: Dict[str, FileGroup] = {}
 
-        with mp.Pool(
-            processes=num_processors,
-            initializer=configure_settings_from_baseline,
-            initargs=(child_process_settings,),
-        ) as p:
-            for secrets in p.imap_unordered(
-                _scan_file_and_serialize,
-                [os.path.join(self.root, filename) for filename in filenames],
+        def read_files() -> Iterator[pipeline.PrefetchedFile]:
+            for file in pipeline.prefetch(
+                self._get_paths_to_scan(pipeline.iterate_in_thread(filenames), cache),
+                should_hash=deduplicate,
+            ):
+                if file.digest:
+                    key = (os.path.basename(file.path), file.digest)
+                    if key in originals:
+                        groups[originals[key]].filenames.append(file.path)
+                        continue
+
+                    originals[key] = file.path
+
+                groups[file.path] = FileGroup(
+                    [file.path],
+                    size=len(file.content or b''),
+                    digest=file.digest,
+                )
+                yield file
+
+        line_memo_stats: Dict[int, CacheStats] = {}
+        results: List[_ScanResult] = []
+        with _use_pool(pool, num_processors, backend) as p:
+            for packed_results, (pid, stats) in p.imap_unordered(
+                partial(
+                    _scan_prefetched_files_in_worker,
+                    reader=cache.get_reader() if cache else None,
+                    verify=False,
+                    include_secret_values=include_secret_values,
+                ),
+                pipeline.batch(read_files()),
+                max_pending=2 * p.num_processors,
             ):
-                for secret in secrets:
-                    self[os.path.relpath(secret.filename, self.root)].add(secret)
+                _update_line_memo_stats(line_memo_stats, pid, stats)
+                results.extend(map(_PackedScanResult.unpack, packed_results))
+
+        # NOTE: Duplicates may be found after their original was scanned, so results are only
+        # attributed once all files have been found.
+        unverified_results = [result for result in results if result.unverified is not None]
+        for result in _verify_results(unverified_results):
+            self._add_result(groups[result.filename], result, cache)
+
+        for result in results:
+            if result.unverified is None:
+                self._add_result(groups[result.filename], result, cache)
+
+        num_skipped_files = sum(len(group.duplicates) for group in groups.values())
+        if num_skipped_files:
+            num_skipped_bytes = sum(
+                group.size * len(group.duplicates)
+                for group in groups.values()
+            )
+            log.info(
+                f'Skipping {num_skipped_files} files with duplicate contents '
+                f'({num_skipped_bytes} bytes)',
+            )
+
+        _report_stats(sum(line_memo_stats.values(), CacheStats('Line memo')), cache)
 
-    def scan_file(self, filename: str) -> None:
-        for secret in scan.scan_file(os.path.join(self.root, filename)):
+    @verification.memoize()
+    @scan_scope()
+    def scan_file(self, filename: str, cache: Optional[ScanCache] = None) -> None:
+        path = os.path.join(self.root, filename)
+        secrets: Optional[List[PotentialSecret]] = None
+        if not cache:
+            secrets = list(scan.scan_file(path))
+        elif cache.is_cache_file(path):
+            return
+        else:
+            secrets = cache.get(path)
+            if secrets is None:
+                result = _scan_file_with_cache(path, cache.get_reader())
+                secrets = result.secrets
+                _update_cache(cache, path, result.digest, secrets, result.is_cached)
+
+        for secret in secrets:
             self[filename].add(secret)
 
-    def scan_diff(self, diff: str) -> None:
+    @verification.memoize()
+    @scan_scope()
+    def scan_diff(
+        self,
+        diff: str,
+        only_added_lines: bool = False,
+        file_contexts: Optional[Mapping[str, FileContext]] = None,
+    ) -> None:
         """
+        :param only_added_lines: see `scan.scan_diff`.
+        :param file_contexts: see `scan.scan_diff`.
         :raises: UnidiffParseError
         """
         try:
-            for secret in scan.scan_diff(diff):
+            for secret in scan.scan_diff(
+                diff,
+                only_added_lines=only_added_lines,
+                file_contexts=file_contexts,
+            ):
                 self[secret.filename].add(secret)
         except ImportError:     # pragma: no cover
             raise NotImplementedError(
@@ -80,6 +252,103 @@ class SecretsCollection:
                 'installing that package, and try again.',
             )
 
+    def _group_files(
+        self,
+        paths: List[str],
+        cache: Optional[ScanCache] = None,
+    ) -> Dict[str, FileGroup]:
+        """
+        :returns: mapping of filenames to scan, to the group of files they are representing.
+        """
+        if not paths or not is_deduplication_supported():
+            return {path: FileGroup([path]) for path in paths}
+
+        # NOTE: Files that are filtered out by name would never be scanned, so we exclude them
+        # here (rather than attributing results to them).
+        groups = group_duplicate_files(
+            [
+                path
+                for path in paths
+                if not scan._is_filtered_out(required_filter_parameters=['filename'], filename=path)
+            ],
+            get_known_digest=cache.get_known_digest if cache else None,
+        )
+
+        num_skipped_files = sum(len(group.duplicates) for group in groups)
+        if num_skipped_files:
+            num_skipped_bytes = sum(group.size * len(group.duplicates) for group in groups)
+            log.info(
+                f'Skipping {num_skipped_files} files with duplicate contents '
+                f'({num_skipped_bytes} bytes)',
+            )
+
+        return {group.filenames[0]: group for group in groups}
+
+    def _add_result(
+        self,
+        group: FileGroup,
+        result: '_ScanResult',
+        cache: Optional[ScanCache] = None,
+    ) -> None:
+        """Attributes the results of scanning a file, to all the files in its group."""
+        secrets = result.secrets
+        for duplicate in group.filenames:
+            if duplicate != result.filename:
+                secrets = [_copy_secret(secret, duplicate) for secret in secrets]
+
+            if cache:
+                _update_cache(
+                    cache,
+                    duplicate,
+                    result.digest or group.digest,
+                    secrets,
+                    is_cached=result.is_cached and duplicate == result.filename,
+                )
+
+            self._add_secrets(secrets)
+
+    def _get_paths_to_scan(
+        self,
+        filenames: Iterable[str],
+        cache: Optional[ScanCache] = None,
+    ) -> Iterator[str]:
+        """
+        Like `_load_from_cache` (and `_group_files`, for files that are filtered out by name),
+        but lazily.
+        """
+        for filename in filenames:
+            path = os.path.join(self.root, filename)
+            if scan._is_filtered_out(required_filter_parameters=['filename'], filename=path):
+                continue
+
+            if cache:
+                paths = self._load_from_cache([path], cache)
+                if not paths:
+                    continue
+
+            yield path
+
+    def _load_from_cache(self, paths: List[str], cache: ScanCache) -> List[str]:
+        """
+        :returns: the paths that still need to be scanned.
+        """
+        output = []
+        for path in paths:
+            if cache.is_cache_file(path):
+                continue
+
+            secrets = cache.get(path)
+            if secrets is None:
+                output.append(path)
+            else:
+                self._add_secrets(secrets)
+
+        return output
+
+    def _add_secrets(self, secrets: List[PotentialSecret]) -> None:
+        for secret in secrets:
+            self[os.path.relpath(secret.filename, self.root)].add(secret)
+
     def merge(self, old_results: 'SecretsCollection') -> None:
         """
         We operate under an assumption that the latest results are always more accurate,
@@ -297,6 +566,245 @@ class SecretsCollection:
         return output
 
 
-def _scan_file_and_serialize(filename: str) -> List[PotentialSecret]:
-    """Used for multiprocessing, since lambdas can't be serialized."""
-    return list(scan.scan_file(filename))
+class _ScanResult(NamedTuple):
+    filename: str
+    digest: Optional[str]
+    secrets: List[PotentialSecret]
+
+    # Whether the secrets were obtained from the cache.
+    is_cached: bool = False
+
+    # If set, the secrets found still need to be verified (see `_verify_results`).
+    unverified: Optional[List[Candidate]] = None
+
+    def pack(self, include_secret_values: bool = True) -> '_PackedScanResult':
+        """
+        Used to send results to another process, more compactly (see `PotentialSecret.pack`).
+
+        NOTE: Secrets that still need to be verified always include their plaintext.
+        """
+        return _PackedScanResult(
+            filename=self.filename,
+            digest=self.digest,
+            secrets=[secret.pack(include_secret_values) for secret in self.secrets],
+            is_cached=self.is_cached,
+            unverified=[
+                (candidate.secret.pack(), candidate.context)
+                for candidate in self.unverified
+            ] if self.unverified is not None else None,
+        )
+
+
+class _PackedScanResult(NamedTuple):
+    """The form in which a `_ScanResult` is sent between processes (see `_ScanResult.pack`)."""
+    filename: str
+    digest: Optional[str]
+    secrets: List[Tuple[Any, ...]]
+    is_cached: bool
+
+    # Packed secrets, and the context to verify them with. Since candidates are detached before
+    # they are sent (see `Candidate.detach`), there's no plugin to send along.
+    unverified: Optional[List[Tuple[Tuple[Any, ...], Optional[CodeSnippet]]]]
+
+    def unpack(self) -> _ScanResult:
+        """The reverse of `_ScanResult.pack`."""
+        return _ScanResult(
+            filename=self.filename,
+            digest=self.digest,
+            secrets=[PotentialSecret.unpack(self.filename, data) for data in self.secrets],
+            is_cached=self.is_cached,
+            unverified=[
+                Candidate(
+                    PotentialSecret.unpack(self.filename, secret),
+                    None,   # type: ignore
+                    context,
+                )
+                for secret, context in self.unverified
+            ] if self.unverified is not None else None,
+        )
+
+
+def _scan_file_with_cache(
+    filename: str,
+    reader: Optional[CacheReader] = None,
+    verify: bool = True,
+    file_context: Optional[FileContext] = None,
+) -> _ScanResult:
+    """
+    Used for multiprocessing, since lambdas can't be serialized. If there's a cache, files are
+    only scanned if their contents have not been scanned before.
+
+    :param verify: if False, verification is left to the caller (i.e. the parent process).
+    :param file_context: if provided, the file has already been read.
+    """
+    if not reader:
+        return _scan_file_for_result(filename, file_context, verify=verify)
+
+    if not file_context:
+        try:
+            file_context = FileContext.read(filename)
+        except OSError:
+            # This takes care of logging (unless the file is filtered out anyway).
+            return _scan_file_for_result(filename, verify=verify)
+
+    secrets = reader.get(filename, file_context.digest)
+    if secrets is not None:
+        return _ScanResult(filename, file_context.digest, secrets, is_cached=True)
+
+    return _scan_file_for_result(filename, file_context, verify=verify)
+
+
+def _scan_file_for_result(
+    filename: str,
+    file_context: Optional[FileContext] = None,
+    verify: bool = True,
+) -> _ScanResult:
+    digest = file_context.digest if file_context else None
+    candidates = list(
+        scan._scan_file_for_candidates(filename, file_context=file_context, verify=verify),
+    )
+    if verify or not verification.is_enabled():
+        return _ScanResult(filename, digest, [candidate.secret for candidate in candidates])
+
+    return _ScanResult(
+        filename,
+        digest,
+        [],
+        unverified=[candidate.detach() for candidate in candidates],
+    )
+
+
+@scan_scope()
+def _scan_files_in_worker(
+    filenames: List[str],
+    reader: Optional[CacheReader] = None,
+    verify: bool = True,
+    include_secret_values: bool = True,
+) -> Tuple[List[_PackedScanResult], Tuple[int, CacheStats]]:
+    """
+    Like `_scan_file_with_cache`, but for a batch of files (see `schedule`). This also reports
+    the worker's line memo statistics (since they can't be obtained from the worker otherwise).
+
+    :returns: packed results (see `_ScanResult.pack`).
+    """
+    results = [
+        _scan_file_with_cache(filename, reader, verify=verify).pack(include_secret_values)
+        for filename in filenames
+    ]
+    return results, (os.getpid(), get_scan_plan().line_memo.stats)
+
+
+@scan_scope()
+def _scan_prefetched_files_in_worker(
+    files: List[pipeline.PrefetchedFile],
+    reader: Optional[CacheReader] = None,
+    verify: bool = True,
+    include_secret_values: bool = True,
+) -> Tuple[List[_PackedScanResult], Tuple[int, CacheStats]]:
+    """Like `_scan_files_in_worker`, but for files that have (mostly) been read already."""
+    results = [
+        _scan_file_with_cache(
+            file.path,
+            reader,
+            verify=verify,
+            file_context=(
+                FileContext(file.path, file.content)
+                if file.content is not None
+                else None
+            ),
+        ).pack(include_secret_values)
+        for file in files
+    ]
+    return results, (os.getpid(), get_scan_plan().line_memo.stats)
+
+
+def _update_line_memo_stats(
+    line_memo_stats: Dict[int, CacheStats],
+    pid: int,
+    stats: CacheStats,
+) -> None:
+    """
+    Each worker's statistics are cumulative, so we keep the latest of them. Since results
+    arrive out of order (and threads all report the same, shared, line memo), that's the
+    largest one, rather than the last one received.
+    """
+    previous = line_memo_stats.get(pid)
+    if not previous or stats.hits + stats.misses >= previous.hits + previous.misses:
+        line_memo_stats[pid] = stats
+
+
+def _use_pool(
+    pool: Optional[ScanPool],
+    num_processors: Optional[int],
+    backend: str,
+) -> ContextManager[ScanPool]:
+    """
+    :returns: `pool` if provided (which is left running), otherwise a new one (which is closed
+        once the scan is over).
+    """
+    if pool:
+        return nullcontext(pool)
+
+    return ScanPool(num_processors, backend)
+
+
+def _report_stats(line_memo_stats: CacheStats, cache: Optional[ScanCache]) -> None:
+    verification_cache = verification.get_cache()
+    report_stats(
+        line_memo_stats,
+        cache.stats if cache else None,
+        verification_cache.stats if verification_cache else None,
+    )
+
+
+def _verify_results(results: List[_ScanResult]) -> Generator[_ScanResult, None, None]:
+    """
+    Verifies the secrets found by other processes (all at once, so that they can be verified
+    concurrently), and filters them by the verification policy.
+    """
+    plugins = {plugin.secret_type: plugin for plugin in get_plugins()}
+    candidates = {
+        id(result): [candidate.attach(plugins) for candidate in result.unverified or []]
+        for result in results
+    }
+    verified_secrets = {
+        id(candidate.secret)
+        for candidate in verification.apply_verification_policy([
+            candidate
+            for values in candidates.values()
+            for candidate in values
+        ])
+    }
+
+    for result in results:
+        yield result._replace(
+            secrets=[
+                candidate.secret
+                for candidate in candidates[id(result)]
+                if id(candidate.secret) in verified_secrets
+            ],
+            unverified=None,
+        )
+
+
+def _update_cache(
+    cache: ScanCache,
+    filename: str,
+    digest: Optional[str],
+    secrets: List[PotentialSecret],
+    is_cached: bool,
+) -> None:
+    if not digest:
+        return
+
+    if is_cached:
+        cache.record_hit(filename, digest)
+    else:
+        cache.put(filename, digest, secrets)
+
+
+def _copy_secret(secret: PotentialSecret, filename: str) -> PotentialSecret:
+    output = copy.copy(secret)
+    output.filename = filename
+
+    return output
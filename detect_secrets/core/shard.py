@@ -0,0 +1,41 @@
+"""
+Large repositories can take a long time to scan, even with all of a machine's cores. Instead,
+the scan can be spread across several machines (e.g. CI jobs), each of which scans a shard of
+the repository, and outputs a partial baseline. These are then combined into a single baseline
+(see `baseline.merge`).
+
+Files are assigned to shards by a hash of their path, so that every machine agrees on which
+files belong to which shard, without needing to coordinate.
+"""
+import hashlib
+import os
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, order=True)
+class Shard:
+    # NOTE: This is 1-indexed, as CI systems usually number their parallel jobs this way.
+    index: int
+    count: int
+
+    @classmethod
+    def parse(cls, value: str) -> 'Shard':
+        """
+        :param value: e.g. "1/4"
+        :raises: ValueError
+        """
+        index, count = value.split('/')
+        shard = cls(int(index), int(count))
+        if not 1 <= shard.index <= shard.count:
+            raise ValueError(f'Invalid shard: {value}')
+
+        return shard
+
+    def contains(self, filename: str) -> bool:
+        # NOTE: Paths are normalized, so that they're hashed the same way on every platform.
+        path = os.path.normpath(filename).replace(os.sep, '/')
+        digest = hashlib.sha1(path.encode('utf-8')).digest()  # noqa: S324
+        return int.from_bytes(digest[:8], 'big') % self.count == self.index - 1
+
+    def __str__(self) -> str:
+        return f'{self.index}/{self.count}'
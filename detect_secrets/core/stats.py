@@ -0,0 +1,41 @@
+"""
+Hit and miss counts of the caches that a scan goes through (the line memo, and the scan and
+verification caches, if enabled), which are reported together once the scan is over.
+"""
+from typing import Any
+from typing import NamedTuple
+from typing import Optional
+
+from .log import log
+
+
+class CacheStats(NamedTuple):
+    name: str
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def __add__(self, other: Any) -> 'CacheStats':
+        if not isinstance(other, CacheStats) or other.name != self.name:
+            return NotImplemented
+
+        return self._replace(hits=self.hits + other.hits, misses=self.misses + other.misses)
+
+    def __str__(self) -> str:
+        return (
+            f'{self.name}: {self.hits} hits, {self.misses} misses '
+            f'(hit rate: {self.hit_rate:.2f})'
+        )
+
+
+def report_stats(*stats: Optional[CacheStats]) -> None:
+    """
+    :param stats: None, for caches that are disabled.
+    """
+    for item in stats:
+        if item is not None:
+            log.debug(str(item))
@@ -7,6 +7,7 @@ from typing import Optional
 from . import audit
 from . import baseline
 from . import filters
+from . import merge
 from . import plugins
 from . import scan
 from ...settings import get_settings
@@ -83,6 +84,8 @@ class ParserBuilder:
 
         audit.add_audit_action(subparser)
         self._post_processors.append(audit.parse_args)
+
+        merge.add_merge_action(subparser)
         return self
 
     def add_pre_commit_arguments(self) -> 'ParserBuilder':
@@ -96,6 +99,14 @@ class ParserBuilder:
             action='store_true',
             help='Print detect-secrets-hook output as JSON',
         )
+        self._parser.add_argument(
+            '--diff-only',
+            action='store_true',
+            help=(
+                'Only scan the lines added by staged changes (i.e. `git diff --cached`), rather '
+                'than the files in full. Files without staged changes are not scanned.'
+            ),
+        )
         self.add_baseline_options(
             help=(
                 'Explicitly ignore secrets through a baseline generated by `detect-secrets scan`'
@@ -28,6 +28,7 @@ def parse_args(args: argparse.Namespace) -> None:
     try:
         args.baseline_filename = args.baseline[0]
         args.baseline_version = loaded_baseline['version']
+        args.baseline_commit = loaded_baseline.get('generated_at_commit')
         args.baseline = baseline.load(loaded_baseline, filename=args.baseline_filename)
     except KeyError:
         raise argparse.ArgumentTypeError('Invalid baseline.')
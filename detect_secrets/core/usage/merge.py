@@ -0,0 +1,25 @@
+import argparse
+from typing import cast
+
+from .common import valid_path
+
+
+def add_merge_action(parent: argparse._SubParsersAction) -> argparse.ArgumentParser:
+    parser = parent.add_parser(
+        'merge-baselines',
+        help='Combines the partial baselines created by `detect-secrets scan --shard`.',
+        description=(
+            'Combines partial baselines into a single baseline, just like the one created by '
+            'scanning all their files at once. The baselines need to have been created with '
+            'the same settings.'
+        ),
+    )
+
+    parser.add_argument(
+        'filename',
+        nargs='+',
+        type=valid_path,
+        help='Partial baselines to combine.',
+    )
+
+    return cast(argparse.ArgumentParser, parser)
@@ -1,8 +1,13 @@
 import argparse
+import os
 from typing import cast
 
 from . import baseline
 from ...settings import get_settings
+from ..cache import DEFAULT_CACHE_DIRECTORY
+from ..pool import BACKENDS
+from ..pool import PROCESSES
+from ..shard import Shard
 from .common import initialize_plugin_settings
 
 
@@ -86,11 +91,101 @@ def _add_initialize_baseline_options(parser: argparse.ArgumentParser) -> None:
         ),
     )
 
+    group.add_argument(
+        '--incremental',
+        action='store_true',
+        help=(
+            'Records the commit that the baseline was generated at. If a baseline is provided, '
+            'only rescans files that have changed since the commit recorded in it. This falls '
+            'back to a full scan if the settings (or detect-secrets version) have changed.'
+        ),
+    )
+
+    group.add_argument(
+        '--shard',
+        type=_shard,
+        metavar='INDEX/COUNT',
+        help=(
+            'Only scans a shard of the files (e.g. 1/4 for the first of four), so that large '
+            'repositories can be scanned across multiple machines. The partial baselines can '
+            'then be combined with `detect-secrets merge-baselines`.'
+        ),
+    )
+
+    group.add_argument(
+        '--prefetch',
+        action='store_true',
+        help=(
+            'Scans files while they are still being listed, and reads them ahead of the '
+            'workers. This helps on network filesystems (or when files are not cached in '
+            'memory yet), where workers would otherwise wait on reads.'
+        ),
+    )
+
+    group.add_argument(
+        '--backend',
+        choices=BACKENDS,
+        default=PROCESSES,
+        help=(
+            'Whether to scan files in parallel with processes, or threads. Threads avoid '
+            'starting (and configuring) worker processes, but only scan in parallel on '
+            'free-threaded builds of Python. Defaults to %(default)s.'
+        ),
+    )
+
+    cache_group = group.add_mutually_exclusive_group()
+    cache_group.add_argument(
+        '--cache-dir',
+        nargs='?',
+        const=DEFAULT_CACHE_DIRECTORY,
+        metavar='DIR',
+        help=(
+            'Caches scan results in this directory (defaults to %(const)s), so that files '
+            'which have not changed since they were last scanned are not scanned again. This '
+            'can also be enabled with the DETECT_SECRETS_CACHE_DIR environment variable.'
+        ),
+    )
+    cache_group.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Disables the scan cache, even if DETECT_SECRETS_CACHE_DIR is set.',
+    )
+
+    group.add_argument(
+        '--verification-cache-dir',
+        nargs='?',
+        const=DEFAULT_CACHE_DIRECTORY,
+        metavar='DIR',
+        help=(
+            'Caches the results of verifying secrets in this directory (defaults to '
+            '%(const)s), so that secrets are not verified again until their results expire. '
+            'This can also be enabled with the DETECT_SECRETS_VERIFICATION_CACHE_DIR '
+            'environment variable.'
+        ),
+    )
+
+
+def _shard(value: str) -> Shard:
+    try:
+        return Shard.parse(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'Invalid shard: {value}')
+
 
 def parse_args(args: argparse.Namespace) -> None:
     if args.action != 'scan':
         return
 
+    if args.no_cache:
+        args.cache_dir = None
+    elif not args.cache_dir:
+        args.cache_dir = os.environ.get('DETECT_SECRETS_CACHE_DIR') or None
+
+    if not args.verification_cache_dir:
+        args.verification_cache_dir = (
+            os.environ.get('DETECT_SECRETS_VERIFICATION_CACHE_DIR') or None
+        )
+
     # NOTE: This is assumed to run *after* the baseline argument processor, and before
     # the plugin argument processor.
     if args.baseline is not None and args.force_use_all_plugins:
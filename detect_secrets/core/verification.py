@@ -0,0 +1,391 @@
+"""
+Verifying a secret usually means sending a request to its provider, which is far slower than
+finding it. Rather than verifying every secret as soon as it's found (and waiting on each
+response in turn), the scan engine collects the secrets found in a file, and verifies them
+concurrently through the `VerificationEngine`.
+
+Each provider (i.e. plugin) has its own concurrency and rate limits, so that a single file full
+of secrets can't overwhelm one provider, and a slow provider only holds up its own requests.
+
+Within a scan (see `memoize`), each secret is only verified once, no matter how many times it
+occurs, or which code path asks for it to be verified. Across scans, results can also be
+remembered through a `VerificationCache` (see `use_cache`).
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Dict
+from typing import Generator
+from typing import Hashable
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from typing import TYPE_CHECKING
+from typing import Union
+
+import requests
+
+from ..constants import VerifiedResult
+from ..settings import get_settings
+from ..util.code_snippet import CodeSnippet
+from ..util.inject import call_function_with_arguments
+from ..util.inject import get_injectable_variables
+from .log import log
+from .potential_secret import PotentialSecret
+
+if TYPE_CHECKING:
+    from detect_secrets.plugins.base import BasePlugin
+    from .verification_cache import VerificationCache
+
+
+VERIFICATION_FILTER = 'detect_secrets.filters.common.is_ignored_due_to_verification_policies'
+
+# The maximum number of secrets verified at once (by each process).
+MAX_WORKERS = int(os.getenv('CHECKOV_VERIFY_MAX_WORKERS', '16'))
+
+# The maximum number of secrets verified at once, with the same provider.
+MAX_CONCURRENCY_PER_PROVIDER = int(os.getenv('CHECKOV_VERIFY_MAX_CONCURRENCY_PER_PROVIDER', '4'))
+
+# The maximum number of verification requests sent to the same provider, per second (by each
+# process). Setting this to 0 disables the limit.
+MAX_REQUESTS_PER_SECOND_PER_PROVIDER = float(
+    os.getenv('CHECKOV_VERIFY_MAX_REQUESTS_PER_SECOND_PER_PROVIDER', '0'),
+)
+
+
+class Candidate(NamedTuple):
+    secret: PotentialSecret
+    plugin: BasePlugin
+    context: Optional[CodeSnippet]
+
+    def get_memo_key(self) -> Tuple[str, str, Hashable]:
+        context = (
+            self.plugin.get_verification_context(self.context)
+            if self.context is not None and uses_context(self.plugin)
+            else None
+        )
+
+        return (self.secret.type, self.secret.secret_hash, context)
+
+    def detach(self) -> Candidate:
+        """
+        :returns: a copy that can be cheaply sent to another process, to be verified there
+            (see `attach`).
+        """
+        context = None
+        if self.context is not None and uses_context(self.plugin):
+            context = CodeSnippet(
+                list(self.context.lines),
+                start_line=self.context.start_line,
+                target_index=self.context.target_index,
+            )
+
+        # NOTE: Plugins may not be serializable, so they are looked up again by `attach`.
+        return Candidate(self.secret, None, context)  # type: ignore
+
+    def attach(self, plugins: Dict[str, BasePlugin]) -> Candidate:
+        """
+        :param plugins: mapping of secret types to plugins.
+        """
+        return self._replace(plugin=plugins[self.secret.type])
+
+
+# Mapping of memo keys (see `Candidate.get_memo_key`) to verification results.
+VerificationMemo = Dict[Tuple[str, str, Hashable], 'Future[Optional[VerifiedResult]]']
+
+_is_deferred: ContextVar[bool] = ContextVar('_is_deferred', default=False)
+_memo: ContextVar[Optional[VerificationMemo]] = ContextVar('_memo', default=None)
+_cache: ContextVar[Optional[VerificationCache]] = ContextVar('_cache', default=None)
+
+
+@contextmanager
+def memoize() -> Generator[None, None, None]:
+    """
+    Within this scope (i.e. a single scan), verification results are remembered, and reused for
+    other occurrences of the same secret.
+
+    NOTE: If there's already an active scope, its results are shared.
+    """
+    if _memo.get() is not None:
+        yield
+        return
+
+    token = _memo.set({})
+    try:
+        yield
+    finally:
+        _memo.reset(token)
+
+
+@contextmanager
+def use_cache(cache: Optional[VerificationCache]) -> Generator[None, None, None]:
+    """
+    Within this scope, verification results are looked up in (and stored to) `cache`, before
+    any secrets are verified.
+    """
+    token = _cache.set(cache)
+    try:
+        yield
+    finally:
+        _cache.reset(token)
+
+
+def get_cache() -> Optional[VerificationCache]:
+    return _cache.get()
+
+
+@contextmanager
+def deferred() -> Generator[None, None, None]:
+    """
+    Within this scope, plugins (and the verification policy filter) don't verify secrets
+    themselves: the scan engine does so afterwards, through `apply_verification_policy`.
+    """
+    token = _is_deferred.set(True)
+    try:
+        yield
+    finally:
+        _is_deferred.reset(token)
+
+
+def is_deferred() -> bool:
+    return _is_deferred.get()
+
+
+def is_enabled() -> bool:
+    # If the filter is disabled, it means the --no-verify flag was passed.
+    return VERIFICATION_FILTER in get_settings().filters
+
+
+def apply_verification_policy(
+    candidates: Sequence[Candidate],
+) -> Generator[Candidate, None, None]:
+    """
+    Verifies all candidates, and yields the ones that meet the configured verification
+    policy (see `detect_secrets.filters.common.is_ignored_due_to_verification_policies`).
+    """
+    if not candidates:
+        return
+
+    min_level = VerifiedResult(get_settings().filters[VERIFICATION_FILTER]['min_level'])
+    results = get_verification_engine().verify(candidates)
+    for candidate, result in zip(candidates, results):
+        candidate.secret.is_verified = result == VerifiedResult.VERIFIED_TRUE
+        if result and result.value < min_level.value:
+            log.info(
+                f'Skipping "{candidate.secret.secret_value}" due to `{VERIFICATION_FILTER}`.',
+            )
+            continue
+
+        yield candidate
+
+
+class RateLimiter:
+    def __init__(self, max_requests_per_second: float) -> None:
+        """
+        :param max_requests_per_second: if 0, there is no limit.
+        """
+        self.interval = 1 / max_requests_per_second if max_requests_per_second else 0
+        self._next_request_time = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        if not self.interval:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            request_time = max(now, self._next_request_time)
+            self._next_request_time = request_time + self.interval
+
+        if request_time > now:
+            time.sleep(request_time - now)
+
+
+class Provider(NamedTuple):
+    semaphore: threading.BoundedSemaphore
+    rate_limiter: RateLimiter
+
+
+class VerificationEngine:
+    def __init__(
+        self,
+        max_workers: int = MAX_WORKERS,
+        max_concurrency_per_provider: int = MAX_CONCURRENCY_PER_PROVIDER,
+        max_requests_per_second_per_provider: float = MAX_REQUESTS_PER_SECOND_PER_PROVIDER,
+    ) -> None:
+        self.max_concurrency_per_provider = max_concurrency_per_provider
+        self.max_requests_per_second_per_provider = max_requests_per_second_per_provider
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix='verify',
+        )
+        self._providers: Dict[str, Provider] = {}
+        self._lock = threading.Lock()
+
+    def verify(self, candidates: Sequence[Candidate]) -> List[Optional[VerifiedResult]]:
+        """
+        :returns: the verification result of each candidate (in the same order).
+        """
+        memo = _memo.get()
+        cache = _cache.get()
+        results: List[Union[Future, Optional[VerifiedResult]]] = []
+
+        # Mapping of the secrets that were actually verified, to their memo keys.
+        uncached: Dict[Future, Tuple[BasePlugin, Tuple[str, str, Hashable]]] = {}
+        for candidate in candidates:
+            if not _has_verification(candidate.plugin):
+                # There's nothing to wait for, so there's no need to involve another thread.
+                results.append(verify_candidate(candidate))
+                continue
+
+            key = candidate.get_memo_key() if memo is not None or cache else None
+            if memo is not None and key in memo:
+                results.append(memo[key])
+                continue
+
+            result = cache.get(candidate.plugin, key) if cache else None   # type: ignore
+            if result:
+                future: Future[Optional[VerifiedResult]] = Future()
+                future.set_result(result)
+            else:
+                future = self._executor.submit(self._verify, candidate)
+                if cache:
+                    uncached[future] = (candidate.plugin, key)     # type: ignore
+
+            if memo is not None:
+                memo[key] = future   # type: ignore
+
+            results.append(future)
+
+        output = [
+            result.result() if isinstance(result, Future) else result
+            for result in results
+        ]
+        for future, (plugin, key) in uncached.items():
+            cache.put(plugin, key, future.result())   # type: ignore
+
+        return output
+
+    def shutdown(self) -> None:
+        self._executor.shutdown()
+
+    def _verify(self, candidate: Candidate) -> Optional[VerifiedResult]:
+        provider = self._get_provider(candidate.plugin)
+        with provider.semaphore:
+            provider.rate_limiter.wait()
+            return verify_candidate(candidate)
+
+    def _get_provider(self, plugin: BasePlugin) -> Provider:
+        name = plugin.__class__.__name__
+        with self._lock:
+            if name not in self._providers:
+                self._providers[name] = Provider(
+                    semaphore=threading.BoundedSemaphore(self.max_concurrency_per_provider),
+                    rate_limiter=RateLimiter(self.max_requests_per_second_per_provider),
+                )
+
+            return self._providers[name]
+
+
+def verify_candidate(candidate: Candidate) -> Optional[VerifiedResult]:
+    try:
+        result: Optional[VerifiedResult] = call_function_with_arguments(
+            candidate.plugin.verify,
+            secret=candidate.secret.secret_value,
+            context=candidate.context,
+        )
+    except requests.exceptions.RequestException:
+        return VerifiedResult.UNVERIFIED
+
+    return result
+
+
+def verify_secret(
+    plugin: BasePlugin,
+    secret: str,
+    context: Optional[CodeSnippet] = None,
+    **kwargs: Optional[CodeSnippet],
+) -> Optional[VerifiedResult]:
+    """
+    Used to verify secrets as they are found (rather than through the `VerificationEngine`).
+
+    :param kwargs: other (optional) arguments to supply `plugin.verify` with.
+    :raises: requests.exceptions.RequestException
+    """
+    memo = _memo.get()
+    cache = _cache.get()
+    if memo is None and not cache:
+        result: Optional[VerifiedResult] = call_function_with_arguments(
+            plugin.verify,
+            secret=secret,
+            context=context,
+            **kwargs,
+        )
+        return result
+
+    key = Candidate(
+        PotentialSecret(type=plugin.secret_type, filename='', secret=secret),
+        plugin,
+        context,
+    ).get_memo_key()
+    if memo is not None and key in memo:
+        return memo[key].result()
+
+    future: Future[Optional[VerifiedResult]] = Future()
+    result = cache.get(plugin, key) if cache else None
+    if result:
+        future.set_result(result)
+    else:
+        try:
+            future.set_result(
+                call_function_with_arguments(
+                    plugin.verify,
+                    secret=secret,
+                    context=context,
+                    **kwargs,
+                ),
+            )
+        except Exception as e:
+            future.set_exception(e)
+        else:
+            if cache:
+                cache.put(plugin, key, future.result())
+
+    if memo is not None:
+        memo[key] = future
+
+    return future.result()
+
+
+def get_verification_engine() -> VerificationEngine:
+    """
+    NOTE: Threads don't survive being forked, so each process gets its own engine.
+    """
+    return _get_verification_engine(os.getpid())
+
+
+@lru_cache(maxsize=1)
+def _get_verification_engine(_pid: int) -> VerificationEngine:
+    # NOTE: The process ID is only used as the cache key (see `get_verification_engine`).
+    return VerificationEngine()
+
+
+def uses_context(plugin: BasePlugin) -> bool:
+    return 'context' in get_injectable_variables(plugin.verify)
+
+
+def _has_verification(plugin: BasePlugin) -> bool:
+    # We need to import this here, otherwise it will result in a circular dependency.
+    from ..plugins.base import BasePlugin
+
+    return plugin.__class__.verify is not BasePlugin.verify
@@ -0,0 +1,190 @@
+"""
+Long-lived credentials are usually found (and verified) on every scan, and each verification is
+a request to an external API, which is slow, and counts towards its rate limits. This module
+offers an (opt-in) persistent cache of verification results, so that a secret is only verified
+again once its previous result has expired.
+
+Each kind of result has its own time-to-live: a secret that was verified false is unlikely to
+become valid again, whereas a secret that was verified true may be revoked at any time. By
+default, results that could not be determined (e.g. due to network errors) are not cached.
+
+NOTE: Secrets (and the parts of their context that their verification depends on) are never
+stored in plaintext. Results are keyed by a hash of them, as well as the plugin's configuration
+and the detect-secrets version.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any
+from typing import Dict
+from typing import Hashable
+from typing import Optional
+from typing import Tuple
+from typing import TYPE_CHECKING
+
+from ..__version__ import VERSION
+from ..constants import VerifiedResult
+from .cache import DEFAULT_CACHE_DIRECTORY
+from .log import log
+from .stats import CacheStats
+
+if TYPE_CHECKING:
+    from detect_secrets.plugins.base import BasePlugin
+
+
+# In seconds. Setting any of these to 0 means that those results are not cached.
+DEFAULT_TTLS = {
+    VerifiedResult.VERIFIED_TRUE: float(
+        os.getenv('CHECKOV_VERIFY_CACHE_TTL_VERIFIED_TRUE', str(6 * 60 * 60)),
+    ),
+    VerifiedResult.VERIFIED_FALSE: float(
+        os.getenv('CHECKOV_VERIFY_CACHE_TTL_VERIFIED_FALSE', str(7 * 24 * 60 * 60)),
+    ),
+    VerifiedResult.UNVERIFIED: float(os.getenv('CHECKOV_VERIFY_CACHE_TTL_UNVERIFIED', '0')),
+}
+
+# Bump this when the layout of the database changes, so that old caches are discarded.
+SCHEMA_VERSION = 1
+
+
+class VerificationCache:
+    DATABASE_FILENAME = 'verification.db'
+
+    def __init__(
+        self,
+        directory: str = DEFAULT_CACHE_DIRECTORY,
+        ttls: Optional[Dict[VerifiedResult, float]] = None,
+    ) -> None:
+        """
+        :param directory: where the cache is stored. It will be created if it does not exist.
+            This can be shared with the scan cache.
+        :param ttls: mapping of verification results to how long (in seconds) they are cached
+            for. Defaults to `DEFAULT_TTLS`.
+
+        :raises: OSError
+        """
+        self.directory = os.path.abspath(directory)
+        self.database = os.path.join(self.directory, self.DATABASE_FILENAME)
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(self.directory, exist_ok=True)
+        gitignore = os.path.join(self.directory, '.gitignore')
+        if not os.path.exists(gitignore):
+            with open(gitignore, 'w') as f:
+                f.write('# Created by detect-secrets.\n*\n')
+
+        # NOTE: Secrets may be verified from several threads (see `VerificationEngine`).
+        self._connection = _connect(self.database)
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self) -> CacheStats:
+        return CacheStats('Verification cache', self.hits, self.misses)
+
+    def get(
+        self,
+        plugin: 'BasePlugin',
+        key: Tuple[str, str, Hashable],
+    ) -> Optional[VerifiedResult]:
+        """
+        :param key: the secret's memo key (see `Candidate.get_memo_key`).
+        :returns: None, if there is no (unexpired) result for this secret.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT result FROM results WHERE key = ? AND expires_at > ?',
+                (_hash_key(plugin, key), time.time()),
+            ).fetchone()
+
+            if not row:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+
+        return VerifiedResult(row[0])
+
+    def put(
+        self,
+        plugin: 'BasePlugin',
+        key: Tuple[str, str, Hashable],
+        result: Optional[VerifiedResult],
+    ) -> None:
+        ttl = self.ttls.get(result) if result else None
+        if not ttl:
+            return
+
+        with self._lock:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO results (key, result, expires_at) VALUES (?, ?, ?)',
+                (_hash_key(plugin, key), result.value, time.time() + ttl),    # type: ignore
+            )
+
+    def close(self) -> None:
+        """Persists the results, and evicts the ones that have expired."""
+        with self._lock:
+            self._connection.execute('DELETE FROM results WHERE expires_at <= ?', (time.time(),))
+            self._connection.commit()
+            self._connection.close()
+
+    def __enter__(self) -> 'VerificationCache':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+
+def _hash_key(plugin: 'BasePlugin', key: Tuple[str, str, Hashable]) -> str:
+    return hashlib.sha256(
+        json.dumps(
+            {
+                'version': VERSION,
+                'plugin': plugin.json(),
+                'key': key,
+            },
+            sort_keys=True,
+            default=str,
+        ).encode(),
+    ).hexdigest()
+
+
+def _connect(filename: str) -> sqlite3.Connection:
+    """
+    :raises: OSError
+    """
+    try:
+        return _initialize_database(filename)
+    except sqlite3.DatabaseError as e:
+        # The cache is disposable, so we can just start over.
+        log.warning(f'Unable to use verification cache ({e}). Recreating it.')
+        os.remove(filename)
+        return _initialize_database(filename)
+
+
+def _initialize_database(filename: str) -> sqlite3.Connection:
+    """
+    :raises: sqlite3.DatabaseError
+    """
+    connection = sqlite3.connect(filename, timeout=30, check_same_thread=False)
+    if connection.execute('PRAGMA user_version').fetchone()[0] != SCHEMA_VERSION:
+        connection.executescript(
+            f"""
+            DROP TABLE IF EXISTS results;
+
+            CREATE TABLE results (
+                key TEXT PRIMARY KEY,
+                result INTEGER NOT NULL,
+                expires_at REAL NOT NULL
+            );
+
+            PRAGMA user_version = {SCHEMA_VERSION};
+            """,
+        )
+
+    return connection
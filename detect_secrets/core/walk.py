@@ -0,0 +1,255 @@
+"""
+In large repositories, listing the files to scan can take longer than scanning them. `os.walk`
+descends into every directory (e.g. `node_modules`, `.git`, or build outputs), only for each of
+their files to be rejected later on, because they are not tracked by git, or are excluded by
+`--exclude-files`. On top of that, resolving the path of every file (to make it relative to the
+root) costs a few system calls each.
+
+Instead, this walker prunes directories before entering them, when none of their files could
+be scanned, and only resolves the paths of symbolic links.
+"""
+import os
+import re
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Callable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+
+from ..filters.heuristic import is_non_text_file
+from ..settings import get_settings
+from ..util import git
+from ..util.path import get_relative_path
+
+
+# NOTE: Listing directories is mostly spent in system calls (which release the GIL), so threads
+# help on slow (e.g. network) filesystems. With a warm page cache, they don't, so they're opt-in.
+WALK_THREADS = int(os.getenv('CHECKOV_WALK_THREADS', '0'))
+
+Listing = Tuple[List[os.DirEntry], List[os.DirEntry]]
+
+
+def walk(
+    path: str,
+    root: str,
+    tracked_files: Optional[Set[str]] = None,
+    filter_root: str = '',
+    num_threads: int = WALK_THREADS,
+) -> Iterator[str]:
+    """
+    Yields the same files as walking `path` with `os.walk` (and making them relative to `root`
+    with `get_relative_path`), in the same order, except for those that would not be scanned.
+
+    :param root: the (real) path that files are made relative to.
+    :param tracked_files: if provided, only these files are yielded.
+    :param filter_root: the root that the scan prepends to files, before filtering them.
+    :param num_threads: if more than one, directories are listed in parallel.
+    """
+    walker = _Walker(root=root, tracked_files=tracked_files, filter_root=filter_root)
+    if num_threads <= 1:
+        yield from walker.walk(path)
+        return
+
+    with ThreadPoolExecutor(max_workers=num_threads) as executor:
+        walker.executor = executor
+        yield from walker.walk(path)
+
+
+def walk_tracked_files(*paths: str, root: str) -> Iterator[str]:
+    """
+    Yields the same files as `walk` does with `tracked_files` (though in git's order), except
+    that they're streamed from git as it lists them. This means that we don't need to wait for
+    a large repository to be listed in full, nor walk it, nor resolve the path of each file.
+
+    :param paths: relative to the root.
+    :param root: the root of the git repository (which files are made relative to).
+    """
+    should_skip_non_text_files = (
+        'detect_secrets.filters.heuristic.is_non_text_file' in get_settings().filters
+    )
+
+    try:
+        for mode, filename in git.iter_tracked_files(root, *paths):
+            if mode == git.SYMLINK_MODE:
+                path = os.path.join(root, filename)
+                if os.path.isdir(path):
+                    continue
+
+                relative_path = get_relative_path(root=root, path=path)
+                if relative_path:
+                    yield relative_path
+            elif mode == git.SUBMODULE_MODE:
+                continue
+            elif not should_skip_non_text_files or not is_non_text_file(filename):
+                yield filename
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        # NOTE: Like `git.get_tracked_files`, this just means that there's nothing to scan.
+        pass
+
+
+class _Walker:
+    def __init__(
+        self,
+        root: str,
+        tracked_files: Optional[Set[str]],
+        filter_root: str,
+    ) -> None:
+        self.root = root
+        self.tracked_files = tracked_files
+        self.filter_root = filter_root
+        self.executor: Optional[ThreadPoolExecutor] = None
+
+        # NOTE: `get_relative_path` behaves differently when the root is the current directory.
+        self.is_cwd = Path(os.getcwd()) == Path(root)
+        if self.is_cwd:
+            self.root = os.getcwd()
+
+        self.tracked_directories = (
+            _get_directories(tracked_files)
+            if tracked_files is not None
+            else None
+        )
+
+        filters = get_settings().filters
+        self.exclusion_regex = [
+            re.compile(pattern)
+            for pattern in filters.get(
+                'detect_secrets.filters.regex.should_exclude_file',
+                {},
+            ).get('pattern', [])
+            if _is_prefix_safe(pattern)
+        ]
+        self.should_skip_non_text_files = (
+            'detect_secrets.filters.heuristic.is_non_text_file' in filters
+        )
+
+    def walk(self, path: str) -> Iterator[str]:
+        top = os.path.realpath(path)
+        if top == self.root:
+            relative_path: Optional[str] = ''
+        elif top.startswith(os.path.join(self.root, '')):
+            relative_path = top[len(self.root) + 1:]
+        else:
+            # NOTE: Files outside the root can't be made relative to it, so we leave them to
+            # `get_relative_path`, just like `os.walk` would.
+            relative_path = None
+
+        yield from self._walk(path, relative_path, self._list(path)())
+
+    def _walk(
+        self,
+        directory: str,
+        relative_directory: Optional[str],
+        listing: Listing,
+    ) -> Iterator[str]:
+        files, directories = listing
+        for entry in files:
+            filename = self._get_relative_path(entry, relative_directory)
+            if not filename:
+                continue
+
+            if self.tracked_files is None or filename in self.tracked_files:
+                yield filename
+
+        # NOTE: We start listing all subdirectories (in parallel, if possible) before walking
+        # the first of them.
+        subdirectories = []
+        for entry in directories:
+            relative_path = (
+                os.path.join(relative_directory, entry.name)
+                if relative_directory is not None
+                else None
+            )
+            if relative_path is None or self._should_enter(relative_path):
+                subdirectories.append((entry.path, relative_path, self._list(entry.path)))
+
+        for path, relative_path, get_listing in subdirectories:
+            yield from self._walk(path, relative_path, get_listing())
+
+    def _list(self, path: str) -> Callable[[], Listing]:
+        if self.executor:
+            return self.executor.submit(_list_directory, path).result
+
+        return partial(_list_directory, path)
+
+    def _get_relative_path(
+        self,
+        entry: os.DirEntry,
+        relative_directory: Optional[str],
+    ) -> Optional[str]:
+        if relative_directory is None or entry.is_symlink():
+            return get_relative_path(root=self.root, path=entry.path)
+
+        if self.should_skip_non_text_files and is_non_text_file(entry.name):
+            return None
+
+        # NOTE: `get_relative_path` only checks that files exist when the root is the current
+        # directory (e.g. this excludes named pipes).
+        if self.is_cwd and not entry.is_file():
+            return None
+
+        return os.path.join(relative_directory, entry.name)
+
+    def _should_enter(self, relative_path: str) -> bool:
+        if (
+            self.tracked_directories is not None
+            and relative_path not in self.tracked_directories
+        ):
+            return False
+
+        path = os.path.join(self.filter_root, relative_path, '')
+        return not any(regex.search(path) for regex in self.exclusion_regex)
+
+
+def _list_directory(path: str) -> Listing:
+    """
+    :returns: the entries in the directory that `os.walk` would consider files, and those that
+        it would walk into.
+    """
+    files = []
+    directories = []
+    try:
+        with os.scandir(path) as iterator:
+            for entry in iterator:
+                try:
+                    is_directory = entry.is_dir()
+                except OSError:
+                    is_directory = False
+
+                if not is_directory:
+                    files.append(entry)
+                elif not entry.is_symlink():
+                    directories.append(entry)
+    except OSError:
+        # NOTE: Like `os.walk`, we ignore directories that we can't list.
+        pass
+
+    return files, directories
+
+
+def _get_directories(filenames: Set[str]) -> Set[str]:
+    """
+    :returns: all directories that contain any of the files (directly, or not).
+    """
+    output = set()
+    for filename in filenames:
+        directory = os.path.dirname(filename)
+        while directory and directory not in output:
+            output.add(directory)
+            directory = os.path.dirname(directory)
+
+    return output
+
+
+def _is_prefix_safe(pattern: str) -> bool:
+    """
+    If a pattern matches a directory's path (with a trailing slash), it matches all the files in
+    it too, unless it looks past the end of its match. Rather than parsing the pattern, we
+    conservatively reject anything that might.
+    """
+    return not re.search(r'\$|\\[ZbB]|\(\?[=!>]|[*+?}]\+', pattern)
@@ -8,9 +8,9 @@ from typing import TYPE_CHECKING
 import requests
 
 from ..constants import VerifiedResult
+from ..core import verification
 from ..settings import get_settings
 from ..util.code_snippet import CodeSnippet
-from ..util.inject import call_function_with_arguments
 from .util import get_caller_path
 
 if TYPE_CHECKING:
@@ -44,13 +44,15 @@ def is_ignored_due_to_verification_policies(
 
     There's no such thing as "only verified false", because if you're going to verify
     something, and it's verified false, why are you still including it as a valid secret?
+
+    NOTE: When scanning files, this policy is applied by the scan engine instead (see
+    `detect_secrets.core.verification`), so that secrets are verified concurrently, and once.
     """
+    if verification.is_deferred():
+        return False
+
     try:
-        verify_result = call_function_with_arguments(
-            plugin.verify,
-            secret=secret,
-            context=context,
-        )
+        verify_result = verification.verify_secret(plugin, secret=secret, context=context)
     except requests.exceptions.RequestException:
         verify_result = VerifiedResult.UNVERIFIED
 
@@ -1,21 +1,30 @@
 import argparse
 import json
+import subprocess
 import sys
+from typing import Any
+from typing import Dict
 from typing import List
 from typing import Optional
 
 from . import audit
+from .__version__ import VERSION
 from .core import baseline
 from .core import plugins
+from .core import verification
+from .core.cache import ScanCache
 from .core.log import log
 from .core.scan import get_files_to_scan
 from .core.scan import scan_for_allowlisted_secrets_in_file
 from .core.scan import scan_line
 from .core.secrets_collection import SecretsCollection
 from .core.usage import ParserBuilder
+from .core.verification_cache import VerificationCache
 from .exceptions import InvalidBaselineError
+from .exceptions import UnableToReadBaselineError
 from .settings import get_plugins
 from .settings import get_settings
+from .settings import transient_settings
 
 
 def main(argv: Optional[List[str]] = None) -> int:
@@ -27,9 +36,21 @@ def main(argv: Optional[List[str]] = None) -> int:
         log.set_debug_level(args.verbose)
 
     if args.action == 'scan':
-        handle_scan_action(args)
+        verification_cache = (
+            VerificationCache(args.verification_cache_dir)
+            if args.verification_cache_dir
+            else None
+        )
+        try:
+            with verification.use_cache(verification_cache):
+                handle_scan_action(args)
+        finally:
+            if verification_cache:
+                verification_cache.close()
     elif args.action == 'audit':
         handle_audit_action(args)
+    elif args.action == 'merge-baselines':
+        return handle_merge_action(args)
 
     return 0
 
@@ -67,12 +88,36 @@ def handle_scan_action(args: argparse.Namespace) -> None:
         print(json.dumps(baseline.format_for_output(secrets), indent=2))
         return
 
-    secrets = baseline.create(
-        *args.path,
-        should_scan_all_files=args.all_files,
-        root=args.custom_root,
-        num_processors=args.num_cores,
-    )
+    commit = None
+    if args.incremental:
+        commit = baseline.get_commit_to_record(
+            root=args.custom_root,
+            baseline_filename=args.baseline_filename if args.baseline is not None else '',
+        )
+
+    cache = ScanCache(args.cache_dir) if args.cache_dir else None
+    try:
+        refreshed_secrets: Optional[SecretsCollection] = None
+        if args.incremental and args.baseline is not None:
+            refreshed_secrets = refresh_baseline(args, cache)
+
+        if refreshed_secrets is not None:
+            secrets = refreshed_secrets
+        else:
+            secrets = baseline.create(
+                *args.path,
+                should_scan_all_files=args.all_files,
+                root=args.custom_root,
+                num_processors=args.num_cores,
+                cache=cache,
+                shard=args.shard,
+                prefetch=args.prefetch,
+                backend=args.backend,
+            )
+    finally:
+        if cache:
+            cache.close()
+
     if args.baseline is not None:
         # The pre-commit hook's baseline upgrade is to trim the supplied baseline for non-existent
         # secrets, and to upgrade the format to the latest version. This is because the pre-commit
@@ -84,11 +129,74 @@ def handle_scan_action(args: argparse.Namespace) -> None:
         # default.
         secrets.merge(args.baseline)
 
-        baseline.save_to_file(secrets, args.baseline_filename)
+        baseline.save_to_file(
+            baseline.format_for_output(secrets, commit=commit, shard=args.shard),
+            args.baseline_filename,
+        )
     else:
-        print(json.dumps(baseline.format_for_output(secrets, is_slim_mode=args.slim), indent=2))
+        print(
+            json.dumps(
+                baseline.format_for_output(
+                    secrets,
+                    is_slim_mode=args.slim,
+                    commit=commit,
+                    shard=args.shard,
+                ),
+                indent=2,
+            ),
+        )
+
 
+def refresh_baseline(
+    args: argparse.Namespace,
+    cache: Optional[ScanCache] = None,
+) -> Optional[SecretsCollection]:
+    """
+    :returns: None, if the baseline cannot be refreshed incrementally (and needs a full scan).
+    """
+    reason = ''
+    if args.all_files:
+        reason = 'only git tracked files are supported'
+    elif not args.baseline_commit:
+        reason = 'baseline does not record the commit it was generated at'
+    elif args.baseline_version != VERSION:
+        reason = 'baseline was generated with a different version'
+    elif get_baseline_settings(args.baseline_filename) != get_settings().json():
+        reason = 'baseline was generated with different settings'
 
+    if not reason:
+        try:
+            return baseline.refresh(
+                args.baseline,
+                args.baseline_commit,
+                *args.path,
+                root=args.custom_root,
+                num_processors=args.num_cores,
+                cache=cache,
+                shard=args.shard,
+                backend=args.backend,
+            )
+        except subprocess.CalledProcessError:
+            reason = f'unable to determine files changed since {args.baseline_commit}'
+
+    log.info(f'Unable to scan incrementally ({reason}). Scanning all files instead.')
+    return None
+
+
+def get_baseline_settings(filename: str) -> Dict[str, Any]:
+    """
+    :returns: the settings that the baseline was generated with, before any options were
+        applied on top of them.
+    :raises: UnableToReadBaselineError
+    """
+    with transient_settings({}) as settings:
+        settings.clear()
+        baseline.load(baseline.load_from_file(filename), filename=filename)
+
+        return settings.json()
+
+
+@verification.memoize()
 def scan_adhoc_string(line: str) -> str:
     registered_plugins = get_plugins()
 
@@ -117,6 +225,17 @@ def scan_adhoc_string(line: str) -> str:
     ])
 
 
+def handle_merge_action(args: argparse.Namespace) -> int:
+    try:
+        output = baseline.merge(*(baseline.load_from_file(path) for path in args.filename))
+    except (InvalidBaselineError, UnableToReadBaselineError) as e:
+        print(f'Unable to merge baselines: {e}', file=sys.stderr)
+        return 1
+
+    print(json.dumps(output, indent=2))
+    return 0
+
+
 def handle_audit_action(args: argparse.Namespace) -> None:
     try:
         if args.stats:
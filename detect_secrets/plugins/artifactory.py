@@ -6,6 +6,8 @@ from .base import RegexBasedDetector
 class ArtifactoryDetector(RegexBasedDetector):
     """Scans for Artifactory credentials."""
     secret_type = 'Artifactory Credentials'
+    required_literals = ('AKC',)
+    required_literals_ignore_case = ('artif', 'jfrog', 'buildkit')
 
     denylist = [
         # Artifactory tokens begin with AKC
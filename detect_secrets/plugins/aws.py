@@ -8,19 +8,22 @@ import string
 import textwrap
 from datetime import datetime
 from typing import cast
+from typing import Hashable
 from typing import List
 from typing import Union
 
-import requests
-
 from ..constants import VerifiedResult
 from ..util.code_snippet import CodeSnippet
+from ..util.http import get_session
 from .base import RegexBasedDetector
 
 
 class AWSKeyDetector(RegexBasedDetector):
     """Scans for AWS keys."""
     secret_type = 'AWS Access Key'
+    required_literals = ('A3T', 'ABIA', 'ACCA', 'AKIA', 'ASIA')
+    required_literals_ignore_case = ('aws',)
+    supports_buffer_scan = True
 
     secret_keyword = r'(?:key|pwd|pw|password|pass|token)'
 
@@ -59,6 +62,10 @@ class AWSKeyDetector(RegexBasedDetector):
 
         return VerifiedResult.VERIFIED_FALSE
 
+    def get_verification_context(self, context: CodeSnippet) -> Hashable:
+        # These are the only parts of the context that `verify` uses.
+        return tuple(get_secret_access_keys(context))
+
 
 def get_secret_access_keys(content: CodeSnippet) -> List[str]:
     # AWS secret access keys are 40 characters long.
@@ -186,7 +193,7 @@ def verify_aws_secret_access_key(key: str, secret: str) -> bool:  # pragma: no c
     )
 
     # Step #5: Finally send the request
-    response = requests.post(
+    response = get_session().post(
         'https://sts.amazonaws.com',
         headers=headers,
         data=body,
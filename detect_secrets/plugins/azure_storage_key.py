@@ -17,6 +17,8 @@ from detect_secrets.util.code_snippet import CodeSnippet
 class AzureStorageKeyDetector(RegexBasedDetector):
     """Scans for Azure Storage Account access keys."""
     secret_type = 'Azure Storage Account access key'
+    required_literals = ('==',)
+    supports_buffer_scan = True
 
     account_key = r'account[_]?k(?:ey)?\b'
     account_key_check = re.compile(r'account[_]?k(?:ey)?\b', re.IGNORECASE)
@@ -43,6 +45,11 @@ class AzureStorageKeyDetector(RegexBasedDetector):
         r'(?i)\b{secret}(.*\n){{0,2}}.*{azure}',
     ]
 
+    @property
+    def is_denylist_exhaustive(self) -> bool:
+        # The context is only used to filter the results of the denylist.
+        return True
+
     def analyze_line(
             self,
             filename: str,
@@ -10,12 +10,19 @@ from __future__ import annotations
 import re
 from abc import ABC
 from abc import abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar
 from typing import Any
+from typing import Callable
 from typing import Dict
 from typing import Generator
+from typing import Hashable
 from typing import Iterable
+from typing import Optional
 from typing import Pattern
 from typing import Set
+from typing import Tuple
+from typing import TypeVar
 
 import requests
 
@@ -24,9 +31,113 @@ from ..core.potential_secret import PotentialSecret
 from ..settings import get_settings
 from detect_secrets.util.code_snippet import CodeSnippet
 from detect_secrets.util.inject import call_function_with_arguments
+from detect_secrets.util.inject import get_injectable_variables
+
+T = TypeVar('T')
+
+class ScanHooks:
+    """
+    How plugins analyze lines, and verify the secrets that they find on them. By default, plugins
+    do this themselves, but the scan engine can replace these (see `set_scan_hooks`), e.g. so
+    that repeated lines are only analyzed once.
+    """
+
+    def analyze_string(self, plugin: BasePlugin, string: str, **kwargs: Any) -> Iterable[str]:
+        return plugin.analyze_string(string, **kwargs)
+
+    def should_verify(self) -> bool:
+        # If the filter is disabled it means --no-verify flag was passed
+        # We won't run verification in that case.
+        return (
+            'detect_secrets.filters.common.is_ignored_due_to_verification_policies'
+            in get_settings().filters
+        )
+
+    def verify_secret(
+        self,
+        plugin: BasePlugin,
+        secret: str,
+        context: Optional[CodeSnippet] = None,
+        raw_context: Optional[CodeSnippet] = None,
+    ) -> Optional[VerifiedResult]:
+        """
+        :raises: requests.exceptions.RequestException
+        """
+        result: Optional[VerifiedResult] = call_function_with_arguments(
+            plugin.verify,
+            secret=secret,
+            context=context,
+            raw_context=raw_context,
+        )
+        return result
+
+    def uses_context(self, plugin: BasePlugin) -> bool:
+        return 'context' in get_injectable_variables(plugin.verify)
+
+
+_scan_hooks = ScanHooks()
+
+
+def get_scan_hooks() -> ScanHooks:
+    return _scan_hooks
+
+
+def set_scan_hooks(hooks: ScanHooks) -> None:
+    global _scan_hooks
+    _scan_hooks = hooks
+
+
+# The state of each plugin (by ID), within the current scan (see `scan_scope`).
+_scan_states: ContextVar[Optional[Dict[int, Any]]] = ContextVar('_scan_states', default=None)
+
+
+@contextmanager
+def scan_scope() -> Generator[None, None, None]:
+    """
+    Within this scope (i.e. a single scan, or a worker's share of one), plugins keep the state
+    that they only need for the scan (see `get_scan_state`). Otherwise, that state lives as long
+    as the plugins do, which for the warm workers of a `ScanPool`, spans many scans.
+
+    NOTE: If there's already an active scope, its state is shared.
+    """
+    if _scan_states.get() is not None:
+        yield
+        return
+
+    token = _scan_states.set({})
+    try:
+        yield
+    finally:
+        _scan_states.reset(token)
+
+
+def get_scan_state(plugin: BasePlugin, factory: Callable[[], T]) -> Optional[T]:
+    """
+    :returns: the plugin's state within the current scan (created by `factory` the first time
+        that it's needed), or None if there's no active scan scope.
+    """
+    states = _scan_states.get()
+    if states is None:
+        return None
+
+    try:
+        return states[id(plugin)]  # type: ignore[no-any-return]
+    except KeyError:
+        return states.setdefault(id(plugin), factory())  # type: ignore[no-any-return]
 
 
 class BasePlugin(ABC):
+    # Optionally, plugins can declare substrings that MUST be present in a line for them to
+    # find anything on it (e.g. all AWS access key IDs start with `AKIA`, or similar). The scan
+    # engine will then only run the plugin on lines that contain at least one of them.
+    #
+    # NOTE: Be conservative! If a secret can be found without any of these substrings in the
+    # line, it will be missed.
+    required_literals: Tuple[str, ...] = ()
+
+    # Same as above, but matched case-insensitively.
+    required_literals_ignore_case: Tuple[str, ...] = ()
+
     @property
     @abstractmethod
     def secret_type(self) -> str:
@@ -56,17 +167,13 @@ class BasePlugin(ABC):
     ) -> Set[PotentialSecret]:
         """This examines a line and finds all possible secret values in it."""
         output = set()
-        for match in self.analyze_string(line, **kwargs):
+        hooks = get_scan_hooks()
+        for match in hooks.analyze_string(self, line, **kwargs):
             is_verified: bool = False
-            # If the filter is disabled it means --no-verify flag was passed
-            # We won't run verification in that case
-            if (
-                    'detect_secrets.filters.common.is_ignored_due_to_verification_policies'
-                    in get_settings().filters
-            ):
+            if hooks.should_verify():
                 try:
-                    verified_result = call_function_with_arguments(
-                        self.verify,
+                    verified_result = hooks.verify_secret(
+                        self,
                         secret=match,
                         context=context,
                         raw_context=raw_context,
@@ -90,6 +197,18 @@ class BasePlugin(ABC):
     def verify(self, secret: str) -> VerifiedResult:
         return VerifiedResult.UNVERIFIED
 
+    def get_verification_context(self, context: CodeSnippet) -> Hashable:
+        """
+        Within a scan, verification results are reused for other occurrences of the same secret
+        (see `detect_secrets.core.verification`), as long as this returns the same value for
+        their contexts.
+
+        This is only used if `verify` accepts the context. By default, the whole context needs
+        to be the same, but plugins should narrow this down to the parts that they actually use
+        (e.g. the corresponding username).
+        """
+        return tuple(context.lines)
+
     def json(self) -> Dict[str, Any]:
         return {
             'name': self.__class__.__name__,
@@ -115,16 +234,21 @@ class BasePlugin(ABC):
             return 'True  (unverified)'
 
         if not secret.is_verified:
-            try:
+            if get_scan_hooks().uses_context(self):
                 # NOTE: There is no context here, since in this frame, we're only aware of the
-                # secret itself.
-                verified_result = self.verify(secret.secret_value)  # type: ignore
-            except (requests.exceptions.RequestException, TypeError):
-                # NOTE: A TypeError is raised when the function expects a `context` to be supplied.
-                # However, if this function is run through a context-less situation (e.g. adhoc
-                # string scanning), we don't have that context to provide. As such, the secret is
+                # secret itself. However, this function expects a `context` to be supplied, and
+                # if this function is run through a context-less situation (e.g. adhoc string
+                # scanning), we don't have that context to provide. As such, the secret is
                 # UNVERIFIED.
                 verified_result = VerifiedResult.UNVERIFIED
+            else:
+                try:
+                    verified_result = get_scan_hooks().verify_secret(
+                        self,
+                        secret=secret.secret_value,  # type: ignore
+                    )
+                except requests.exceptions.RequestException:
+                    verified_result = VerifiedResult.UNVERIFIED
         else:
             # It's not going to be VERIFIED_FALSE, otherwise, we won't have the secret object
             # to format.
@@ -164,11 +288,35 @@ class RegexBasedDetector(BasePlugin):
         )
     """
 
+    # If True, the `denylist` patterns are run over the whole file at once (rather than line by
+    # line), and the plugin is only invoked on the lines that they matched.
+    #
+    # NOTE: This is only safe if no pattern can match across lines, or depends on where a line
+    # starts or ends (e.g. `^`, `$`, `\s`, or negated character classes that allow newlines),
+    # since lines are joined with newlines, and are not stripped yet.
+    supports_buffer_scan = False
+
     @property
     @abstractmethod
     def denylist(self) -> Iterable[Pattern]:
         raise NotImplementedError
 
+    @property
+    def is_denylist_exhaustive(self) -> bool:
+        """
+        If True, this plugin will never find a secret on a line that none of its `denylist`
+        patterns match. The scan engine uses this to skip the plugin entirely on such lines
+        (see `detect_secrets.core.prefilter`).
+
+        We can only assume this for plugins that don't customize how lines are analyzed.
+        Plugins that override `analyze_line` or `analyze_string` should override this too,
+        if their findings are still restricted to lines matched by the `denylist`.
+        """
+        return (
+            type(self).analyze_line is BasePlugin.analyze_line
+            and type(self).analyze_string is RegexBasedDetector.analyze_string
+        )
+
     def analyze_string(self, string: str) -> Generator[str, None, None]:
         for regex in self.denylist:
             for match in regex.findall(string):
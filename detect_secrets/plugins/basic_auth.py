@@ -20,6 +20,8 @@ SUB_DELIMITER_CHARACTERS = '!$&\'()*+,;='
 class BasicAuthDetector(RegexBasedDetector):
     """Scans for Basic Auth formatted URIs."""
     secret_type = 'Basic Auth Credentials'
+    required_literals = ('://',)
+    supports_buffer_scan = True
 
     denylist = [
         re.compile(
@@ -30,6 +32,11 @@ class BasicAuthDetector(RegexBasedDetector):
         ),
     ]
 
+    @property
+    def is_denylist_exhaustive(self) -> bool:
+        # We only ever filter the results of the denylist.
+        return True
+
     def analyze_line(
             self,
             filename: str,
@@ -1,10 +1,12 @@
 import re
+from typing import Hashable
 from typing import List
 
 import requests
 
 from ..constants import VerifiedResult
 from ..util.code_snippet import CodeSnippet
+from ..util.http import get_session
 from .base import RegexBasedDetector
 
 
@@ -12,6 +14,8 @@ class CloudantDetector(RegexBasedDetector):
     """Scans for Cloudant credentials."""
 
     secret_type = 'Cloudant Credentials'
+    required_literals_ignore_case = ('cl',)
+    supports_buffer_scan = True
 
     # opt means optional
     dot = r'\.'
@@ -76,6 +80,10 @@ class CloudantDetector(RegexBasedDetector):
 
         return VerifiedResult.VERIFIED_FALSE
 
+    def get_verification_context(self, context: CodeSnippet) -> Hashable:
+        # These are the only parts of the context that `verify` uses.
+        return tuple(find_account(context))
+
 
 def find_account(context: CodeSnippet) -> List[str]:
     opt_hostname_keyword = r'(?:hostname|host|username|id|user|userid|user-id|user-name|' \
@@ -120,7 +128,7 @@ def verify_cloudant_key(hostname: str, token: str) -> VerifiedResult:
         )
 
     try:
-        response = requests.get(
+        response = get_session().get(
             request_url,
             headers=headers,
         )
@@ -9,6 +9,7 @@ from .base import RegexBasedDetector
 class DiscordBotTokenDetector(RegexBasedDetector):
     """Scans for Discord Bot token."""
     secret_type = 'Discord Bot Token'
+    supports_buffer_scan = True
 
     denylist = [
         # Discord Bot Token ([M|N|O]XXXXXXXXXXXXXXXXXXXXXXX[XX].XXXXXX.XXXXXXXXXXXXXXXXXXXXXXXXXXX)
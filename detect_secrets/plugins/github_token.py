@@ -9,6 +9,8 @@ from detect_secrets.plugins.base import RegexBasedDetector
 class GitHubTokenDetector(RegexBasedDetector):
     """Scans for GitHub tokens."""
     secret_type = 'GitHub Token'
+    required_literals = ('ghp_', 'gho_', 'ghu_', 'ghs_', 'ghr_')
+    supports_buffer_scan = True
 
     denylist = [
         # ref. https://github.blog/2021-04-05-behind-githubs-new-authentication-token-formats/
@@ -3,12 +3,14 @@ from __future__ import annotations
 import math
 import re
 import string
+import threading
 from abc import ABCMeta
 from contextlib import contextmanager
 from typing import Any
 from typing import cast
 from typing import Dict
 from typing import Generator
+from typing import Pattern
 from typing import Set
 
 from ..core.potential_secret import PotentialSecret
@@ -32,6 +34,18 @@ class HighEntropyStringsPlugin(BasePlugin, metaclass=ABCMeta):
         # NOTE: We need this to be a capturing group, so back-reference can work.
         self.regex = re.compile(r'([\'":=])\s*([{}]+)([\'"]|$)'.format(re.escape(charset)))
 
+        # NOTE: Plugins are shared by all threads that scan with them (see `ScanPool`), so
+        # `non_quoted_string_regex` only overrides the regex for the current thread.
+        self._local = threading.local()
+
+    @property
+    def regex(self) -> Pattern[str]:
+        return cast(Pattern[str], getattr(self._local, 'regex', None) or self._regex)
+
+    @regex.setter
+    def regex(self, value: Pattern[str]) -> None:
+        self._regex = value
+
     def analyze_string(self, string: str) -> Generator[str, None, None]:
         for result in self.regex.findall(string):
             if isinstance(result, tuple):
@@ -132,18 +146,18 @@ class HighEntropyStringsPlugin(BasePlugin, metaclass=ABCMeta):
             However, if the secret is part of a line of text, and you want to find the
             secret within the line, use False.
         """
-        old_regex = self.regex
+        old_regex = getattr(self._local, 'regex', None)
 
         regex_alternative = r'([{}]+)'.format(re.escape(self.charset))
         if is_exact_match:
             regex_alternative = r'^' + regex_alternative + r'$'
 
-        self.regex = re.compile(regex_alternative)
+        self._local.regex = re.compile(regex_alternative)
 
         try:
             yield
         finally:
-            self.regex = old_regex
+            self._local.regex = old_regex
 
 
 class Base64HighEntropyString(HighEntropyStringsPlugin):
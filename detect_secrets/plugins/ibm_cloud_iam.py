@@ -9,6 +9,7 @@ import requests
 from ..constants import VerifiedResult
 from ..core.potential_secret import PotentialSecret
 from ..util.code_snippet import CodeSnippet
+from ..util.http import get_session
 from .base import RegexBasedDetector
 from .high_entropy_strings import Base64HighEntropyString
 
@@ -17,6 +18,8 @@ class IbmCloudIamDetector(RegexBasedDetector):
     """Scans for IBM Cloud IAM Key."""
 
     secret_type = 'IBM Cloud IAM Key'
+    required_literals_ignore_case = ('key', 'pwd', 'pass', 'token')
+    supports_buffer_scan = True
     # opt means optional
     opt_ibm_cloud_iam = r'(?:ibm(?:_|-|)cloud(?:_|-|)iam|cloud(?:_|-|)iam|' + \
         r'ibm(?:_|-|)cloud|ibm(?:_|-|)iam|ibm|iam|cloud|)'
@@ -42,6 +45,11 @@ class IbmCloudIamDetector(RegexBasedDetector):
         return VerifiedResult.VERIFIED_TRUE if response.status_code == 200 \
             else VerifiedResult.VERIFIED_FALSE
 
+    @property
+    def is_denylist_exhaustive(self) -> bool:
+        # We only ever filter the results of the denylist.
+        return True
+
     def analyze_line(
         self,
         filename: str,
@@ -71,7 +79,7 @@ def verify_cloud_iam_api_key(apikey: Union[str, bytes]) -> requests.Response:  #
         'Content-Type': 'application/x-www-form-urlencoded',
         'Accept': 'application/json',
     }
-    response = requests.post(
+    response = get_session().post(
         'https://iam.cloud.ibm.com/identity/token',
         headers=headers,
         data={
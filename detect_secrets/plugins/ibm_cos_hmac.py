@@ -2,12 +2,14 @@ import hashlib
 import hmac
 from datetime import datetime
 from datetime import timezone
+from typing import Hashable
 from typing import List
 
 import requests
 
 from ..constants import VerifiedResult
 from ..util.code_snippet import CodeSnippet
+from ..util.http import get_session
 from .base import RegexBasedDetector
 
 
@@ -20,6 +22,8 @@ class IbmCosHmacDetector(RegexBasedDetector):
     #   host, defaults to 's3.us.cloud-object-storage.appdomain.cloud'
 
     secret_type = 'IBM COS HMAC Credentials'
+    required_literals_ignore_case = ('secret',)
+    supports_buffer_scan = True
 
     token_prefix = r'(?:(?:ibm)?[-_]?cos[-_]?(?:hmac)?|)'
     password_keyword = r'(?:secret[-_]?(?:access)?[-_]?key)'
@@ -52,6 +56,10 @@ class IbmCosHmacDetector(RegexBasedDetector):
 
         return VerifiedResult.VERIFIED_FALSE
 
+    def get_verification_context(self, context: CodeSnippet) -> Hashable:
+        # These are the only parts of the context that `verify` uses.
+        return tuple(find_access_key_id(context))
+
 
 def find_access_key_id(context: CodeSnippet) -> List[str]:
     key_id_keyword_regex = r'(?:access[-_]?(?:key)?[-_]?(?:id)?|key[-_]?id)'
@@ -160,6 +168,6 @@ def query_ibm_cos_hmac(
     # the 'requests' package automatically adds the required 'host' header
     request_url = endpoint + standardized_resource + standardized_querystring
 
-    request = requests.get(request_url, headers=headers)
+    request = get_session().get(request_url, headers=headers)
 
     return request
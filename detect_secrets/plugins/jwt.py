@@ -12,10 +12,17 @@ from .base import RegexBasedDetector
 class JwtTokenDetector(RegexBasedDetector):
     """Scans for JWTs."""
     secret_type = 'JSON Web Token'
+    required_literals = ('eyJ',)
+    supports_buffer_scan = True
     denylist = [
         re.compile(r'eyJ[A-Za-z0-9-_=]+\.[A-Za-z0-9-_=]+\.?[A-Za-z0-9-_.+/=]*'),
     ]
 
+    @property
+    def is_denylist_exhaustive(self) -> bool:
+        # We only ever filter the results of the denylist.
+        return True
+
     def analyze_string(self, string: str) -> Generator[str, None, None]:
         yield from filter(
             self.is_formally_valid,
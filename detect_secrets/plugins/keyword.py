@@ -353,9 +353,14 @@ class KeywordDetector(BasePlugin):
         line_number: int = 0,
         context: CodeSnippet | None = None,
         raw_context: CodeSnippet | None = None,
+        file_type: FileType | None = None,
         **kwargs: Any,
     ) -> Set[PotentialSecret]:
-        filetype = determine_file_type(filename)
+        """
+        :param file_type: if not supplied, it is derived from the filename. The scan engine
+            supplies it, so that we don't need to compute it for every line.
+        """
+        filetype = file_type or determine_file_type(filename)
         denylist_regex_to_group = REGEX_BY_FILETYPE.get(filetype, QUOTES_REQUIRED_DENYLIST_REGEX_TO_GROUP)  # noqa: E501
         return super().analyze_line(
             filename=filename,
@@ -4,15 +4,16 @@ This plugin searches for Mailchimp keys
 import re
 from base64 import b64encode
 
-import requests
-
 from ..constants import VerifiedResult
+from ..util.http import get_session
 from .base import RegexBasedDetector
 
 
 class MailchimpDetector(RegexBasedDetector):
     """Scans for Mailchimp keys."""
     secret_type = 'Mailchimp Access Key'
+    required_literals = ('-us',)
+    supports_buffer_scan = True
 
     denylist = (
         re.compile(r'[0-9a-z]{32}-us[0-9]{1,2}'),
@@ -21,7 +22,7 @@ class MailchimpDetector(RegexBasedDetector):
     def verify(self, secret: str) -> VerifiedResult:  # pragma: no cover
         _, datacenter_number = secret.split('-us')
 
-        response = requests.get(
+        response = get_session().get(
             'https://us{}.api.mailchimp.com/3.0/'.format(
                 datacenter_number,
             ),
@@ -9,6 +9,7 @@ from detect_secrets.plugins.base import RegexBasedDetector
 class NpmDetector(RegexBasedDetector):
     """Scans for NPM tokens."""
     secret_type = 'NPM tokens'
+    required_literals = ('npm_', '_authToken', 'NPM')
 
     denylist = [
         # npmrc authToken
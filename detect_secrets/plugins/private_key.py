@@ -32,8 +32,10 @@ from typing import Optional
 from typing import Set
 from typing import Tuple
 
+from ..core.file_context import FileContext
 from ..core.potential_secret import PotentialSecret
 from ..util.code_snippet import CodeSnippet
+from .base import get_scan_state
 from .base import RegexBasedDetector
 
 
@@ -67,8 +69,21 @@ class PrivateKeyDetector(RegexBasedDetector):
     ]
 
     def __init__(self) -> None:
-        self._analyzed_files: Set[str] = set()
-        self._commit_hashes: Set[Tuple[str, str]] = set()
+        # NOTE: This is only used outside of scans. Within them, the state belongs to the scan
+        # (see `scan_scope`), rather than to the plugin, which is shared by all threads that scan
+        # with it (see `ScanPool`), and by all scans of the (warm) workers.
+        self._state = _ScanState()
+
+    @property
+    def _analyzed_files(self) -> Set[str]:
+        return self._get_state().analyzed_files
+
+    @property
+    def _commit_hashes(self) -> Set[Tuple[str, str]]:
+        return self._get_state().commit_hashes
+
+    def _get_state(self) -> '_ScanState':
+        return get_scan_state(self, _ScanState) or self._state
 
     def analyze_line(
             self,
@@ -78,8 +93,13 @@ class PrivateKeyDetector(RegexBasedDetector):
             context: Optional[CodeSnippet] = None,
             raw_context: Optional[CodeSnippet] = None,
             commit_hash: Optional[str] = '',
+            file_context: Optional[FileContext] = None,
             **kwargs: Any,
     ) -> Set[PotentialSecret]:
+        """
+        :param file_context: if supplied (by the scan engine), the file's contents are taken
+            from here, rather than reading the file again.
+        """
         output: Set[PotentialSecret] = set()
 
         output.update(
@@ -112,9 +132,9 @@ class PrivateKeyDetector(RegexBasedDetector):
             return output
 
         if filename not in self._analyzed_files \
-                and 0 < self.get_file_size(filename) < PrivateKeyDetector.MAX_FILE_SIZE:
+                and 0 < self._get_file_size(filename, file_context) < self.MAX_FILE_SIZE:
             self._analyzed_files.add(filename)
-            file_content = self.read_file(filename)
+            file_content = self._read_file(filename, file_context)
             if file_content:
                 found_secrets = super().analyze_line(
                     filename=filename, line=file_content, line_number=1,
@@ -171,6 +191,18 @@ class PrivateKeyDetector(RegexBasedDetector):
         except Exception:
             return ''
 
+    def _read_file(self, file_path: str, file_context: Optional[FileContext]) -> str:
+        if not file_context:
+            return self.read_file(file_path)
+
+        try:
+            return file_context.text
+        except UnicodeDecodeError:
+            return ''
+
+    def _get_file_size(self, file_path: str, file_context: Optional[FileContext]) -> int:
+        return file_context.size if file_context else self.get_file_size(file_path)
+
     def get_file_size(self, file_path: str) -> int:
         try:
             return os.path.getsize(file_path)
@@ -188,3 +220,9 @@ class PrivateKeyDetector(RegexBasedDetector):
             if substring in line:
                 return line_number
         return default_line_number
+
+
+class _ScanState:
+    def __init__(self) -> None:
+        self.analyzed_files: Set[str] = set()
+        self.commit_hashes: Set[Tuple[str, str]] = set()
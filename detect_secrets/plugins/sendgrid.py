@@ -9,6 +9,8 @@ from detect_secrets.plugins.base import RegexBasedDetector
 class SendGridDetector(RegexBasedDetector):
     """Scans for SendGrid API keys."""
     secret_type = 'SendGrid API Key'
+    required_literals = ('SG.',)
+    supports_buffer_scan = True
 
     denylist = [
         # SendGrid API key
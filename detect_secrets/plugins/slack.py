@@ -6,15 +6,16 @@ from typing import Any
 from typing import cast
 from typing import Dict
 
-import requests
-
 from ..constants import VerifiedResult
+from ..util.http import get_session
 from .base import RegexBasedDetector
 
 
 class SlackDetector(RegexBasedDetector):
     """Scans for Slack tokens."""
     secret_type = 'Slack Token'
+    required_literals_ignore_case = ('xox', 'hooks.slack.com/services/')
+    supports_buffer_scan = True
 
     denylist = (
         # Slack Token
@@ -28,7 +29,7 @@ class SlackDetector(RegexBasedDetector):
 
     def verify(self, secret: str) -> VerifiedResult:  # pragma: no cover
         if secret.startswith('https://hooks.slack.com/services/T'):
-            response = requests.post(
+            response = get_session().post(
                 secret,
                 json={
                     'text': '',
@@ -36,7 +37,7 @@ class SlackDetector(RegexBasedDetector):
             )
             valid = response.text in ['missing_text_or_fallback_or_attachments', 'no_text']
         else:
-            response = requests.post(
+            response = get_session().post(
                 'https://slack.com/api/auth.test',
                 data={
                     'token': secret,
@@ -1,10 +1,12 @@
 import re
+from typing import Hashable
 from typing import List
 
 import requests
 
 from ..constants import VerifiedResult
 from ..util.code_snippet import CodeSnippet
+from ..util.http import get_session
 from .base import RegexBasedDetector
 
 
@@ -12,6 +14,8 @@ class SoftlayerDetector(RegexBasedDetector):
     """Scans for Softlayer credentials."""
 
     secret_type = 'SoftLayer Credentials'
+    required_literals_ignore_case = ('softlayer', 'sl')
+    supports_buffer_scan = True
 
     # opt means optional
     sl = r'(?:softlayer|sl)(?:_|-|)(?:api|)'
@@ -44,6 +48,10 @@ class SoftlayerDetector(RegexBasedDetector):
 
         return VerifiedResult.VERIFIED_FALSE
 
+    def get_verification_context(self, context: CodeSnippet) -> Hashable:
+        # These are the only parts of the context that `verify` uses.
+        return tuple(find_username(context))
+
 
 def find_username(context: CodeSnippet) -> List[str]:
     # opt means optional
@@ -72,7 +80,7 @@ def find_username(context: CodeSnippet) -> List[str]:
 def verify_softlayer_key(username: str, token: str) -> VerifiedResult:
     headers = {'Content-type': 'application/json'}
     try:
-        response = requests.get(
+        response = get_session().get(
             'https://api.softlayer.com/rest/v3/SoftLayer_Account.json',
             auth=(username, token), headers=headers,
         )
@@ -6,6 +6,8 @@ from .base import RegexBasedDetector
 class SquareOAuthDetector(RegexBasedDetector):
     """Scans for Square OAuth Secrets"""
     secret_type = 'Square OAuth Secret'
+    required_literals = ('sq0csp-',)
+    supports_buffer_scan = True
 
     denylist = [
         re.compile(r'sq0csp-[0-9A-Za-z\\\-_]{43}'),
@@ -1,15 +1,16 @@
 import re
 from base64 import b64encode
 
-import requests
-
 from ..constants import VerifiedResult
+from ..util.http import get_session
 from .base import RegexBasedDetector
 
 
 class StripeDetector(RegexBasedDetector):
     """Scans for Stripe keys."""
     secret_type = 'Stripe Access Key'
+    required_literals = ('k_live_',)
+    supports_buffer_scan = True
 
     denylist = (
         # Stripe standard keys begin with sk_live and restricted with rk_live
@@ -17,7 +18,7 @@ class StripeDetector(RegexBasedDetector):
     )
 
     def verify(self, secret: str) -> VerifiedResult:  # pragma: no cover
-        response = requests.get(
+        response = get_session().get(
             'https://api.stripe.com/v1/charges',
             headers={
                 'Authorization': b'Basic ' + b64encode(
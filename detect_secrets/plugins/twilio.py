@@ -9,6 +9,8 @@ from .base import RegexBasedDetector
 class TwilioKeyDetector(RegexBasedDetector):
     """Scans for Twilio API keys."""
     secret_type = 'Twilio API Key'
+    required_literals = ('AC', 'SK')
+    supports_buffer_scan = True
 
     denylist = [
         # Account SID (ACxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx)
@@ -1,18 +1,34 @@
 import argparse
+import copy
 import json
+import multiprocessing as mp
 import os
+import subprocess
 import sys
 import textwrap
+from typing import Any
+from typing import Dict
 from typing import List
 from typing import Optional
 
 from detect_secrets.__version__ import VERSION
 from detect_secrets.core import baseline
+from detect_secrets.core import scan
+from detect_secrets.core import verification
+from detect_secrets.core.file_context import FileContext
 from detect_secrets.core.log import log
+from detect_secrets.core.potential_secret import PotentialSecret
 from detect_secrets.core.secrets_collection import SecretsCollection
 from detect_secrets.core.usage import ParserBuilder
 from detect_secrets.util import color
 from detect_secrets.util import git
+from detect_secrets.util.code_snippet import LINES_OF_CONTEXT
+
+
+# Starting workers takes longer than scanning a few small files, so commits with fewer (or
+# smaller) files than this are scanned serially.
+MIN_PARALLEL_FILES = int(os.getenv('CHECKOV_HOOK_MIN_PARALLEL_FILES', '4'))
+MIN_PARALLEL_BYTES = int(os.getenv('CHECKOV_HOOK_MIN_PARALLEL_BYTES', str(128 * 1024)))
 
 
 def main(argv: Optional[List[str]] = None) -> int:
@@ -25,9 +41,15 @@ def main(argv: Optional[List[str]] = None) -> int:
         log.set_debug_level(args.verbose)
 
     # Find all secrets in files to be committed
-    secrets = SecretsCollection()
-    for filename in args.filenames:
-        secrets.scan_file(filename)
+    secrets = None
+    if args.diff_only:
+        try:
+            secrets = scan_staged_changes(args.filenames, known_secrets=args.baseline)
+        except subprocess.CalledProcessError:
+            log.warning('Unable to get staged changes. Scanning files in full instead.')
+
+    if secrets is None:
+        secrets = scan_files(args.filenames, num_processors=args.num_cores)
 
     new_secrets = secrets
     if args.baseline:
@@ -99,6 +121,168 @@ def raise_exception_if_baseline_file_is_unstaged(filename: str) -> None:
         raise ValueError
 
 
+@verification.memoize()
+def scan_files(filenames: List[str], num_processors: Optional[int] = None) -> SecretsCollection:
+    """
+    Scans the files in parallel, unless there are too few of them (or they are too small) for
+    that to pay off.
+
+    :param num_processors: defaults to the number of CPUs.
+    """
+    secrets = SecretsCollection()
+
+    # NOTE: Each file is only scanned by a single worker, so more workers would just be idle.
+    num_processors = min(num_processors or mp.cpu_count(), len(filenames))
+    if num_processors > 1 and _should_scan_in_parallel(filenames):
+        secrets.scan_files(*filenames, num_processors=num_processors)
+    else:
+        for filename in filenames:
+            secrets.scan_file(filename)
+
+    return secrets
+
+
+def _should_scan_in_parallel(filenames: List[str]) -> bool:
+    if len(filenames) < MIN_PARALLEL_FILES:
+        return False
+
+    size = 0
+    for filename in filenames:
+        try:
+            size += os.stat(filename).st_size
+        except OSError:
+            # NOTE: Scanning takes care of logging this.
+            continue
+
+        if size >= MIN_PARALLEL_BYTES:
+            return True
+
+    return False
+
+
+@verification.memoize()
+def scan_staged_changes(
+    filenames: List[str],
+    known_secrets: Optional[SecretsCollection] = None,
+) -> SecretsCollection:
+    """
+    Like scanning the files (as staged), except that only the lines added by the staged changes
+    are scanned, so that this takes time proportional to the size of the changes, rather than
+    the size of the files. Files without staged changes are not scanned at all.
+
+    To keep the baseline up to date (see `should_update_baseline`), known secrets on lines that
+    were not changed are carried over, with their line numbers shifted by the changes before
+    them. This assumes that their line numbers match the last commit, which the hook takes care
+    of. If a known secret's line was changed (or its line number isn't known), there's no
+    telling whether it's still there, so its file is scanned in full instead.
+
+    :param known_secrets: e.g. the baseline.
+    :raises: CalledProcessError
+    """
+    secrets = SecretsCollection()
+    if not filenames:
+        # NOTE: Otherwise, git would diff every file.
+        return secrets
+
+    diff = git.get_staged_diff(*filenames, context=LINES_OF_CONTEXT)
+    patched_files = _get_patched_files(diff)
+
+    # NOTE: Plugins that look at whole files (e.g. PrivateKeyDetector) need to see them as they
+    # are staged, rather than as they are in the working tree.
+    file_contexts = {
+        path: FileContext(path, content)
+        for path, content in git.get_staged_files(
+            *(patched_file.path for patched_file in patched_files.values()),
+        ).items()
+    }
+    secrets.scan_diff(diff, only_added_lines=True, file_contexts=file_contexts)
+    if not known_secrets:
+        return secrets
+
+    known_files = known_secrets.files
+    for filename in filenames:
+        if filename not in known_files:
+            continue
+
+        patched_file = patched_files.get(os.path.normpath(filename))
+        if not patched_file:
+            # NOTE: Files without staged changes keep their known secrets, as they are.
+            secrets[filename] = set(known_secrets[filename])
+            continue
+
+        found = secrets.data.get(filename, set())
+        carried_over: List[PotentialSecret] = []
+        should_rescan = False
+        for secret in known_secrets[filename]:
+            line_number = _get_new_line_number(patched_file, secret.line_number)
+            if line_number:
+                carried_over.append(_move_secret(secret, line_number))
+            elif secret not in found:
+                should_rescan = True
+                break
+
+        if should_rescan:
+            # NOTE: If the file was deleted, there's nothing left to find in it.
+            file_context = file_contexts.get(patched_file.path)
+            secrets[filename] = (
+                set(scan.scan_file(filename, file_context=file_context))
+                if file_context
+                else set()
+            )
+            continue
+
+        # NOTE: Just like scanning the file in full, the first occurrence of each secret wins.
+        output: Dict[PotentialSecret, PotentialSecret] = {}
+        for secret in sorted([*found, *carried_over], key=lambda x: x.line_number or 0):
+            output.setdefault(secret, secret)
+
+        secrets[filename] = set(output)
+
+    return secrets
+
+
+def _get_patched_files(diff: str) -> Dict[str, Any]:
+    """
+    :returns: mapping of filenames to their changes (see `unidiff.PatchedFile`).
+    """
+    return {
+        os.path.normpath(patched_file.path): patched_file
+        for patched_file in scan.parse_diff(diff)
+    }
+
+
+def _get_new_line_number(patched_file: Any, line_number: Optional[int]) -> Optional[int]:
+    """
+    :param line_number: in the last commit.
+    :returns: the line number in the staged file, or None if the line was changed (or removed).
+    """
+    if not line_number:
+        return None
+
+    offset = 0
+    for hunk in patched_file:
+        # NOTE: Hunks that only add lines start at the line that they're added after.
+        start = hunk.source_start if hunk.source_length else hunk.source_start + 1
+        if line_number < start:
+            break
+
+        if line_number < hunk.source_start + hunk.source_length:
+            for line in hunk:
+                if line.source_line_no == line_number:
+                    return line.target_line_no if line.is_context else None
+
+        offset += hunk.added - hunk.removed
+
+    return line_number + offset
+
+
+def _move_secret(secret: PotentialSecret, line_number: int) -> PotentialSecret:
+    output = copy.copy(secret)
+    output.line_number = line_number
+
+    return output
+
+
 def should_update_baseline(
     secrets: SecretsCollection,
     scanned_results: SecretsCollection,
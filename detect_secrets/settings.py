@@ -1,7 +1,6 @@
 import contextlib
 from contextlib import contextmanager
 from copy import deepcopy
-from functools import lru_cache
 from importlib import import_module
 from typing import Any
 from typing import Dict
@@ -11,13 +10,16 @@ from urllib.parse import urlparse
 
 from .exceptions import InvalidFile
 from .util.importlib import import_file_as_module
+from .util.threads import synchronized_cache
 
 
-@lru_cache(maxsize=1)
+@synchronized_cache
 def get_settings() -> 'Settings':
     """
     This is essentially a singleton pattern, that allows for (controlled) global access
     to common variables.
+
+    NOTE: This is shared by all threads (see `synchronized_cache`).
     """
     return Settings()
 
@@ -89,9 +91,13 @@ def transient_settings(config: Dict[str, Any]) -> Generator['Settings', None, No
 
 
 def cache_bust() -> None:
+    # We need to import this here, otherwise it will result in a circular dependency.
+    from .core.plan import _get_scan_plan
+
     get_plugins.cache_clear()
 
     get_filters.cache_clear()
+    _get_scan_plan.cache_clear()
     for path in get_settings().filters:
         # Need to also clear the individual caches (e.g. cached regex patterns).
         parts = urlparse(path)
@@ -257,7 +263,7 @@ class Settings:
         }
 
 
-@lru_cache(maxsize=1)
+@synchronized_cache
 def get_plugins() -> List:
     # We need to import this here, otherwise it will result in a circular dependency.
     from .core import plugins
@@ -268,7 +274,7 @@ def get_plugins() -> List:
     ]
 
 
-@lru_cache(maxsize=1)
+@synchronized_cache
 def get_filters() -> List:
     from .core.log import log
     from .util.inject import get_injectable_variables
@@ -1,15 +1,21 @@
 from typing import Generator
 from typing import List
+from typing import Optional
+from typing import Sequence
 
 from .color import AnsiColor
 from .color import colorize
 from detect_secrets.exceptions import SecretNotFoundOnSpecifiedLineError
 
 
+# The number of lines around a secret, that it is found (and filtered) with.
+LINES_OF_CONTEXT = 5
+
+
 def get_code_snippet(
-    lines: List[str],
+    lines: Sequence[str],
     line_number: int,
-    lines_of_context: int = 5,
+    lines_of_context: int = LINES_OF_CONTEXT,
 ) -> 'CodeSnippet':
     """
     :param lines: an iterator of lines in the file
@@ -30,9 +36,10 @@ def get_code_snippet(
         start_line_index = 0
         end_line_index = len(lines)
 
-    return CodeSnippet(
-        snippet=lines[start_line_index:end_line_index],
+    return CodeSnippet.from_lines(
+        lines,
         start_line=start_line_index,
+        end_line=end_line_index,
         target_index=target_line_index,
     )
 
@@ -45,13 +52,55 @@ class CodeSnippet:
         :param start_line: first line number in segment
         :param target_index: index in snippet of target line
         """
-        self.lines = snippet
+        self._lines: Optional[List[str]] = snippet
+        self._source: Sequence[str] = snippet
+        self._offset = 0
+        self._length = len(snippet)
+
         self.start_line = start_line
         self.target_index = target_index
 
+    @classmethod
+    def from_lines(
+        cls,
+        lines: Sequence[str],
+        start_line: int,
+        end_line: int,
+        target_index: int,
+    ) -> 'CodeSnippet':
+        """
+        Snippets are created for every line that we scan, but most of them are only used to
+        look up a line or two (if at all). Therefore, this creates a view of
+        `lines[start_line:end_line]`, which is only copied if the snippet is modified.
+
+        NOTE: This assumes that `lines` isn't modified while the snippet is in use.
+        """
+        snippet = cls([], start_line=start_line, target_index=target_index)
+        snippet._lines = None
+        snippet._source = lines
+        snippet._offset = start_line
+        snippet._length = max(0, min(end_line, len(lines)) - start_line)
+
+        return snippet
+
+    @property
+    def lines(self) -> List[str]:
+        if self._lines is None:
+            self._lines = list(self._source[self._offset:self._offset + self._length])
+            self._source = self._lines
+            self._offset = 0
+
+        return self._lines
+
+    @lines.setter
+    def lines(self, value: List[str]) -> None:
+        self._lines = self._source = value
+        self._offset = 0
+        self._length = len(value)
+
     @property
     def target_line(self) -> str:
-        return self.lines[self.target_index]
+        return self._get_line(self.target_index)
 
     @target_line.setter
     def target_line(self, value: str) -> None:
@@ -59,9 +108,10 @@ class CodeSnippet:
 
     @property
     def previous_line(self) -> str:
-        if self.target_index == 0 or len(self.lines) < self.target_index:
+        length = self._length if self._lines is None else len(self._lines)
+        if self.target_index == 0 or length < self.target_index:
             return ''
-        return self.lines[self.target_index - 1]
+        return self._get_line(self.target_index - 1)
 
     def add_line_numbers(self) -> 'CodeSnippet':
         for index, line in enumerate(self.lines):
@@ -96,7 +146,25 @@ class CodeSnippet:
         return colorize(payload, AnsiColor.RED_BACKGROUND)
 
     def __str__(self) -> str:
-        return '\n'.join(self.lines)
+        return '\n'.join(self)
 
     def __iter__(self) -> Generator[str, None, None]:
-        yield from self.lines
+        if self._lines is not None:
+            yield from self._lines
+            return
+
+        for index in range(self._offset, self._offset + self._length):
+            yield self._source[index]
+
+    def _get_line(self, index: int) -> str:
+        """Same as `self.lines[index]`, without copying the lines."""
+        if self._lines is not None:
+            return self._lines[index]
+
+        if index < 0:
+            index += self._length
+
+        if not 0 <= index < self._length:
+            raise IndexError('list index out of range')
+
+        return self._source[self._offset + index]
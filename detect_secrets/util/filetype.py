@@ -25,32 +25,35 @@ class FileType(Enum):
     JSON = 19
 
 
+FILE_TYPE_BY_EXTENSION = {
+    '.cls': FileType.CLS,
+    '.example': FileType.EXAMPLE,
+    '.eyaml': FileType.YAML,
+    '.go': FileType.GO,
+    '.java': FileType.JAVA,
+    '.js': FileType.JAVASCRIPT,
+    '.m': FileType.OBJECTIVE_C,
+    '.php': FileType.PHP,
+    '.py': FileType.PYTHON,
+    '.pyi': FileType.PYTHON,
+    '.swift': FileType.SWIFT,
+    '.tf': FileType.TERRAFORM,
+    '.yaml': FileType.YAML,
+    '.yml': FileType.YAML,
+    '.json': FileType.JSON,
+    '.cs': FileType.C_SHARP,
+    '.c': FileType.C,
+    '.cpp': FileType.C_PLUS_PLUS,
+    '.cnf': FileType.CONFIG,
+    '.conf': FileType.CONFIG,
+    '.cfg': FileType.CONFIG,
+    '.cf': FileType.CONFIG,
+    '.ini': FileType.INI,
+    '.properties': FileType.PROPERTIES,
+    '.toml': FileType.TOML,
+}
+
+
 def determine_file_type(filename: str) -> FileType:
     _, file_extension = os.path.splitext(filename)
-    return {
-        '.cls': FileType.CLS,
-        '.example': FileType.EXAMPLE,
-        '.eyaml': FileType.YAML,
-        '.go': FileType.GO,
-        '.java': FileType.JAVA,
-        '.js': FileType.JAVASCRIPT,
-        '.m': FileType.OBJECTIVE_C,
-        '.php': FileType.PHP,
-        '.py': FileType.PYTHON,
-        '.pyi': FileType.PYTHON,
-        '.swift': FileType.SWIFT,
-        '.tf': FileType.TERRAFORM,
-        '.yaml': FileType.YAML,
-        '.yml': FileType.YAML,
-        '.json': FileType.JSON,
-        '.cs': FileType.C_SHARP,
-        '.c': FileType.C,
-        '.cpp': FileType.C_PLUS_PLUS,
-        '.cnf': FileType.CONFIG,
-        '.conf': FileType.CONFIG,
-        '.cfg': FileType.CONFIG,
-        '.cf': FileType.CONFIG,
-        '.ini': FileType.INI,
-        '.properties': FileType.PROPERTIES,
-        '.toml': FileType.TOML,
-    }.get(file_extension, FileType.OTHER)
+    return FILE_TYPE_BY_EXTENSION.get(file_extension, FileType.OTHER)
@@ -1,6 +1,10 @@
 import os
 import subprocess
+from typing import Dict
+from typing import IO
+from typing import Iterator
 from typing import Set
+from typing import Tuple
 
 from ..core.log import log
 from .path import get_relative_path
@@ -18,6 +22,11 @@ def get_root_directory(path: str = '') -> str:
     return subprocess.check_output(command).decode('utf-8').strip()  # noqa: S603
 
 
+# The modes that `git ls-files --stage` lists entries with.
+SYMLINK_MODE = '120000'
+SUBMODULE_MODE = '160000'
+
+
 def get_tracked_files(root: str) -> Set[str]:
     """Parsing .gitignore rules is hard.
 
@@ -30,20 +39,170 @@ def get_tracked_files(root: str) -> Set[str]:
     """
     output = set()
     try:
-        files = subprocess.check_output(
-            ['git', '-C', root, 'ls-files'],  # noqa: S603,S607
-            stderr=subprocess.DEVNULL,
-        )
+        for mode, filename in iter_tracked_files(root):
+            # NOTE: Only symbolic links need to be resolved, since git doesn't track files
+            # through them.
+            if mode == SYMLINK_MODE:
+                path = get_relative_path(root, os.path.join(root, filename))
+                if path:
+                    output.add(path)
+            elif mode != SUBMODULE_MODE:
+                output.add(filename)
+
+    except subprocess.CalledProcessError:
+        return set()
+    except FileNotFoundError:   # pragma: no cover
+        log.warning('Unable to find `git` in PATH, and therefore, unable to get tracked files.')
+
+    return output
+
+
+def iter_tracked_files(root: str, *paths: str) -> Iterator[Tuple[str, str]]:
+    """
+    Lists the tracked files (that have not been deleted from the working tree), as git lists
+    them, so that large repositories don't need to be listed in full before they're used.
+
+    :param root: the root of the git repository.
+    :param paths: if provided, only files in these paths (relative to the root) are listed.
+    :returns: the mode, and (relative) path of each file.
+    :raises: CalledProcessError
+    :raises: FileNotFoundError
+    """
+    command = [
+        'git', '--literal-pathspecs', '-C', root,
+        # NOTE: Deleted files are listed (with an R tag) right after their (H tagged) entries.
+        'ls-files', '-z', '--stage', '-t', '--cached', '--deleted',
+        '--', *paths,
+    ]
+    process = subprocess.Popen(
+        command,  # noqa: S603
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    )
+
+    try:
+        pending = None
+        for entry in _split(process.stdout, b'\0'):   # type: ignore
+            metadata, filename = entry.decode('utf-8').split('\t', 1)
+            tag, mode, _, _ = metadata.split()
+            if os.sep != '/':   # pragma: no cover
+                filename = filename.replace('/', os.sep)
+
+            if pending and pending[1] == filename:
+                # Unmerged files are listed once for each stage.
+                if tag == 'R':
+                    pending = None
+
+                continue
+
+            if pending:
+                yield pending
+
+            pending = (mode, filename)
+
+        if pending:
+            yield pending
+    except GeneratorExit:
+        process.kill()
+        raise
+    finally:
+        process.stdout.close()   # type: ignore
+        returncode = process.wait()
+
+    if returncode:
+        raise subprocess.CalledProcessError(returncode, command)
+
+
+def _split(stream: IO[bytes], separator: bytes) -> Iterator[bytes]:
+    buffer = b''
+    for chunk in iter(lambda: stream.read1(2 ** 16), b''):   # type: ignore
+        *entries, buffer = (buffer + chunk).split(separator)
+        yield from entries
+
+    if buffer:
+        yield buffer
+
+
+def get_head_commit(root: str) -> str:
+    """
+    :raises: CalledProcessError
+    """
+    return subprocess.check_output(
+        ['git', '-C', root, 'rev-parse', 'HEAD'],  # noqa: S603,S607
+        stderr=subprocess.DEVNULL,
+    ).decode('utf-8').strip()
+
+
+def get_changed_files(root: str, commit: str) -> Set[str]:
+    """
+    :returns: tracked files which are different from the given commit, in the same format as
+        `get_tracked_files`. This includes both committed and uncommitted changes, and both
+        sides of a rename.
+    :raises: CalledProcessError
+    """
+    files = subprocess.check_output(
+        ['git', '-C', root, 'diff', '--name-only', '--no-renames', '-z', commit, '--'],  # noqa: S603,S607
+        stderr=subprocess.DEVNULL,
+    )
+
+    output = set()
+    for filename in files.decode('utf-8').split('\0'):
+        if not filename:
+            continue
+
+        path = get_relative_path(root, os.path.join(root, filename))
+        if path:
+            output.add(path)
+
+    return output
+
+
+def get_tracked_file_digests(root: str) -> Dict[str, str]:
+    """
+    git already keeps track of the content hash of each tracked file (its blob object ID) in its
+    index, so we can obtain them without reading (or hashing) any files ourselves. However, they
+    are only accurate for files that have not been modified since they were staged.
+
+    NOTE: If git transforms files on checkout (e.g. through `core.autocrlf`), the blob's contents
+    will not exactly match the file's. This is fine for keying results though, since they are
+    still unique to the file's contents (for a given repository).
 
-        for filename in files.decode('utf-8').splitlines():
-            path = get_relative_path(root, os.path.join(root, filename))
-            if path:
-                output.add(path)
+    :param root: the root of the git repository.
+    :returns: mapping of absolute paths to blob IDs, for unmodified (regular) files.
+    """
+    try:
+        entries = subprocess.check_output(
+            ['git', '-C', root, 'ls-files', '--stage', '-z'],  # noqa: S603,S607
+            stderr=subprocess.DEVNULL,
+        ).decode('utf-8')
 
+        # This includes deleted files too.
+        modified_files = set(
+            subprocess.check_output(
+                ['git', '-C', root, 'ls-files', '--modified', '-z'],  # noqa: S603,S607
+                stderr=subprocess.DEVNULL,
+            ).decode('utf-8').split('\0'),
+        )
     except subprocess.CalledProcessError:
-        pass
+        return {}
     except FileNotFoundError:   # pragma: no cover
         log.warning('Unable to find `git` in PATH, and therefore, unable to get tracked files.')
+        return {}
+
+    output = {}
+    for entry in entries.split('\0'):
+        if not entry:
+            continue
+
+        metadata, filename = entry.split('\t', 1)
+        mode, digest, stage = metadata.split()
+
+        # Symbolic links and submodules don't have the same contents as their blobs, and
+        # unmerged files will have multiple entries.
+        if mode not in {'100644', '100755'} or stage != '0' or filename in modified_files:
+            continue
+
+        output[os.path.join(root, filename)] = digest
 
     return output
 
@@ -56,3 +215,64 @@ def get_changed_but_unstaged_files() -> Set[str]:
         raise ValueError
 
     return set(files)
+
+
+def get_staged_diff(*paths: str, context: int = 3) -> str:
+    """
+    :returns: the staged changes to these files (i.e. `git diff --cached`), with this many lines
+        of context around each change. Context lines are taken from the staged files (rather
+        than the working tree), and paths are relative to the current directory.
+    :raises: CalledProcessError
+    """
+    return subprocess.check_output(
+        [  # noqa: S603,S607
+            'git', '--literal-pathspecs', '-c', 'core.quotePath=false',
+            'diff', '--cached', f'-U{context}',
+            # NOTE: These make the output independent of the user's configuration. Renamed
+            # files are reported in full, since their secrets are new as far as the baseline is
+            # concerned.
+            '--no-color', '--no-ext-diff', '--no-textconv', '--no-renames', '--relative',
+            '--ignore-submodules', '--src-prefix=a/', '--dst-prefix=b/',
+            '--', *paths,
+        ],
+    ).decode('utf-8', errors='replace')
+
+
+def get_staged_files(*paths: str) -> Dict[str, bytes]:
+    """
+    All files are read through a single git process, rather than one for each file.
+
+    :returns: mapping of paths to the contents of the files, as staged. Files that are not
+        staged (e.g. untracked, or deleted) are left out.
+    :raises: CalledProcessError
+    """
+    if not paths:
+        return {}
+
+    # NOTE: Object names that start with `:./` are paths (relative to the current directory)
+    # in the index.
+    output = subprocess.run(
+        ['git', 'cat-file', '--batch'],  # noqa: S603,S607
+        input=''.join(f':./{os.path.relpath(path)}\n' for path in paths).encode('utf-8'),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        check=True,
+    ).stdout
+
+    files = {}
+    offset = 0
+    for path in paths:
+        end = output.index(b'\n', offset)
+        header = output[offset:end].split()
+        offset = end + 1
+
+        # Each object is either followed by its contents (and a newline), or reported as
+        # missing (or ambiguous).
+        if len(header) != 3:
+            continue
+
+        size = int(header[-1])
+        files[path] = output[offset:offset + size]
+        offset += size + 1
+
+    return files
@@ -0,0 +1,67 @@
+"""
+Verification requests are sent through a shared session, so that connections to each provider
+are pooled (and reused across secrets), rather than established for every secret we verify.
+"""
+import os
+from functools import lru_cache
+from typing import Any
+from typing import Mapping
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+# In seconds. This applies to each request that doesn't specify its own timeout, so that a slow
+# provider can't stall a scan indefinitely.
+DEFAULT_TIMEOUT = float(os.getenv('CHECKOV_VERIFY_TIMEOUT', '10'))
+
+# The maximum number of connections kept open to each host. This should be at least the number
+# of concurrent verifications, otherwise connections are discarded rather than reused.
+MAX_CONNECTIONS_PER_HOST = 16
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    def __init__(self, *args: Any, timeout: float = DEFAULT_TIMEOUT, **kwargs: Any) -> None:
+        self.timeout = timeout
+        super().__init__(*args, **kwargs)
+
+    def send(
+        self,
+        request: requests.PreparedRequest,
+        stream: bool = False,
+        timeout: Union[None, float, Tuple[float, float], Tuple[float, None]] = None,
+        verify: Union[bool, str] = True,
+        cert: Union[None, bytes, str, Tuple[Union[bytes, str], Union[bytes, str]]] = None,
+        proxies: Optional[Mapping[str, str]] = None,
+    ) -> requests.Response:
+        return super().send(
+            request,
+            stream=stream,
+            timeout=self.timeout if timeout is None else timeout,
+            verify=verify,
+            cert=cert,
+            proxies=proxies,
+        )
+
+
+def get_session() -> requests.Session:
+    """
+    NOTE: Sessions (and their connections) can't be shared with child processes, so each
+    process gets its own.
+    """
+    return _get_session(os.getpid())
+
+
+@lru_cache(maxsize=1)
+def _get_session(_pid: int) -> requests.Session:
+    # NOTE: The process ID is only used as the cache key (see `get_session`).
+    session = requests.Session()
+
+    adapter = TimeoutHTTPAdapter(pool_maxsize=MAX_CONNECTIONS_PER_HOST)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
+    return session
@@ -1,7 +1,9 @@
 import inspect
+from operator import itemgetter
 from typing import Any
 from typing import Callable
 from typing import cast
+from typing import List
 from typing import Tuple
 from typing import Union
 
@@ -35,6 +37,66 @@ def call_function_with_arguments(
     return function(**values)
 
 
+def get_call_adapter(func: Callable, parameters: Tuple[str, ...]) -> Callable[..., Any]:
+    """
+    `call_function_with_arguments` inspects `func` every time it is called, which adds up when
+    it's run for every line that we scan. Instead, this resolves the injection once, and
+    returns a function that takes all `parameters` positionally (in that order), and only
+    passes on the ones that `func` accepts. For example:
+
+        >>> def func(filename, secret): ...
+        >>> adapter = get_call_adapter(func, ('filename', 'line', 'secret'))
+        >>> adapter('file.py', 'password = "hunter2"', 'hunter2')   # func(filename=..., secret=...)
+    """
+    injectable_variables = get_injectable_variables(func)
+    positional_count = func.__code__.co_argcount
+    if inspect.ismethod(func):
+        # The instance is already bound to the method.
+        injectable_variables = injectable_variables[1:]
+        positional_count -= 1
+
+    # NOTE: Passing arguments positionally is cheaper than building a dictionary of keyword
+    # arguments for every call, so we do that for as many of them as the signature allows.
+    positions = []
+    for name in injectable_variables[:positional_count]:
+        if name not in parameters:
+            break
+
+        positions.append(parameters.index(name))
+
+    # Mapping of the remaining arguments that `func` accepts, to their positions in `parameters`.
+    keywords = tuple(
+        (name, parameters.index(name))
+        for name in injectable_variables[len(positions):]
+        if name in parameters
+    )
+
+    get_positional = _get_items(positions)
+    if not keywords:
+        def adapter(*args: Any) -> Any:
+            return func(*get_positional(args))
+    else:
+        def adapter(*args: Any) -> Any:
+            return func(
+                *get_positional(args),
+                **{name: args[position] for name, position in keywords},
+            )
+
+    return adapter
+
+
+def _get_items(positions: List[int]) -> Callable[[Tuple[Any, ...]], Tuple[Any, ...]]:
+    """Like `operator.itemgetter`, except that it always returns a tuple."""
+    if len(positions) > 1:
+        return itemgetter(*positions)
+
+    if positions:
+        position = positions[0]
+        return lambda args: (args[position],)
+
+    return lambda _: ()
+
+
 def make_function_self_aware(func: Callable) -> SelfAwareCallable:
     """
     A SelfAwareCallable is one that is aware of its own injectable variables, through the
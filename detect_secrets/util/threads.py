@@ -0,0 +1,62 @@
+"""
+Scans can run in threads rather than processes (see `ScanPool`), which only pays off on
+free-threaded builds of Python, where threads actually run in parallel. In that case, the
+global state that processes would each have their own copy of is shared between threads, so it
+needs to be safe to access concurrently.
+"""
+import sys
+import threading
+from functools import update_wrapper
+from typing import Callable
+from typing import Generic
+from typing import TypeVar
+
+
+T = TypeVar('T')
+
+_MISSING = object()
+
+
+def is_gil_enabled() -> bool:
+    """
+    :returns: False if threads can run Python code in parallel (i.e. on free-threaded builds,
+        unless the GIL was enabled at runtime, e.g. by an extension that doesn't support it).
+    """
+    is_enabled = getattr(sys, '_is_gil_enabled', None)
+    return bool(is_enabled()) if is_enabled else True
+
+
+def synchronized_cache(func: Callable[[], T]) -> 'SynchronizedCache[T]':
+    """
+    Like `lru_cache(maxsize=1)` for functions without arguments, except that concurrent calls
+    wait for the first of them, rather than each computing (and caching) their own result. This
+    matters for singletons (e.g. `get_settings`), which every thread needs to share.
+
+    NOTE: Once computed, the result is returned without locking.
+    """
+    return SynchronizedCache(func)
+
+
+class SynchronizedCache(Generic[T]):
+
+    def __init__(self, func: Callable[[], T]) -> None:
+        self.func = func
+        self._value: object = _MISSING
+        self._lock = threading.RLock()
+
+        update_wrapper(self, func)
+
+    def __call__(self) -> T:
+        value = self._value
+        if value is not _MISSING:
+            return value    # type: ignore
+
+        with self._lock:
+            if self._value is _MISSING:
+                self._value = self.func()
+
+            return self._value     # type: ignore
+
+    def cache_clear(self) -> None:
+        with self._lock:
+            self._value = _MISSING
@@ -0,0 +1,114 @@
+#!/usr/bin/python3
+"""
+Measures how long it takes to scan files with processes, and with threads (see
+`detect_secrets.core.pool`), e.g.
+
+    $ python3.13t scripts/benchmark_backends.py --num-files 2000 -c 4
+
+Threads only scan in parallel on free-threaded builds of Python. On other builds, both backends
+are still measured (so that the overhead of processes can be compared), but threads are limited
+to a single CPU.
+"""
+import argparse
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from detect_secrets.core.pool import BACKENDS  # noqa: E402
+from detect_secrets.core.secrets_collection import SecretsCollection  # noqa: E402
+from detect_secrets.settings import default_settings  # noqa: E402
+from detect_secrets.util.threads import is_gil_enabled  # noqa: E402
+
+
+def main():
+    args = parse_args()
+
+    if is_gil_enabled():
+        print(
+            'NOTE: The GIL is enabled, so threads will not scan in parallel. Run this with a '
+            'free-threaded build of Python (e.g. python3.13t) to compare them fairly.',
+        )
+
+    with tempfile.TemporaryDirectory() as root:
+        filenames = create_files(root, args.num_files, args.file_size)
+
+        with default_settings():
+            for backend in BACKENDS:
+                durations = []
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    secrets = SecretsCollection()
+                    secrets.scan_files(
+                        *filenames,
+                        num_processors=args.num_processors,
+                        backend=backend,
+                    )
+                    durations.append(time.perf_counter() - start)
+
+                print(
+                    f'{backend:>10}: {min(durations):>6.2f}s '
+                    f'({len(list(secrets))} secrets in {args.num_files} files)',
+                )
+
+
+def create_files(root, num_files, file_size):
+    random.seed(0)
+
+    output = []
+    for index in range(num_files):
+        # NOTE: Most lines in a repository don't contain secrets.
+        password = ''.join(random.choices(string.ascii_letters + string.digits, k=32))
+        lines = [f'password = "{password}"\n']
+        size = len(lines[0])
+        while size < file_size:
+            line = f'value_{len(lines)} = compute({len(lines)}, scale=2)\n'
+            lines.append(line)
+            size += len(line)
+
+        filename = os.path.join(root, f'file_{index}.py')
+        with open(filename, 'w') as f:
+            f.writelines(lines)
+
+        output.append(filename)
+
+    return output
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        '--num-files',
+        default=2000,
+        type=int,
+        help='Number of files to scan.',
+    )
+    parser.add_argument(
+        '--file-size',
+        default=4096,
+        type=int,
+        help='Size of each file, in bytes.',
+    )
+    parser.add_argument(
+        '-c',
+        '--num-processors',
+        type=int,
+        help='Number of workers to scan with (defaults to the number of CPUs).',
+    )
+    parser.add_argument(
+        '--repeat',
+        default=3,
+        type=int,
+        help='Number of times to scan (the fastest time is reported).',
+    )
+
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    main()
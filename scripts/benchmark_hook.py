@@ -0,0 +1,119 @@
+#!/usr/bin/python3
+"""
+Measures how long the pre-commit hook takes to scan commits of 1, 10, 100 and 1000 files, when
+it scans them serially, in parallel, and when it picks between the two by the size of the commit
+(see `detect_secrets.pre_commit_hook.scan_files`), e.g.
+
+    $ python scripts/benchmark_hook.py -c 4
+
+Each run starts a new interpreter, like pre-commit does, so this includes the time it takes to
+start up.
+"""
+import argparse
+import os
+import random
+import string
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+MODES = {
+    'serial': {'CHECKOV_HOOK_MIN_PARALLEL_FILES': str(sys.maxsize)},
+    'parallel': {'CHECKOV_HOOK_MIN_PARALLEL_FILES': '0', 'CHECKOV_HOOK_MIN_PARALLEL_BYTES': '0'},
+    'adaptive': {},
+}
+
+
+def main():
+    args = parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        filenames = create_files(root, max(args.num_files), args.file_size)
+
+        for num_files in args.num_files:
+            for mode, env in MODES.items():
+                durations = []
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    returncode = run_hook(filenames[:num_files], env, args.num_processors)
+                    durations.append(time.perf_counter() - start)
+
+                print(
+                    f'{num_files:>5} files, {mode:>8}: {min(durations):>6.2f}s '
+                    f'(exit code {returncode})',
+                )
+
+
+def run_hook(filenames, env, num_processors):
+    command = [sys.executable, '-m', 'detect_secrets.pre_commit_hook']
+    if num_processors:
+        command.extend(['--cores', str(num_processors)])
+
+    return subprocess.run(
+        [*command, *filenames],
+        cwd=ROOT,
+        env={**os.environ, **env},
+        stdout=subprocess.DEVNULL,
+    ).returncode
+
+
+def create_files(root, num_files, file_size):
+    random.seed(0)
+
+    output = []
+    for index in range(num_files):
+        # NOTE: Most lines in a commit don't contain secrets.
+        password = ''.join(random.choices(string.ascii_letters + string.digits, k=32))
+        lines = [f'password = "{password}"\n']
+        size = len(lines[0])
+        while size < file_size:
+            line = f'value_{len(lines)} = compute({len(lines)}, scale=2)\n'
+            lines.append(line)
+            size += len(line)
+
+        filename = os.path.join(root, f'file_{index}.py')
+        with open(filename, 'w') as f:
+            f.writelines(lines)
+
+        output.append(filename)
+
+    return output
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        '--num-files',
+        default=[1, 10, 100, 1000],
+        nargs='+',
+        type=int,
+        help='Number of files in each commit.',
+    )
+    parser.add_argument(
+        '--file-size',
+        default=4096,
+        type=int,
+        help='Size of each file, in bytes.',
+    )
+    parser.add_argument(
+        '-c',
+        '--num-processors',
+        type=int,
+        help='Number of workers to scan with (defaults to the number of CPUs).',
+    )
+    parser.add_argument(
+        '--repeat',
+        default=3,
+        type=int,
+        help='Number of times to run the hook (the fastest time is reported).',
+    )
+
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    main()
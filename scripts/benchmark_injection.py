@@ -0,0 +1,119 @@
+#!/usr/bin/python3
+"""
+Measures the overhead of dispatching to plugins and filters, with reflective dependency
+injection (`call_function_with_arguments`) and with precompiled call adapters
+(`get_call_adapter`).
+
+The plugins and filters are replaced with no-ops (with the same signatures), so that only the
+dispatch itself is timed, e.g.
+
+    $ python scripts/benchmark_injection.py -n 100000
+"""
+import argparse
+import os
+import sys
+import timeit
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from detect_secrets.settings import default_settings  # noqa: E402
+from detect_secrets.settings import get_filters  # noqa: E402
+from detect_secrets.settings import get_plugins  # noqa: E402
+from detect_secrets.util.inject import call_function_with_arguments  # noqa: E402
+from detect_secrets.util.inject import get_call_adapter  # noqa: E402
+from detect_secrets.util.inject import get_injectable_variables  # noqa: E402
+
+
+# These mirror the call sites in `detect_secrets.core.scan`.
+PLUGIN_ARGUMENTS = {
+    'filename': 'file.py',
+    'line': 'foo = "bar"',
+    'line_number': 1,
+    'context': None,
+    'raw_context': None,
+    'commit_hash': '',
+    'file_type': None,
+}
+FILTER_ARGUMENTS = {
+    'filename': 'file.py',
+    'secret': 'bar',
+    'plugin': None,
+    'line': 'foo = "bar"',
+    'context': None,
+}
+
+
+def main():
+    args = parse_args()
+
+    with default_settings():
+        plugins = [make_noop(plugin.analyze_line, is_method=True) for plugin in get_plugins()]
+        filters = [make_noop(filter_fn) for filter_fn in get_filters()]
+
+    print(f'{len(plugins)} plugins, {len(filters)} filters, {args.num_calls:,} calls each')
+    for name, functions, kwargs in (
+        ('plugins', plugins, PLUGIN_ARGUMENTS),
+        ('filters', filters, FILTER_ARGUMENTS),
+    ):
+        timings = {
+            'reflective': time_reflective(functions, kwargs, args.num_calls),
+            'adapter': time_adapters(functions, kwargs, args.num_calls),
+        }
+        for key, value in timings.items():
+            print(f'{name:>8} {key:>10}: {value * 1e9 / args.num_calls:>8.0f} ns/call')
+
+        print(f'{name:>8} {"speedup":>10}: {timings["reflective"] / timings["adapter"]:.2f}x')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        '-n',
+        '--num-calls',
+        default=20000,
+        type=int,
+        help='Number of calls per plugin / filter.',
+    )
+
+    return parser.parse_args()
+
+
+def make_noop(function, is_method=False):
+    """Creates a function with the same injectable variables, that does nothing."""
+    variables = get_injectable_variables(function)
+    namespace = {}
+    parameters = ', '.join(f'{variable}=None' for variable in variables)
+    exec(f'def {function.__name__}({parameters}):\n    pass\n', namespace)
+
+    noop = namespace[function.__name__]
+    if not is_method:
+        noop.injectable_variables = set(variables)
+        return noop
+
+    # Bind it, so that it's dispatched to like a plugin method.
+    klass = type('Noop', (), {function.__name__: noop})
+    return getattr(klass(), function.__name__)
+
+
+def time_reflective(functions, kwargs, num_calls):
+    def run():
+        for function in functions:
+            call_function_with_arguments(function, **kwargs)
+
+    return timeit.timeit(run, number=num_calls) / len(functions)
+
+
+def time_adapters(functions, kwargs, num_calls):
+    adapters = [get_call_adapter(function, tuple(kwargs)) for function in functions]
+    values = tuple(kwargs.values())
+
+    def run():
+        for adapter in adapters:
+            adapter(*values)
+
+    return timeit.timeit(run, number=num_calls) / len(adapters)
+
+
+if __name__ == '__main__':
+    main()
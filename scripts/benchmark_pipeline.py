@@ -0,0 +1,150 @@
+#!/usr/bin/python3
+"""
+Measures how long it takes to create a baseline when reads are slow, with and without
+`--prefetch` (see `detect_secrets.core.pipeline`). Slow reads are either simulated (by adding
+latency to opening each file, like a network filesystem would), or real (by dropping the page
+cache before each scan, which requires root), e.g.
+
+    $ python scripts/benchmark_pipeline.py --num-files 2000 --read-latency 0.005
+    $ sudo python scripts/benchmark_pipeline.py --num-files 2000 --drop-caches
+"""
+import argparse
+import builtins
+import os
+import random
+import string
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from detect_secrets.core import baseline  # noqa: E402
+from detect_secrets.settings import default_settings  # noqa: E402
+
+
+def main():
+    args = parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        create_files(root, args.num_files, args.file_size)
+        if args.read_latency:
+            add_read_latency(root, args.read_latency)
+
+        # NOTE: Files are only scanned if they're in the current directory.
+        cwd = os.getcwd()
+        os.chdir(root)
+        try:
+            run(args)
+        finally:
+            os.chdir(cwd)
+
+
+def run(args):
+    with default_settings():
+        for name, prefetch in (('scan_files', False), ('scan_files_pipelined', True)):
+            durations = []
+            for _ in range(args.repeat):
+                if args.drop_caches:
+                    drop_caches()
+
+                start = time.perf_counter()
+                secrets = baseline.create(
+                    '.',
+                    should_scan_all_files=True,
+                    num_processors=args.num_processors,
+                    prefetch=prefetch,
+                )
+                durations.append(time.perf_counter() - start)
+
+            print(
+                f'{name:>22}: {min(durations):>6.2f}s '
+                f'({len(list(secrets))} secrets in {args.num_files} files)',
+            )
+
+
+def create_files(root, num_files, file_size):
+    random.seed(0)
+    for index in range(num_files):
+        directory = os.path.join(root, f'directory_{index % 100}')
+        os.makedirs(directory, exist_ok=True)
+
+        # NOTE: Most lines in a repository don't contain secrets.
+        password = ''.join(random.choices(string.ascii_letters + string.digits, k=32))
+        lines = [f'password = "{password}"\n']
+        size = len(lines[0])
+        while size < file_size:
+            line = f'value_{len(lines)} = compute({len(lines)}, scale=2)\n'
+            lines.append(line)
+            size += len(line)
+
+        with open(os.path.join(directory, f'file_{index}.py'), 'w') as f:
+            f.writelines(lines)
+
+
+def add_read_latency(root, latency):
+    """
+    NOTE: Workers are forked, so they inherit this too.
+    """
+    original_open = builtins.open
+
+    def open(file, *args, **kwargs):
+        if isinstance(file, str) and os.path.abspath(file).startswith(root):
+            time.sleep(latency)
+
+        return original_open(file, *args, **kwargs)
+
+    builtins.open = open
+
+
+def drop_caches():
+    subprocess.check_call(['sync'])
+    with open('/proc/sys/vm/drop_caches', 'w') as f:
+        f.write('3\n')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        '--num-files',
+        default=2000,
+        type=int,
+        help='Number of files to scan.',
+    )
+    parser.add_argument(
+        '--file-size',
+        default=4096,
+        type=int,
+        help='Size of each file, in bytes.',
+    )
+    parser.add_argument(
+        '--read-latency',
+        default=0.0,
+        type=float,
+        help='Simulated latency of opening each file, in seconds.',
+    )
+    parser.add_argument(
+        '--drop-caches',
+        action='store_true',
+        help='Drop the page cache before each scan (requires root).',
+    )
+    parser.add_argument(
+        '-c',
+        '--num-processors',
+        type=int,
+        help='Number of workers to scan with (defaults to the number of CPUs).',
+    )
+    parser.add_argument(
+        '--repeat',
+        default=3,
+        type=int,
+        help='Number of times to scan (the fastest time is reported).',
+    )
+
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/python3
+"""
+Measures the wall-clock time to scan a synthetic, skewed corpus (many small files, and a few
+large ones, which are found last) with `SecretsCollection.scan_files`, when files are handed out
+to workers one at a time in the order they were found, and when they are scheduled by size (see
+`detect_secrets.core.schedule`), e.g.
+
+    $ python scripts/benchmark_scheduling.py --num-small-files 5000 --large-file-size 10000000
+
+The "tail" is the time between 95% of the files having been scanned, and the end of the scan.
+"""
+import argparse
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+from unittest import mock
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from detect_secrets.core import secrets_collection  # noqa: E402
+from detect_secrets.core.secrets_collection import SecretsCollection  # noqa: E402
+from detect_secrets.settings import default_settings  # noqa: E402
+
+
+def main():
+    args = parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        filenames = make_corpus(root, args)
+        total_size = sum(os.path.getsize(filename) for filename in filenames)
+        print(
+            f'{len(filenames)} files ({total_size / 1024 / 1024:.1f} MB), '
+            f'{args.num_processors} processes',
+        )
+
+        with default_settings():
+            for name, scheduler in (
+                ('walk order', schedule_in_walk_order),
+                ('by size', secrets_collection.schedule),
+            ):
+                with mock.patch.object(secrets_collection, 'schedule', scheduler):
+                    duration, tail = scan(filenames, args.num_processors)
+
+                print(f'{name:>12}: {duration:.2f}s (tail: {tail:.2f}s)')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        '--num-small-files',
+        default=2000,
+        type=int,
+        help='Number of small (2 KB) files.',
+    )
+    parser.add_argument(
+        '--num-large-files',
+        default=2,
+        type=int,
+        help='Number of large files.',
+    )
+    parser.add_argument(
+        '--large-file-size',
+        default=2 * 1024 * 1024,
+        type=int,
+        help='Size of each large file, in bytes.',
+    )
+    parser.add_argument(
+        '-c',
+        '--num-processors',
+        default=os.cpu_count(),
+        type=int,
+        help='Number of processes to scan with.',
+    )
+
+    return parser.parse_args()
+
+
+def make_corpus(root, args):
+    """:returns: filenames, in the order that they would be found."""
+    random.seed(0)
+
+    filenames = []
+    for index in range(args.num_small_files):
+        filenames.append(write_file(os.path.join(root, f'small_{index}.py'), 2 * 1024))
+
+    # Large files are found last, which is the worst case for handing out files in order.
+    for index in range(args.num_large_files):
+        filenames.append(write_file(os.path.join(root, f'large_{index}.js'), args.large_file_size))
+
+    return filenames
+
+
+def write_file(filename, size):
+    lines = []
+    while size > 0:
+        line = 'value_{} = "{}"'.format(
+            random.randint(0, 1000),
+            ''.join(random.choices(string.ascii_letters, k=random.randint(10, 60))),
+        )
+        lines.append(line)
+        size -= len(line) + 1
+
+    with open(filename, 'w') as f:
+        f.write('\n'.join(lines) + '\n')
+
+    return filename
+
+
+def schedule_in_walk_order(groups, num_workers):
+    """This is how files used to be handed out to workers."""
+    return [[group.filenames[0]] for group in groups]
+
+
+def scan(filenames, num_processors):
+    """:returns: the duration of the scan, and of its tail."""
+    timestamps = []
+    add_result = SecretsCollection._add_result
+
+    def record(self, group, *args, **kwargs):
+        timestamps.extend(time.perf_counter() for _ in group.filenames)
+        return add_result(self, group, *args, **kwargs)
+
+    with mock.patch.object(SecretsCollection, '_add_result', record):
+        start = time.perf_counter()
+        SecretsCollection().scan_files(*filenames, num_processors=num_processors)
+        end = time.perf_counter()
+
+    timestamps.sort()
+    return end - start, end - timestamps[int(len(timestamps) * 0.95)]
+
+
+if __name__ == '__main__':
+    main()
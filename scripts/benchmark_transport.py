@@ -0,0 +1,99 @@
+#!/usr/bin/python3
+"""
+Measures how many bytes it takes to send the secrets found in a (secret-dense) batch of files
+from a worker to the parent process, and how long the parent takes to unpickle them, when
+secrets are pickled as-is, and when they are packed (see `PotentialSecret.pack`), e.g.
+
+    $ python scripts/benchmark_transport.py --num-files 100 --secrets-per-file 100
+"""
+import argparse
+import os
+import pickle
+import sys
+import time
+import uuid
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from detect_secrets.core.potential_secret import PotentialSecret  # noqa: E402
+from detect_secrets.core.secrets_collection import _ScanResult  # noqa: E402
+
+
+SECRET_TYPES = ('AWS Access Key', 'Secret Keyword', 'Base64 High Entropy String')
+
+
+def main():
+    args = parse_args()
+
+    results = [
+        _ScanResult(
+            filename=f'path/to/file_{index}.py',
+            digest=None,
+            secrets=[
+                PotentialSecret(
+                    type=SECRET_TYPES[line_number % len(SECRET_TYPES)],
+                    filename=f'path/to/file_{index}.py',
+                    secret=uuid.uuid4().hex,
+                    line_number=line_number,
+                )
+                for line_number in range(1, args.secrets_per_file + 1)
+            ],
+        )
+        for index in range(args.num_files)
+    ]
+    num_secrets = args.num_files * args.secrets_per_file
+    print(f'{num_secrets} secrets, in {args.num_files} files')
+
+    for name, pack, unpack in (
+        ('as-is', lambda results: results, lambda results: results),
+        (
+            'packed',
+            lambda results: [result.pack() for result in results],
+            lambda results: [result.unpack() for result in results],
+        ),
+        (
+            'packed (no plaintext)',
+            lambda results: [result.pack(include_secret_values=False) for result in results],
+            lambda results: [result.unpack() for result in results],
+        ),
+    ):
+        data = pickle.dumps(pack(results))
+
+        start = time.process_time()
+        for _ in range(args.repeat):
+            unpack(pickle.loads(data))
+
+        duration = (time.process_time() - start) / args.repeat
+        print(
+            f'{name:>22}: {len(data) / num_secrets:>6.1f} bytes/secret, '
+            f'{duration / num_secrets * 1e6:>5.2f}us/secret to unpickle',
+        )
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        '--num-files',
+        default=100,
+        type=int,
+        help='Number of files in the batch.',
+    )
+    parser.add_argument(
+        '--secrets-per-file',
+        default=100,
+        type=int,
+        help='Number of secrets found in each file.',
+    )
+    parser.add_argument(
+        '--repeat',
+        default=10,
+        type=int,
+        help='Number of times to unpickle the batch.',
+    )
+
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+#!/usr/bin/python3
+"""
+Measures the wall-clock time to verify secrets one at a time (as plugins used to, while
+scanning), and through the concurrent `VerificationEngine` in `detect_secrets.core.verification`.
+
+Secrets are verified against a local stub server, which responds after a fixed delay, e.g.
+
+    $ python scripts/benchmark_verification.py -n 1000 --delay 0.02
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from detect_secrets.constants import VerifiedResult  # noqa: E402
+from detect_secrets.core.potential_secret import PotentialSecret  # noqa: E402
+from detect_secrets.core.verification import Candidate  # noqa: E402
+from detect_secrets.core.verification import verify_candidate  # noqa: E402
+from detect_secrets.core.verification import VerificationEngine  # noqa: E402
+from detect_secrets.plugins.base import BasePlugin  # noqa: E402
+from detect_secrets.util.code_snippet import get_code_snippet  # noqa: E402
+from detect_secrets.util.http import get_session  # noqa: E402
+
+
+NUM_PROVIDERS = 4
+
+
+def main():
+    args = parse_args()
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(args.delay))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    # Each plugin class is a different provider, as far as the engine is concerned.
+    url = f'http://127.0.0.1:{server.server_address[1]}'
+    plugins = [
+        type(f'StubPlugin{index}', (StubPlugin,), {})(url)
+        for index in range(NUM_PROVIDERS)
+    ]
+    candidates = [
+        make_candidate(plugins[index % NUM_PROVIDERS], f'secret_{index}')
+        for index in range(args.num_candidates)
+    ]
+
+    timings = {}
+
+    start = time.perf_counter()
+    serial_results = [verify_candidate(candidate) for candidate in candidates]
+    timings['serial'] = time.perf_counter() - start
+
+    engine = VerificationEngine(
+        max_workers=args.max_workers,
+        max_concurrency_per_provider=args.max_concurrency_per_provider,
+    )
+    start = time.perf_counter()
+    concurrent_results = engine.verify(candidates)
+    timings['concurrent'] = time.perf_counter() - start
+    engine.shutdown()
+
+    server.shutdown()
+    assert serial_results == concurrent_results
+
+    print(f'{args.num_candidates} candidates, {args.delay * 1000:.0f}ms per request')
+    for key, value in timings.items():
+        print(f'{key:>10}: {args.num_candidates / value:>8,.0f} candidates/sec ({value:.3f}s)')
+
+    print(f'speedup: {timings["serial"] / timings["concurrent"]:.2f}x')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        '-n',
+        '--num-candidates',
+        default=1000,
+        type=int,
+        help='Number of secrets to verify.',
+    )
+    parser.add_argument(
+        '--delay',
+        default=0.02,
+        type=float,
+        help='Seconds that the stub server takes to respond to each request.',
+    )
+    parser.add_argument(
+        '--max-workers',
+        default=16,
+        type=int,
+        help='Number of secrets verified at once.',
+    )
+    parser.add_argument(
+        '--max-concurrency-per-provider',
+        default=4,
+        type=int,
+        help=(
+            'Number of secrets verified at once, with the same provider. '
+            f'Secrets are spread across {NUM_PROVIDERS} providers.'
+        ),
+    )
+
+    return parser.parse_args()
+
+
+def make_handler(delay):
+    class StubHandler(BaseHTTPRequestHandler):
+        # Otherwise, connections can't be reused.
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            time.sleep(delay)
+
+            self.send_response(200)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    return StubHandler
+
+
+def make_candidate(plugin, secret):
+    return Candidate(
+        secret=PotentialSecret(type=plugin.secret_type, filename='file.py', secret=secret),
+        plugin=plugin,
+        context=get_code_snippet(lines=[f'secret = "{secret}"'], line_number=1),
+    )
+
+
+class StubPlugin(BasePlugin):
+    secret_type = 'Stub'
+
+    def __init__(self, url):
+        self.url = url
+
+    def analyze_string(self, string):   # pragma: no cover
+        yield from ()
+
+    def verify(self, secret):
+        response = get_session().get(f'{self.url}/{secret}')
+        return (
+            VerifiedResult.VERIFIED_TRUE
+            if response.status_code == 200
+            else VerifiedResult.VERIFIED_FALSE
+        )
+
+
+if __name__ == '__main__':
+    main()
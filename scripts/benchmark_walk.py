@@ -0,0 +1,181 @@
+#!/usr/bin/python3
+"""
+Measures how long it takes to list the files to scan in a large repository, most of which is
+not tracked by git (like a `node_modules` directory), with `os.walk` (as `get_files_to_scan` used
+to), with the pruning walker, and by streaming the tracked files from git (see
+`detect_secrets.core.walk`), e.g.
+
+    $ python scripts/benchmark_walk.py --num-entries 1000000
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from detect_secrets.core.walk import walk  # noqa: E402
+from detect_secrets.core.walk import walk_tracked_files  # noqa: E402
+from detect_secrets.settings import transient_settings  # noqa: E402
+from detect_secrets.util import git  # noqa: E402
+from detect_secrets.util.path import get_relative_path  # noqa: E402
+
+
+FILES_PER_DIRECTORY = 100
+DIRECTORIES_PER_DIRECTORY = 10
+
+
+def main():
+    args = parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        root = os.path.realpath(root)
+        start = time.perf_counter()
+        create_repository(root, args.num_entries, args.tracked_ratio)
+        print(f'Created {args.num_entries} entries in {time.perf_counter() - start:.1f}s')
+
+        print(f'{len(git.get_tracked_files(root))} tracked files')
+
+        with chdir(root):
+            for name, run in (
+                (
+                    'os.walk',
+                    lambda: walk_with_os_walk(root, git.get_tracked_files(root)),
+                ),
+                (
+                    'walk',
+                    lambda: walk(root, root=root, tracked_files=git.get_tracked_files(root)),
+                ),
+                (
+                    f'walk ({args.num_threads} threads)',
+                    lambda: walk(
+                        root,
+                        root=root,
+                        tracked_files=git.get_tracked_files(root),
+                        num_threads=args.num_threads,
+                    ),
+                ),
+                ('walk_tracked_files', lambda: walk_tracked_files('.', root=root)),
+                ('os.walk (all files)', lambda: walk_with_os_walk(root, None)),
+                ('walk (all files)', lambda: walk(root, root=root)),
+                (
+                    'walk (all files, excluded)',
+                    lambda: walk_with_exclusion(root, args.exclude_files),
+                ),
+            ):
+                first_durations = []
+                durations = []
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    iterator = iter(run())
+                    next(iterator, None)
+                    first_durations.append(time.perf_counter() - start)
+
+                    num_files = 1 + sum(1 for _ in iterator)
+                    durations.append(time.perf_counter() - start)
+
+                print(
+                    f'{name:>28}: {min(first_durations):>6.2f}s to the first file, '
+                    f'{min(durations):>6.2f}s to all {num_files} files',
+                )
+
+
+def create_repository(root, num_entries, tracked_ratio):
+    subprocess.check_output(['git', 'init', '--quiet', root])
+
+    num_tracked = int(num_entries * tracked_ratio)
+    for directory, count in (('src', num_tracked), ('node_modules', num_entries - num_tracked)):
+        create_tree(os.path.join(root, directory), count)
+
+    subprocess.check_output(['git', '-C', root, 'add', 'src'])
+
+
+def create_tree(path, num_entries):
+    """Creates a tree with this many (nested) files and directories."""
+    directories = [path]
+    while directories and num_entries > 0:
+        directory = directories.pop(0)
+        os.makedirs(directory, exist_ok=True)
+
+        for index in range(min(FILES_PER_DIRECTORY, num_entries)):
+            with open(os.path.join(directory, f'file_{index}.js'), 'w') as f:
+                f.write('module.exports = {};\n')
+
+        num_entries -= FILES_PER_DIRECTORY
+        for index in range(DIRECTORIES_PER_DIRECTORY):
+            directories.append(os.path.join(directory, f'directory_{index}'))
+            num_entries -= 1
+
+
+def walk_with_os_walk(root, tracked_files):
+    """This is how `get_files_to_scan` used to list files."""
+    for path_root, _, filenames in os.walk(root):
+        for filename in filenames:
+            relative_path = get_relative_path(root=root, path=os.path.join(path_root, filename))
+            if relative_path and (tracked_files is None or relative_path in tracked_files):
+                yield relative_path
+
+
+def walk_with_exclusion(root, pattern):
+    with transient_settings({
+        'filters_used': [
+            {
+                'path': 'detect_secrets.filters.regex.should_exclude_file',
+                'pattern': [pattern],
+            },
+        ],
+    }):
+        yield from walk(root, root=root)
+
+
+@contextmanager
+def chdir(path):
+    cwd = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(cwd)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        '--num-entries',
+        default=1000000,
+        type=int,
+        help='Number of files and directories in the repository.',
+    )
+    parser.add_argument(
+        '--tracked-ratio',
+        default=0.01,
+        type=float,
+        help='Ratio of entries that are tracked by git.',
+    )
+    parser.add_argument(
+        '--exclude-files',
+        default='^node_modules/',
+        help='Pattern to exclude files with, when scanning all files.',
+    )
+    parser.add_argument(
+        '--num-threads',
+        default=8,
+        type=int,
+        help='Number of threads to list directories with.',
+    )
+    parser.add_argument(
+        '--repeat',
+        default=3,
+        type=int,
+        help='Number of times to list the files (the fastest time is reported).',
+    )
+
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1 @@
+"2b00042f7481c7b056c4b410d28f33cf"
\ No newline at end of file
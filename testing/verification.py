@@ -0,0 +1,115 @@
+"""Utilities for testing secret verification, without sending requests to real providers."""
+from __future__ import annotations
+
+import re
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from typing import Any
+from typing import Generator
+from typing import List
+
+from detect_secrets.constants import VerifiedResult
+from detect_secrets.core.verification import VERIFICATION_FILTER
+from detect_secrets.plugins.base import RegexBasedDetector
+from detect_secrets.settings import get_plugins
+from detect_secrets.settings import get_settings
+from detect_secrets.util.http import get_session
+from testing.plugins import register_plugin
+
+
+class StubServer(ThreadingHTTPServer):
+    """Accepts secrets that end with an even number, after `delay` seconds."""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.requests: List[str] = []
+        self.num_active_requests = 0
+        self.max_active_requests = 0
+        self.lock = threading.Lock()
+
+        super().__init__(('127.0.0.1', 0), StubHandler)
+
+    @property
+    def url(self) -> str:
+        return f'http://127.0.0.1:{self.server_address[1]}'
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    server: StubServer
+
+    def do_GET(self) -> None:
+        server = self.server
+        with server.lock:
+            server.requests.append(self.path)
+            server.num_active_requests += 1
+            server.max_active_requests = max(
+                server.max_active_requests,
+                server.num_active_requests,
+            )
+
+        time.sleep(server.delay)
+        with server.lock:
+            server.num_active_requests -= 1
+
+        self.send_response(200 if int(self.path[-1]) % 2 == 0 else 401)
+        self.end_headers()
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+
+class StubPlugin(RegexBasedDetector):
+    secret_type = 'Stub'
+    denylist = (re.compile(r'stub_[0-9]+'),)
+
+    def __init__(self, url: str = '') -> None:
+        self.url = url
+
+    def verify(self, secret: str) -> VerifiedResult:
+        response = get_session().get(f'{self.url}/{secret}')
+        return (
+            VerifiedResult.VERIFIED_TRUE
+            if response.status_code == 200
+            else VerifiedResult.VERIFIED_FALSE
+        )
+
+
+@contextmanager
+def run_stub_server(delay: float = 0.0) -> Generator[StubServer, None, None]:
+    server = StubServer(delay=delay)
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def configure(server: StubServer, min_level: VerifiedResult) -> None:
+    with configured(server, min_level):
+        pass
+
+
+@contextmanager
+def configured(server: StubServer, min_level: VerifiedResult) -> Generator[None, None, None]:
+    """
+    Verifies secrets found by the `StubPlugin` against `server`. The plugin is only registered
+    within this scope, but remains configured afterwards.
+    """
+    get_settings().configure_filters([
+        {
+            'path': VERIFICATION_FILTER,
+            'min_level': min_level.value,
+        },
+    ])
+    with register_plugin(StubPlugin(server.url)):
+        get_settings().configure_plugins([{'name': 'StubPlugin'}])
+
+        # NOTE: Plugins are initialized lazily, so we need to do so while it's registered.
+        get_plugins()
+        yield
@@ -1,3 +1,4 @@
+import os
 import subprocess
 import tempfile
 from pathlib import Path
@@ -6,7 +7,11 @@ from unittest import mock
 import pytest
 
 from detect_secrets.core import baseline
+from detect_secrets.core.secrets_collection import SecretsCollection
+from detect_secrets.core.shard import Shard
+from detect_secrets.exceptions import InvalidBaselineError
 from detect_secrets.settings import get_settings
+from detect_secrets.util import git
 from detect_secrets.util.path import get_relative_path_if_in_cwd
 from testing.mocks import mock_named_temporary_file
 
@@ -81,6 +86,165 @@ class TestCreate:
             assert get_relative_path_if_in_cwd(f.name) in secrets.data
 
 
+class TestRefresh:
+    @staticmethod
+    def test_only_scans_changed_files(repo):
+        commit = git.get_head_commit(str(repo))
+        old_secrets = baseline.create(str(repo), root=str(repo))
+
+        (repo / 'added.py').write_text('secret = "2b00042f7481c7b056c4b410d28f33cf"\n')
+        (repo / 'modified.py').write_text('nothing to see here\n')
+        os.remove(repo / 'deleted.py')
+        commit_all(repo)
+
+        with mock.patch.object(
+            SecretsCollection,
+            'scan_files',
+            autospec=True,
+            side_effect=SecretsCollection.scan_files,
+        ) as m:
+            secrets = baseline.refresh(old_secrets, commit, str(repo), root=str(repo))
+
+        assert sorted(m.call_args[0][1:]) == ['added.py', 'modified.py']
+        assert secrets.json() == baseline.create(str(repo), root=str(repo)).json()
+        assert secrets.files == {'added.py', 'unchanged.py'}
+
+    @staticmethod
+    def test_unknown_commit(repo):
+        with pytest.raises(subprocess.CalledProcessError):
+            baseline.refresh(baseline.create(str(repo), root=str(repo)), '0' * 40, root=str(repo))
+
+
+class TestMerge:
+    @staticmethod
+    def test_same_as_full_scan():
+        expected = baseline.format_for_output(
+            baseline.create('test_data', should_scan_all_files=True),
+        )
+
+        shards = [
+            baseline.format_for_output(
+                baseline.create('test_data', should_scan_all_files=True, shard=shard),
+                shard=shard,
+            )
+            for shard in (Shard(index, 3) for index in range(1, 4))
+        ]
+        assert all(len(shard['results']) < len(expected['results']) for shard in shards)
+
+        output = baseline.merge(*reversed(shards))
+        assert list(output) == list(expected)
+        assert output.pop('generated_at') == max(shard['generated_at'] for shard in shards)
+
+        expected.pop('generated_at')
+        assert output == expected
+
+    @staticmethod
+    def test_different_settings():
+        first = baseline.format_for_output(SecretsCollection(), shard=Shard(1, 2))
+        second = baseline.format_for_output(SecretsCollection(), shard=Shard(2, 2))
+        second['plugins_used'] = []
+
+        with pytest.raises(InvalidBaselineError, match='plugins_used'):
+            baseline.merge(first, second)
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        'shards',
+        (
+            # Missing shard
+            ('1/3', '3/3'),
+
+            # Duplicate shard
+            ('1/2', '1/2', '2/2'),
+
+            # Different number of shards
+            ('1/2', '2/3'),
+
+            # Not sharded
+            ('1/2', None),
+            (None, '2/2'),
+        ),
+    )
+    def test_invalid_shards(shards):
+        baselines = [
+            baseline.format_for_output(
+                SecretsCollection(),
+                shard=Shard.parse(shard) if shard else None,
+            )
+            for shard in shards
+        ]
+
+        with pytest.raises(InvalidBaselineError, match='one baseline for each shard'):
+            baseline.merge(*baselines)
+
+    @staticmethod
+    def test_overlapping_files():
+        secrets = baseline.create('test_data/files')
+        baselines = [
+            baseline.format_for_output(secrets, shard=Shard(index, 2))
+            for index in range(1, 3)
+        ]
+
+        with pytest.raises(InvalidBaselineError, match='more than one baseline'):
+            baseline.merge(*baselines)
+
+    @staticmethod
+    def test_no_baselines():
+        with pytest.raises(InvalidBaselineError):
+            baseline.merge()
+
+
+class TestGetCommitToRecord:
+    @staticmethod
+    def test_basic(repo):
+        assert baseline.get_commit_to_record(root=str(repo)) == git.get_head_commit(str(repo))
+
+    @staticmethod
+    def test_uncommitted_changes(repo):
+        (repo / 'modified.py').write_text('nothing to see here\n')
+
+        assert not baseline.get_commit_to_record(root=str(repo))
+
+    @staticmethod
+    def test_ignores_baseline_file(repo):
+        baseline_file = repo / '.secrets.baseline'
+        baseline_file.write_text('{}')
+        commit_all(repo)
+        baseline_file.write_text('{"results": {}}')
+
+        assert baseline.get_commit_to_record(
+            root=str(repo),
+            baseline_filename=str(baseline_file),
+        ) == git.get_head_commit(str(repo))
+
+    @staticmethod
+    def test_not_a_repository(tmp_path):
+        assert not baseline.get_commit_to_record(root=str(tmp_path))
+
+
+@pytest.fixture
+def repo(tmp_path):
+    subprocess.check_output(['git', 'init', str(tmp_path)])
+    for name, secret in (
+        ('unchanged.py', '2b00042f7481c7b056c4b410d28f33cf'),
+        ('modified.py', '3b00042f7481c7b056c4b410d28f33cf'),
+        ('deleted.py', '4b00042f7481c7b056c4b410d28f33cf'),
+    ):
+        (tmp_path / name).write_text(f'secret = "{secret}"\n')
+
+    commit_all(tmp_path)
+    return tmp_path
+
+
+def commit_all(repo):
+    subprocess.check_output(['git', '-C', str(repo), 'add', '--all'])
+    subprocess.check_output([
+        'git', '-C', str(repo),
+        '-c', 'user.name=test', '-c', 'user.email=test@example.com',
+        'commit', '--quiet', '--message', 'commit',
+    ])
+
+
 def test_upgrade_does_nothing_if_newer_version():
     current_baseline = {'version': '3.0.0'}
     assert baseline.upgrade(current_baseline) == current_baseline
@@ -0,0 +1,96 @@
+from unittest import mock
+
+import pytest
+
+from detect_secrets.core.duplicates import group_duplicate_files
+from detect_secrets.core.duplicates import is_deduplication_supported
+from detect_secrets.core.file_context import FileContext
+from detect_secrets.settings import get_settings
+
+
+@pytest.fixture
+def files(tmp_path):
+    output = {}
+    for path, content in (
+        ('a/config.py', 'secret = "foo"\n'),
+        ('b/config.py', 'secret = "foo"\n'),
+        ('c/config.py', 'secret = "bar"\n'),
+        ('a/config.yaml', 'secret = "foo"\n'),
+        ('a/other.py', 'other'),
+    ):
+        filename = tmp_path / path
+        filename.parent.mkdir(exist_ok=True)
+        filename.write_text(content)
+
+        output[path] = str(filename)
+
+    return output
+
+
+class TestGroupDuplicateFiles:
+    @staticmethod
+    def test_basic(files):
+        groups = group_duplicate_files(list(files.values()))
+
+        assert sorted(group.filenames for group in groups) == sorted([
+            [files['a/config.py'], files['b/config.py']],
+            [files['c/config.py']],
+            [files['a/config.yaml']],
+            [files['a/other.py']],
+        ])
+
+        group = next(group for group in groups if len(group.filenames) == 2)
+        assert group.duplicates == [files['b/config.py']]
+        assert group.size == len('secret = "foo"\n')
+        assert group.digest == FileContext.read(files['a/config.py']).digest
+
+    @staticmethod
+    def test_only_reads_files_with_same_name_and_size(files):
+        with mock.patch.object(FileContext, 'read', wraps=FileContext.read) as m:
+            group_duplicate_files(list(files.values()))
+
+        assert sorted(call[0][0] for call in m.call_args_list) == sorted([
+            files['a/config.py'],
+            files['b/config.py'],
+            files['c/config.py'],
+        ])
+
+    @staticmethod
+    def test_uses_known_digests(files):
+        filenames = [files['a/config.py'], files['b/config.py']]
+        with mock.patch.object(FileContext, 'read', side_effect=AssertionError):
+            groups = group_duplicate_files(filenames, get_known_digest=lambda _: 'digest')
+
+        assert [group.filenames for group in groups] == [filenames]
+
+    @staticmethod
+    def test_missing_files(files):
+        filenames = [files['a/config.py'], 'does-not-exist/config.py']
+
+        assert sorted(group.filenames for group in group_duplicate_files(filenames)) == sorted([
+            ['does-not-exist/config.py'],
+            [files['a/config.py']],
+        ])
+
+
+class TestIsDeduplicationSupported:
+    @staticmethod
+    def test_basic():
+        assert is_deduplication_supported()
+
+    @staticmethod
+    def test_custom_plugins():
+        get_settings().configure_plugins([
+            {
+                'name': 'HippoDetector',
+                'path': 'file://testing/plugins.py',
+            },
+        ])
+
+        assert not is_deduplication_supported()
+
+    @staticmethod
+    def test_custom_filters():
+        get_settings().filters['file://testing/custom_filters.py::is_invalid_secret'] = {}
+
+        assert not is_deduplication_supported()
@@ -0,0 +1,52 @@
+import pytest
+
+from detect_secrets.core.file_context import FileContext
+
+
+class TestFileContext:
+    @staticmethod
+    @pytest.mark.parametrize(
+        'content',
+        (
+            b'a\nb\n',
+            b'a\r\nb',
+            b'a\rb\r\n\r\n',
+            b'a\x0cb\x0bc\xe2\x80\xa8d\n',
+            b'',
+        ),
+    )
+    def test_same_as_reading_file(tmp_path, content):
+        path = tmp_path / 'file.txt'
+        path.write_bytes(content)
+
+        file_context = FileContext.read(str(path))
+        with open(path) as f:
+            assert file_context.text == f.read()
+
+        with open(path) as f:
+            assert file_context.lines == f.readlines()
+
+        assert file_context.size == len(content)
+
+    @staticmethod
+    def test_open_is_named():
+        file_context = FileContext('file.txt', b'a\nb')
+        file = file_context.open()
+
+        assert file.name == 'file.txt'
+        assert file.readlines() == ['a\n', 'b']
+
+    @staticmethod
+    def test_binary_file():
+        file_context = FileContext('file.txt', b'\x86')
+
+        assert file_context.size == 1
+        with pytest.raises(UnicodeDecodeError):
+            file_context.lines
+
+    @staticmethod
+    def test_transformed_lines():
+        file_context = FileContext('file.yaml', b'key: value\n')
+
+        assert file_context.get_transformed_lines() == ['key: "value"']
+        assert file_context.get_transformed_lines() is file_context.get_transformed_lines()
@@ -0,0 +1,94 @@
+import threading
+from unittest import mock
+
+import pytest
+
+from detect_secrets.core import pipeline
+from detect_secrets.core.file_context import compute_blob_digest
+from detect_secrets.core.pipeline import PrefetchedFile
+
+
+class TestIterateInThread:
+    @staticmethod
+    def test_basic():
+        thread_ids = []
+
+        def generate():
+            thread_ids.append(threading.get_ident())
+            yield from range(100)
+
+        assert list(pipeline.iterate_in_thread(generate(), maxsize=4)) == list(range(100))
+        assert thread_ids != [threading.get_ident()]
+
+    @staticmethod
+    def test_raises_errors():
+        def generate():
+            yield 1
+            raise ValueError
+
+        iterator = pipeline.iterate_in_thread(generate())
+        assert next(iterator) == 1
+        with pytest.raises(ValueError):
+            next(iterator)
+
+    @staticmethod
+    def test_stops_when_closed():
+        is_closed = threading.Event()
+
+        def generate():
+            try:
+                yield from range(100)
+            finally:
+                is_closed.set()
+
+        iterator = pipeline.iterate_in_thread(generate(), maxsize=4)
+        assert next(iterator) == 0
+        iterator.close()
+
+        assert is_closed.is_set()
+
+
+class TestPrefetch:
+    @staticmethod
+    def test_basic(tmp_path):
+        paths = []
+        for index in range(10):
+            path = tmp_path / f'file_{index}.txt'
+            path.write_bytes(b'x' * index)
+            paths.append(str(path))
+
+        files = list(pipeline.prefetch(paths, should_hash=True, max_pending=2))
+
+        assert sorted(files) == sorted(
+            PrefetchedFile(path, b'x' * index, compute_blob_digest(b'x' * index))
+            for index, path in enumerate(paths)
+        )
+
+    @staticmethod
+    def test_workers_read_large_files(tmp_path):
+        path = tmp_path / 'file.txt'
+        path.write_text('content does not matter')
+
+        with mock.patch.object(pipeline, 'MAX_PREFETCH_SIZE', 1):
+            assert list(pipeline.prefetch([str(path)])) == [PrefetchedFile(str(path))]
+
+    @staticmethod
+    def test_workers_read_unreadable_files(tmp_path):
+        path = str(tmp_path / 'does_not_exist.txt')
+        assert list(pipeline.prefetch([path])) == [PrefetchedFile(path)]
+
+
+def test_batch():
+    files = [
+        PrefetchedFile(f'file_{index}.txt', b'x' * size)
+        for index, size in enumerate((5, 5, 1, 1, 1, 1, 10))
+    ]
+
+    assert [
+        [file.path for file in batch]
+        for batch in pipeline.batch(files, max_size=10, max_length=3)
+    ] == [
+        ['file_0.txt', 'file_1.txt'],
+        ['file_2.txt', 'file_3.txt', 'file_4.txt'],
+        ['file_5.txt', 'file_6.txt'],
+    ]
@@ -63,6 +63,31 @@ def test_load_secret_from_dict(kwargs):
     assert new_secret.secret_value is None
 
 
+class TestPack:
+    @staticmethod
+    def test_round_trip():
+        secret = potential_secret_factory(
+            filename='file.py',
+            secret='blah',
+            is_verified=True,
+            is_multiline=True,
+            check_id='CKV_2',
+        )
+        new_secret = PotentialSecret.unpack('file.py', secret.pack())
+
+        assert new_secret.__dict__ == secret.__dict__
+        assert new_secret.json() == secret.json()
+
+    @staticmethod
+    def test_without_secret_value():
+        secret = potential_secret_factory(secret='blah')
+        new_secret = PotentialSecret.unpack(secret.filename, secret.pack(False))
+
+        assert new_secret == secret
+        assert new_secret.secret_value is None
+        assert 'blah' not in secret.pack(False)
+
+
 def test_stringify():
     secret = potential_secret_factory(type='secret_type', secret='blah')
     assert str(secret) == (
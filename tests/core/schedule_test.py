@@ -0,0 +1,63 @@
+from unittest import mock
+
+import pytest
+
+from detect_secrets.core import schedule as module
+from detect_secrets.core.duplicates import FileGroup
+from detect_secrets.core.schedule import schedule
+
+
+def make_groups(**sizes):
+    return [FileGroup([filename], size=size) for filename, size in sizes.items()]
+
+
+class TestSchedule:
+    @staticmethod
+    def test_largest_first():
+        groups = make_groups(small=10, large=1000, medium=100)
+
+        assert schedule(groups, num_workers=4) == [['large'], ['medium'], ['small']]
+
+    @staticmethod
+    def test_batches_small_files():
+        groups = make_groups(large=800, **{f'small_{index}': 25 for index in range(8)})
+
+        # 1000 bytes, spread across 2 workers, makes for batches of (at most) 125 bytes.
+        assert schedule(groups, num_workers=2) == [
+            ['large'],
+            [f'small_{index}' for index in range(5)],
+            [f'small_{index}' for index in range(5, 8)],
+        ]
+
+    @staticmethod
+    def test_max_batch_size():
+        groups = make_groups(**{f'file_{index}': 100 for index in range(20)})
+
+        with mock.patch.object(module, 'MAX_BATCH_SIZE', 300):
+            batches = schedule(groups, num_workers=1)
+
+        assert [len(batch) for batch in batches] == [3, 3, 3, 3, 3, 3, 2]
+
+    @staticmethod
+    def test_max_batch_length():
+        groups = make_groups(**{f'file_{index}': 0 for index in range(5)})
+
+        with mock.patch.object(module, 'MAX_BATCH_LENGTH', 2):
+            batches = schedule(groups, num_workers=1)
+
+        assert [len(batch) for batch in batches] == [2, 2, 1]
+
+    @staticmethod
+    def test_stats_files_of_unknown_size(tmp_path):
+        small = tmp_path / 'small'
+        small.write_text('a')
+        large = tmp_path / 'large'
+        large.write_text('a' * 100)
+
+        groups = [FileGroup([str(small)]), FileGroup([str(large)]), FileGroup(['missing'])]
+        assert schedule(groups, num_workers=4)[0] == [str(large)]
+
+    @staticmethod
+    @pytest.mark.parametrize('groups', ([], make_groups(empty=0)))
+    def test_nothing_to_scan(groups):
+        assert sum(schedule(groups, num_workers=4), []) == [group.filenames[0] for group in groups]
@@ -0,0 +1,57 @@
+import pytest
+
+from detect_secrets.core.shard import Shard
+
+
+FILENAMES = [f'path/to/file_{index}.py' for index in range(100)]
+
+
+class TestParse:
+    @staticmethod
+    def test_basic():
+        assert Shard.parse('2/4') == Shard(index=2, count=4)
+        assert str(Shard.parse('2/4')) == '2/4'
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        'value',
+        (
+            '0/4',
+            '5/4',
+            '1/0',
+            '1',
+            '1/2/3',
+            'a/b',
+        ),
+    )
+    def test_invalid(value):
+        with pytest.raises(ValueError):
+            Shard.parse(value)
+
+
+class TestContains:
+    @staticmethod
+    def test_shards_partition_files():
+        shards = [Shard(index, 4) for index in range(1, 5)]
+        for filename in FILENAMES:
+            assert sum(shard.contains(filename) for shard in shards) == 1
+
+        # NOTE: Files should be spread out, rather than all land in the same shard.
+        assert all(
+            any(shard.contains(filename) for filename in FILENAMES)
+            for shard in shards
+        )
+
+    @staticmethod
+    def test_single_shard_contains_everything():
+        assert all(Shard(1, 1).contains(filename) for filename in FILENAMES)
+
+    @staticmethod
+    def test_paths_are_normalized():
+        shard = next(
+            shard
+            for shard in (Shard(index, 8) for index in range(1, 9))
+            if shard.contains('path/to/file.py')
+        )
+
+        assert shard.contains('./path/to/../to/file.py')
@@ -0,0 +1,32 @@
+import pytest
+
+from detect_secrets.core.stats import CacheStats
+from detect_secrets.core.stats import report_stats
+
+
+def test_str():
+    assert str(CacheStats('Line memo', hits=1, misses=3)) == (
+        'Line memo: 1 hits, 3 misses (hit rate: 0.25)'
+    )
+    assert CacheStats('Line memo').hit_rate == 0
+
+
+def test_add():
+    assert CacheStats('Scan cache', 1, 2) + CacheStats('Scan cache', 3, 4) == (
+        CacheStats('Scan cache', 4, 6)
+    )
+
+    with pytest.raises(TypeError):
+        CacheStats('Scan cache') + CacheStats('Line memo')
+
+    with pytest.raises(TypeError):
+        CacheStats('Scan cache') + 1
+
+
+def test_report_stats(mock_log):
+    report_stats(CacheStats('Line memo', 1, 0), None, CacheStats('Scan cache', 0, 1))
+
+    assert mock_log.debug_messages == (
+        'Line memo: 1 hits, 0 misses (hit rate: 1.00)\n'
+        'Scan cache: 0 hits, 1 misses (hit rate: 0.00)\n'
+    )
@@ -1,4 +1,6 @@
 import json
+import os
+from unittest import mock
 
 import pytest
 
@@ -40,3 +42,47 @@ def test_default_plugins_initialized(parser):
     assert len(get_settings().plugins) == len(get_mapping_from_secret_type_to_class())
     assert plugins.initialize.from_plugin_classname('HexHighEntropyString').entropy_limit == 2
     assert plugins.initialize.from_plugin_classname('Base64HighEntropyString').entropy_limit == 4.5
+
+
+class TestCacheDir:
+    @staticmethod
+    def test_disabled_by_default(parser):
+        with mock.patch.dict(os.environ, clear=True):
+            assert parser.parse_args(['scan']).cache_dir is None
+
+    @staticmethod
+    def test_default_directory(parser):
+        assert parser.parse_args(['scan', '--cache-dir']).cache_dir == '.detect-secrets-cache'
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        'argv, expected',
+        (
+            (['scan'], 'from-env'),
+            (['scan', '--cache-dir', 'custom'], 'custom'),
+            (['scan', '--no-cache'], None),
+        ),
+    )
+    def test_environment_variable(parser, argv, expected):
+        with mock.patch.dict(os.environ, {'DETECT_SECRETS_CACHE_DIR': 'from-env'}):
+            assert parser.parse_args(argv).cache_dir == expected
+
+
+class TestVerificationCacheDir:
+    @staticmethod
+    def test_disabled_by_default(parser):
+        with mock.patch.dict(os.environ, clear=True):
+            assert parser.parse_args(['scan']).verification_cache_dir is None
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        'argv, expected',
+        (
+            (['scan'], 'from-env'),
+            (['scan', '--verification-cache-dir'], '.detect-secrets-cache'),
+            (['scan', '--verification-cache-dir', 'custom'], 'custom'),
+        ),
+    )
+    def test_environment_variable(parser, argv, expected):
+        with mock.patch.dict(os.environ, {'DETECT_SECRETS_VERIFICATION_CACHE_DIR': 'from-env'}):
+            assert parser.parse_args(argv).verification_cache_dir == expected
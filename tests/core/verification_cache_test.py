@@ -0,0 +1,116 @@
+import os
+import time
+from unittest import mock
+
+import pytest
+
+from detect_secrets.constants import VerifiedResult
+from detect_secrets.core import scan
+from detect_secrets.core import verification
+from detect_secrets.core.verification_cache import VerificationCache
+from detect_secrets.plugins.aws import AWSKeyDetector
+from detect_secrets.plugins.high_entropy_strings import HexHighEntropyString
+from testing.verification import configure
+from testing.verification import run_stub_server
+
+
+KEY = ('AWS Access Key', 'hash', ('plaintext_secret_access_key',))
+
+
+@pytest.fixture
+def server(mocked_requests):
+    with run_stub_server() as server:
+        mocked_requests.add_passthru(server.url)
+        yield server
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    return str(tmp_path / 'cache')
+
+
+@pytest.fixture
+def filename(tmp_path):
+    path = tmp_path / 'file.py'
+    path.write_text('first = "stub_1"\nsecond = "stub_2"\n')
+    return str(path)
+
+
+class TestVerificationCache:
+    @staticmethod
+    @pytest.mark.parametrize(
+        'result',
+        (
+            VerifiedResult.VERIFIED_TRUE,
+            VerifiedResult.VERIFIED_FALSE,
+        ),
+    )
+    def test_persists_results(cache_dir, result):
+        with VerificationCache(cache_dir) as cache:
+            assert cache.get(AWSKeyDetector(), KEY) is None
+            cache.put(AWSKeyDetector(), KEY, result)
+
+        with VerificationCache(cache_dir) as cache:
+            assert cache.get(AWSKeyDetector(), KEY) == result
+
+        assert (cache.hits, cache.misses) == (1, 0)
+
+    @staticmethod
+    def test_unverified_results_are_not_cached_by_default(cache_dir):
+        with VerificationCache(cache_dir) as cache:
+            cache.put(AWSKeyDetector(), KEY, VerifiedResult.UNVERIFIED)
+            assert cache.get(AWSKeyDetector(), KEY) is None
+
+    @staticmethod
+    def test_results_expire(cache_dir):
+        ttls = {VerifiedResult.VERIFIED_TRUE: 60}
+        with VerificationCache(cache_dir, ttls=ttls) as cache:
+            cache.put(AWSKeyDetector(), KEY, VerifiedResult.VERIFIED_TRUE)
+
+        with VerificationCache(cache_dir, ttls=ttls) as cache:
+            with mock.patch.object(time, 'time', return_value=time.time() + 61):
+                assert cache.get(AWSKeyDetector(), KEY) is None
+
+    @staticmethod
+    def test_keyed_by_plugin_configuration(cache_dir):
+        key = ('Hex High Entropy String', 'hash', None)
+        with VerificationCache(cache_dir) as cache:
+            cache.put(HexHighEntropyString(limit=3), key, VerifiedResult.VERIFIED_FALSE)
+
+            assert cache.get(HexHighEntropyString(limit=3), key)
+            assert cache.get(HexHighEntropyString(limit=2), key) is None
+
+    @staticmethod
+    def test_never_stores_plaintext(cache_dir):
+        with VerificationCache(cache_dir) as cache:
+            cache.put(AWSKeyDetector(), KEY, VerifiedResult.VERIFIED_TRUE)
+
+        for filename in os.listdir(cache_dir):
+            with open(os.path.join(cache_dir, filename), 'rb') as f:
+                assert b'plaintext_secret_access_key' not in f.read()
+
+
+class TestVerification:
+    @staticmethod
+    def test_results_are_reused_across_scans(server, cache_dir, filename):
+        configure(server, VerifiedResult.UNVERIFIED)
+        for _ in range(2):
+            with VerificationCache(cache_dir) as cache, verification.use_cache(cache):
+                secrets = list(scan.scan_file(filename))
+
+            assert [secret.line_number for secret in secrets] == [2]
+            assert secrets[0].is_verified
+
+        assert sorted(server.requests) == ['/stub_1', '/stub_2']
+        assert (cache.hits, cache.misses) == (2, 0)
+
+    @staticmethod
+    def test_inline_verification(server, cache_dir):
+        configure(server, VerifiedResult.UNVERIFIED)
+        for _ in range(2):
+            with VerificationCache(cache_dir) as cache, verification.use_cache(cache):
+                secrets = list(scan.scan_line('stub_2'))
+
+            assert [secret.is_verified for secret in secrets] == [True]
+
+        assert server.requests == ['/stub_2']
@@ -0,0 +1,134 @@
+import os
+from unittest import mock
+
+import pytest
+
+from detect_secrets.core import walk as module
+from detect_secrets.core.walk import walk
+from detect_secrets.settings import transient_settings
+
+
+@pytest.fixture
+def root(tmp_path):
+    for filename in (
+        'README.md',
+        'logo.png',
+        'src/main.py',
+        'src/lib/util.py',
+        'node_modules/package/index.js',
+        'node_modules/package/lib/index.js',
+    ):
+        path = tmp_path / filename
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text('content does not matter')
+
+    (tmp_path / 'link.py').symlink_to(tmp_path / 'src/main.py')
+    (tmp_path / 'linked_directory').symlink_to(tmp_path / 'src')
+
+    return str(tmp_path)
+
+
+@pytest.fixture
+def listed_directories():
+    output = []
+    scandir = os.scandir
+
+    def mock_scandir(path):
+        output.append(os.path.basename(path))
+        return scandir(path)
+
+    with mock.patch.object(module.os, 'scandir', mock_scandir):
+        yield output
+
+
+def walk_files(root, **kwargs):
+    return list(walk(root, root=root, **kwargs))
+
+
+class TestWalk:
+    @staticmethod
+    @pytest.mark.parametrize('num_threads', (0, 4))
+    def test_same_order_as_os_walk(root, num_threads):
+        expected = [
+            os.path.relpath(os.path.realpath(os.path.join(path, filename)), root)
+            for path, _, filenames in os.walk(root)
+            for filename in filenames
+            if filename != 'logo.png'
+        ]
+
+        assert walk_files(root, num_threads=num_threads) == expected
+        assert 'src/main.py' in expected
+
+    @staticmethod
+    def test_does_not_follow_symlinked_directories(root):
+        assert not any(
+            filename.startswith('linked_directory')
+            for filename in walk_files(root)
+        )
+
+    @staticmethod
+    def test_resolves_symlinks(root):
+        assert walk_files(root).count('src/main.py') == 2
+
+    @staticmethod
+    def test_skips_non_text_files_if_filtered(root):
+        with transient_settings({'filters_used': []}) as settings:
+            settings.disable_filters('detect_secrets.filters.heuristic.is_non_text_file')
+            assert 'logo.png' in walk_files(root)
+
+        assert 'logo.png' not in walk_files(root)
+
+    @staticmethod
+    def test_prunes_untracked_directories(root, listed_directories):
+        tracked_files = {'README.md', 'src/lib/util.py'}
+
+        assert walk_files(root, tracked_files=tracked_files) == ['README.md', 'src/lib/util.py']
+        assert 'node_modules' not in listed_directories
+        assert 'lib' in listed_directories
+
+    @staticmethod
+    def test_prunes_excluded_directories(root, listed_directories):
+        with transient_settings({
+            'filters_used': [
+                {
+                    'path': 'detect_secrets.filters.regex.should_exclude_file',
+                    'pattern': ['node_modules/'],
+                },
+            ],
+        }):
+            filenames = walk_files(root)
+
+        assert not any(filename.startswith('node_modules') for filename in filenames)
+        assert 'node_modules' not in listed_directories
+
+    @staticmethod
+    def test_excluded_directories_are_relative_to_filter_root(root, listed_directories):
+        with transient_settings({
+            'filters_used': [
+                {
+                    'path': 'detect_secrets.filters.regex.should_exclude_file',
+                    'pattern': ['^repo/node_modules/'],
+                },
+            ],
+        }):
+            walk_files(root, filter_root='repo')
+
+        assert 'node_modules' not in listed_directories
+
+
+@pytest.mark.parametrize(
+    'pattern, is_safe',
+    (
+        ('node_modules/', True),
+        ('^tests/', True),
+        (r'.*\.min\.js', True),
+        (r'\.py$', False),
+        (r'tests/\Z', False),
+        (r'\btests\b', False),
+        ('tests/(?!keep)', False),
+        ('(?>tests/.*)', False),
+        ('tests/.*+', False),
+    ),
+)
+def test_is_prefix_safe(pattern, is_safe):
+    assert module._is_prefix_safe(pattern) is is_safe
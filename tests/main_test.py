@@ -15,6 +15,7 @@ from detect_secrets.core import baseline
 from detect_secrets.core.secrets_collection import SecretsCollection
 from detect_secrets.main import scan_adhoc_string
 from detect_secrets.settings import transient_settings
+from detect_secrets.util import git
 from testing.mocks import disable_gibberish_filter
 from testing.mocks import mock_named_temporary_file
 from testing.mocks import mock_printer
@@ -80,6 +81,30 @@ class TestScan:
             results = json.loads(printer.message)['results']
             assert results
 
+    @staticmethod
+    def test_prefetch():
+        outputs = []
+        for argv in ([], ['--prefetch']):
+            with mock_printer(main_module) as printer:
+                assert main_module.main(['scan', 'test_data', *argv]) == 0
+
+            outputs.append(json.loads(printer.message)['results'])
+
+        assert outputs[0] == outputs[1]
+        assert outputs[0]
+
+    @staticmethod
+    def test_threads_backend():
+        outputs = []
+        for argv in ([], ['--backend', 'threads']):
+            with mock_printer(main_module) as printer:
+                assert main_module.main(['scan', 'test_data', '--all-files', *argv]) == 0
+
+            outputs.append(json.loads(printer.message)['results'])
+
+        assert outputs[0] == outputs[1]
+        assert outputs[0]
+
 
 class TestSlimScan:
     @staticmethod
@@ -116,6 +141,101 @@ class TestSlimScan:
             assert list(secrets[file_b])[0].line_number
 
 
+class TestIncrementalScan:
+    @staticmethod
+    @pytest.fixture
+    def repo(tmp_path):
+        repo = tmp_path / 'repo'
+        subprocess.check_output(['git', 'init', str(repo)])
+        (repo / 'credentials.yaml').write_text('secret: asxeqFLAGMEfxuwma!\n')
+        subprocess.check_output(['git', '-C', str(repo), 'add', '--all'])
+        subprocess.check_output([
+            'git', '-C', str(repo),
+            '-c', 'user.name=test', '-c', 'user.email=test@example.com',
+            'commit', '--quiet', '--message', 'commit',
+        ])
+
+        return repo
+
+    @staticmethod
+    def scan(repo, *argv):
+        with mock_printer(main_module) as printer:
+            assert main_module.main(['-C', str(repo), 'scan', '--incremental', *argv]) == 0
+
+        return printer.message
+
+    def test_records_commit(self, repo):
+        output = json.loads(self.scan(repo))
+
+        assert output['generated_at_commit'] == git.get_head_commit(str(repo))
+        assert output['results']
+
+    def test_refreshes_baseline(self, repo, tmp_path, mock_log):
+        baseline_file = tmp_path / '.secrets.baseline'
+        baseline_file.write_text(self.scan(repo))
+
+        with mock.patch.object(baseline, 'create') as m:
+            self.scan(repo, '--baseline', str(baseline_file))
+
+        assert not m.called
+        assert 'Unable to scan incrementally' not in mock_log.info_messages
+        assert json.loads(baseline_file.read_text())['results']
+
+    def test_falls_back_to_full_scan(self, repo, tmp_path, mock_log):
+        baseline_file = tmp_path / '.secrets.baseline'
+        baseline_file.write_text(self.scan(repo))
+
+        self.scan(repo, '--baseline', str(baseline_file), '--disable-plugin', 'AWSKeyDetector')
+
+        assert (
+            'Unable to scan incrementally (baseline was generated with different settings)'
+            in mock_log.info_messages
+        )
+
+        # Options still apply, after comparing against the baseline's own settings.
+        output = json.loads(baseline_file.read_text())
+        assert output['results']
+        assert 'AWSKeyDetector' not in {plugin['name'] for plugin in output['plugins_used']}
+
+
+class TestMergeBaselines:
+    @staticmethod
+    def scan(*argv):
+        with mock_printer(main_module) as printer:
+            assert main_module.main(['scan', 'test_data/files', '--all-files', *argv]) == 0
+
+        return json.loads(printer.message)
+
+    def test_basic(self, tmp_path):
+        filenames = []
+        for index in range(1, 3):
+            output = self.scan('--shard', f'{index}/2')
+            assert output['shard'] == f'{index}/2'
+
+            filenames.append(str(tmp_path / f'{index}.baseline'))
+            with open(filenames[-1], 'w') as f:
+                json.dump(output, f)
+
+        with mock_printer(main_module) as printer:
+            assert main_module.main(['merge-baselines', *filenames]) == 0
+
+        assert json.loads(printer.message)['results'] == self.scan()['results']
+
+    def test_missing_shard(self, tmp_path, capsys):
+        filename = str(tmp_path / '1.baseline')
+        with open(filename, 'w') as f:
+            json.dump(self.scan('--shard', '1/2'), f)
+
+        assert main_module.main(['merge-baselines', filename]) == 1
+        assert 'Unable to merge baselines' in capsys.readouterr().err
+
+    @staticmethod
+    @pytest.mark.parametrize('shard', ('0/2', '3/2', 'invalid'))
+    def test_invalid_shard(shard):
+        with pytest.raises(SystemExit):
+            main_module.main(['scan', '--shard', shard])
+
+
 class TestScanString:
     @staticmethod
     def test_basic():
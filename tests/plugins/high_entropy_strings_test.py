@@ -1,3 +1,5 @@
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 
 from detect_secrets.plugins.high_entropy_strings import Base64HighEntropyString
@@ -139,3 +141,15 @@ class TestHexEntropyCalculation:
             HexHighEntropyString().calculate_shannon_entropy(value)
             == original_hex_detector().calculate_shannon_entropy(value)
         )
+
+
+def test_non_quoted_string_regex_only_applies_to_current_thread():
+    plugin = HexHighEntropyString()
+    secret = '2b00042f7481c7b056c4b410d28f33cf'
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        with plugin.non_quoted_string_regex():
+            assert list(plugin.analyze_string(secret)) == [secret]
+            assert not executor.submit(lambda: list(plugin.analyze_string(secret))).result()
+
+    assert not list(plugin.analyze_string(secret))
@@ -6,6 +6,7 @@ import pytest
 from detect_secrets.core.scan import scan_line
 from detect_secrets.plugins.keyword import KeywordDetector
 from detect_secrets.settings import transient_settings
+from detect_secrets.util.filetype import FileType
 
 
 COMMON_SECRET = 'm{{h}o)p${e]nob(ody[finds>-_$#thisone}}'
@@ -231,6 +232,18 @@ def test_keyword(file_extension, line, expected_secret):
         assert not secrets
 
 
+def test_keyword_uses_supplied_file_type():
+    line = 'password = {}'.format(COMMON_SECRET)
+    assert not KeywordDetector().analyze_line(filename='mock_filename.py', line=line)
+
+    secrets = KeywordDetector().analyze_line(
+        filename='mock_filename.py',
+        line=line,
+        file_type=FileType.CONFIG,
+    )
+    assert [secret.secret_value for secret in secrets] == [COMMON_SECRET]
+
+
 @pytest.fixture(autouse=True)
 def use_keyword_detector():
     with transient_settings({
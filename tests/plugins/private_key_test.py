@@ -1,8 +1,12 @@
+import contextvars
 import json
+from concurrent.futures import ThreadPoolExecutor
 
 import pytest
 
 from detect_secrets.core.secrets_collection import SecretsCollection
+from detect_secrets.plugins.base import scan_scope
+from detect_secrets.plugins.private_key import PrivateKeyDetector
 from detect_secrets.settings import transient_settings
 from testing.mocks import mock_named_temporary_file
 
@@ -156,3 +160,25 @@ def configure_plugins():
         'plugins_used': [{'name': 'PrivateKeyDetector'}],
     }):
         yield
+
+
+def test_files_are_tracked_per_scan():
+    plugin = PrivateKeyDetector()
+    plugin._analyzed_files.add('file.pem')
+
+    with scan_scope():
+        assert plugin._analyzed_files == set()
+        plugin._analyzed_files.add('other.pem')
+
+        # NOTE: Threads that scan with the plugin run in their own scope (see `ScanPool`).
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            assert executor.submit(
+                lambda: contextvars.Context().run(_get_analyzed_files_in_scope, plugin),
+            ).result() == set()
+
+    assert plugin._analyzed_files == {'file.pem'}
+
+
+def _get_analyzed_files_in_scope(plugin):
+    with scan_scope():
+        return set(plugin._analyzed_files)
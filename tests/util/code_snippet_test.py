@@ -1,5 +1,6 @@
 import pytest
 
+from detect_secrets.util.code_snippet import CodeSnippet
 from detect_secrets.util.code_snippet import get_code_snippet
 
 
@@ -24,3 +25,54 @@ def test_target_line():
 
 def test_previous_line():
     assert get_code_snippet(list('abcde'), 3, lines_of_context=2).previous_line == 'b'
+
+
+class TestLazyView:
+    @staticmethod
+    def test_does_not_copy_lines_until_modified():
+        lines = list('abcde')
+        snippet = get_code_snippet(lines, 3, lines_of_context=1)
+
+        assert snippet._lines is None
+        assert list(snippet) == ['b', 'c', 'd']
+        assert str(snippet) == 'b\nc\nd'
+        assert snippet.target_line == 'c'
+        assert snippet.previous_line == 'b'
+        assert snippet._lines is None
+
+        snippet.target_line = 'C'
+        assert snippet.lines == ['b', 'C', 'd']
+        assert lines == list('abcde')
+
+    @staticmethod
+    def test_add_line_numbers_does_not_modify_source():
+        lines = list('abcde')
+        snippet = get_code_snippet(lines, 5, lines_of_context=1).add_line_numbers()
+
+        assert [line.split(':')[-1] for line in snippet] == ['d', 'e']
+        assert lines == list('abcde')
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        'line_number',
+        (1, 2, 3, 4, 5, 6),
+    )
+    def test_same_as_copied_snippet(line_number):
+        lines = list('abcde')
+        snippet = get_code_snippet(lines, line_number, lines_of_context=2)
+        copied_snippet = CodeSnippet(
+            snippet=list(snippet.lines),
+            start_line=snippet.start_line,
+            target_index=snippet.target_index,
+        )
+
+        snippet = get_code_snippet(lines, line_number, lines_of_context=2)
+        assert list(snippet) == list(copied_snippet)
+        assert snippet.previous_line == copied_snippet.previous_line
+        try:
+            expected = copied_snippet.target_line
+        except IndexError:
+            with pytest.raises(IndexError):
+                snippet.target_line
+        else:
+            assert snippet.target_line == expected
@@ -0,0 +1,177 @@
+import os
+import subprocess
+
+import pytest
+
+from detect_secrets.core.file_context import FileContext
+from detect_secrets.util.git import get_staged_diff
+from detect_secrets.util.git import get_staged_files
+from detect_secrets.util.git import get_tracked_file_digests
+from detect_secrets.util.git import get_tracked_files
+from detect_secrets.util.git import iter_tracked_files
+
+
+@pytest.fixture
+def repo(tmp_path):
+    subprocess.check_output(['git', 'init', str(tmp_path)])
+    return tmp_path
+
+
+class TestIterTrackedFiles:
+    @staticmethod
+    def test_basic(repo):
+        (repo / 'file.txt').write_text('foo\n')
+        (repo / 'directory').mkdir()
+        (repo / 'directory' / 'file with spaces*.txt').write_text('bar\n')
+        (repo / 'untracked.txt').write_text('baz\n')
+        os.symlink('file.txt', repo / 'link.txt')
+        subprocess.check_output(['git', '-C', str(repo), 'add', 'file.txt', 'directory', 'link.txt'])
+
+        assert list(iter_tracked_files(str(repo))) == [
+            ('100644', os.path.join('directory', 'file with spaces*.txt')),
+            ('100644', 'file.txt'),
+            ('120000', 'link.txt'),
+        ]
+
+    @staticmethod
+    def test_excludes_deleted_files(repo):
+        for name in ('deleted.txt', 'file.txt'):
+            (repo / name).write_text('foo\n')
+
+        subprocess.check_output(['git', '-C', str(repo), 'add', '.'])
+        os.remove(repo / 'deleted.txt')
+
+        assert list(iter_tracked_files(str(repo))) == [('100644', 'file.txt')]
+
+    @staticmethod
+    def test_paths(repo):
+        for name in ('file.txt', 'first/file.txt', 'second/file.txt', 'second*/file.txt'):
+            (repo / name).parent.mkdir(exist_ok=True)
+            (repo / name).write_text('foo\n')
+
+        subprocess.check_output(['git', '-C', str(repo), 'add', '.'])
+
+        # NOTE: Paths are taken literally, rather than as patterns.
+        assert [
+            filename
+            for _, filename in iter_tracked_files(str(repo), 'file.txt', 'second*')
+        ] == ['file.txt', os.path.join('second*', 'file.txt')]
+
+    @staticmethod
+    def test_stops_git_when_closed(repo):
+        for index in range(100):
+            (repo / f'file_{index}.txt').write_text('foo\n')
+
+        subprocess.check_output(['git', '-C', str(repo), 'add', '.'])
+
+        iterator = iter_tracked_files(str(repo))
+        assert next(iterator)
+        iterator.close()
+
+    @staticmethod
+    def test_not_a_repository(tmp_path):
+        with pytest.raises(subprocess.CalledProcessError):
+            list(iter_tracked_files(str(tmp_path)))
+
+        assert get_tracked_files(str(tmp_path)) == set()
+
+
+class TestGetTrackedFileDigests:
+    @staticmethod
+    def test_same_as_content_hash(repo):
+        (repo / 'file.txt').write_text('hello world\n')
+        (repo / 'directory').mkdir()
+        (repo / 'directory' / 'file with spaces.txt').write_text('foo\n')
+        subprocess.check_output(['git', '-C', str(repo), 'add', '.'])
+
+        digests = get_tracked_file_digests(str(repo))
+        assert digests == {
+            str(path): FileContext.read(str(path)).digest
+            for path in (repo / 'file.txt', repo / 'directory' / 'file with spaces.txt')
+        }
+
+    @staticmethod
+    def test_excludes_modified_files(repo):
+        (repo / 'modified.txt').write_text('foo\n')
+        (repo / 'deleted.txt').write_text('bar\n')
+        (repo / 'untracked.txt').write_text('baz\n')
+        subprocess.check_output(['git', '-C', str(repo), 'add', 'modified.txt', 'deleted.txt'])
+
+        (repo / 'modified.txt').write_text('changed\n')
+        os.remove(repo / 'deleted.txt')
+
+        assert get_tracked_file_digests(str(repo)) == {}
+
+    @staticmethod
+    def test_excludes_symbolic_links(repo):
+        (repo / 'file.txt').write_text('foo\n')
+        os.symlink('file.txt', repo / 'link.txt')
+        subprocess.check_output(['git', '-C', str(repo), 'add', '.'])
+
+        assert list(get_tracked_file_digests(str(repo))) == [str(repo / 'file.txt')]
+
+    @staticmethod
+    def test_not_a_repository(tmp_path):
+        assert get_tracked_file_digests(str(tmp_path)) == {}
+
+
+class TestGetStagedDiff:
+    @staticmethod
+    def test_only_includes_staged_changes(repo, monkeypatch):
+        monkeypatch.chdir(repo)
+        (repo / 'file.txt').write_text('foo\nbar\n')
+        subprocess.check_output(['git', 'add', 'file.txt'])
+        (repo / 'file.txt').write_text('foo\nbar\nunstaged\n')
+
+        diff = get_staged_diff('file.txt', context=0)
+        assert '+++ b/file.txt' in diff
+        assert '+bar' in diff
+        assert 'unstaged' not in diff
+
+    @staticmethod
+    def test_paths_are_relative(repo, monkeypatch):
+        (repo / 'directory').mkdir()
+        (repo / 'directory' / 'file*.txt').write_text('foo\n')
+        (repo / 'directory' / 'file.txt').write_text('bar\n')
+        subprocess.check_output(['git', '-C', str(repo), 'add', '.'])
+
+        # NOTE: Paths are taken literally, rather than as patterns.
+        monkeypatch.chdir(repo / 'directory')
+        diff = get_staged_diff('file*.txt')
+        assert '+++ b/file*.txt' in diff
+        assert 'bar' not in diff
+
+    @staticmethod
+    def test_not_a_repository(tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        with pytest.raises(subprocess.CalledProcessError):
+            get_staged_diff('file.txt')
+
+
+class TestGetStagedFiles:
+    @staticmethod
+    def test_basic(repo, monkeypatch):
+        (repo / 'directory').mkdir()
+        (repo / 'directory' / 'file.txt').write_text('staged\n')
+        (repo / 'directory' / 'other file.txt').write_text('')
+        subprocess.check_output(['git', '-C', str(repo), 'add', '.'])
+        (repo / 'directory' / 'file.txt').write_text('unstaged\n')
+
+        monkeypatch.chdir(repo / 'directory')
+        assert get_staged_files('file.txt', 'other file.txt') == {
+            'file.txt': b'staged\n',
+            'other file.txt': b'',
+        }
+
+    @staticmethod
+    def test_not_staged(repo, monkeypatch):
+        monkeypatch.chdir(repo)
+        (repo / 'file.txt').write_text('foo\n')
+        (repo / 'staged.txt').write_text('bar\n')
+        subprocess.check_output(['git', '-C', str(repo), 'add', 'staged.txt'])
+
+        assert get_staged_files('file.txt', 'staged.txt') == {'staged.txt': b'bar\n'}
+
+    @staticmethod
+    def test_no_files():
+        assert get_staged_files() == {}
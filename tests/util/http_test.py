@@ -0,0 +1,43 @@
+from unittest import mock
+
+import pytest
+import requests
+
+from detect_secrets.util import http
+from detect_secrets.util.http import get_session
+from detect_secrets.util.http import TimeoutHTTPAdapter
+
+
+class TestGetSession:
+    @staticmethod
+    def test_reused_within_process():
+        assert get_session() is get_session()
+
+    @staticmethod
+    def test_not_shared_with_child_processes():
+        session = get_session()
+        with mock.patch.object(http.os, 'getpid', return_value=-1):
+            assert get_session() is not session
+
+
+
+class TestTimeoutHTTPAdapter:
+    @staticmethod
+    @pytest.mark.parametrize(
+        'kwargs, expected_timeout',
+        (
+            ({}, 5),
+            ({'timeout': None}, 5),
+            ({'timeout': 1}, 1),
+        ),
+    )
+    def test_default_timeout(kwargs, expected_timeout):
+        request = requests.Request('GET', 'https://example.com').prepare()
+        with mock.patch.object(requests.adapters.HTTPAdapter, 'send') as m:
+            TimeoutHTTPAdapter(timeout=5).send(request, **kwargs)
+
+        assert m.call_args[1]['timeout'] == expected_timeout
+
+    @staticmethod
+    def test_session_uses_adapter():
+        assert isinstance(get_session().get_adapter('https://example.com'), TimeoutHTTPAdapter)
@@ -0,0 +1,66 @@
+import pytest
+
+from detect_secrets.util.inject import call_function_with_arguments
+from detect_secrets.util.inject import get_call_adapter
+
+
+def filter_function(filename, secret, plugin=None):
+    return filename, secret, plugin
+
+
+class MockPlugin:
+    def analyze_line(self, filename, line, context=None, **kwargs):
+        return filename, line, context, kwargs
+
+
+class TestGetCallAdapter:
+    @staticmethod
+    def test_only_passes_accepted_parameters():
+        adapter = get_call_adapter(filter_function, ('filename', 'line', 'secret'))
+
+        assert adapter('file.py', 'line', 'secret') == ('file.py', 'secret', None)
+
+    @staticmethod
+    def test_binds_methods():
+        adapter = get_call_adapter(
+            MockPlugin().analyze_line,
+            ('filename', 'line', 'line_number', 'context'),
+        )
+
+        # NOTE: Variable keyword arguments are not injected into, just like with
+        # `call_function_with_arguments`.
+        assert adapter('file.py', 'line', 1, 'context') == ('file.py', 'line', 'context', {})
+
+    @staticmethod
+    def test_same_results_as_call_function_with_arguments():
+        function = MockPlugin().analyze_line
+        kwargs = {'line_number': 1, 'line': 'line', 'context': 'context'}
+        adapter = get_call_adapter(function, tuple(kwargs))
+
+        with pytest.raises(TypeError):
+            call_function_with_arguments(function, **kwargs)
+
+        with pytest.raises(TypeError):
+            adapter(*kwargs.values())
+
+        kwargs['filename'] = 'file.py'
+        adapter = get_call_adapter(function, tuple(kwargs))
+        assert adapter(*kwargs.values()) == call_function_with_arguments(function, **kwargs)
+
+    @staticmethod
+    def test_passes_arguments_in_any_order():
+        def function(secret, plugin=None, *, line=None, filename):
+            return secret, plugin, line, filename
+
+        adapter = get_call_adapter(function, ('filename', 'line', 'secret', 'plugin'))
+        assert adapter('file.py', 'line', 'secret', 'plugin') == (
+            'secret', 'plugin', 'line', 'file.py',
+        )
+
+        # Arguments after a missing one can only be passed by keyword.
+        adapter = get_call_adapter(filter_function, ('plugin', 'filename'))
+        with pytest.raises(TypeError):
+            adapter('plugin', 'file.py')
+
+        adapter = get_call_adapter(filter_function, ('plugin', 'secret', 'filename'))
+        assert adapter('plugin', 'secret', 'file.py') == ('file.py', 'secret', 'plugin')
@@ -0,0 +1,50 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from detect_secrets.util import threads
+from detect_secrets.util.threads import is_gil_enabled
+from detect_secrets.util.threads import synchronized_cache
+
+
+class TestSynchronizedCache:
+    @staticmethod
+    def test_computed_once_by_concurrent_callers():
+        num_calls = 0
+
+        @synchronized_cache
+        def get_value():
+            nonlocal num_calls
+            num_calls += 1
+
+            # NOTE: This gives other threads a chance to compute it too.
+            time.sleep(0.05)
+            return object()
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            values = list(executor.map(lambda _: get_value(), range(4)))
+
+        assert num_calls == 1
+        assert all(value is values[0] for value in values)
+
+    @staticmethod
+    def test_cache_clear():
+        get_value = synchronized_cache(object)
+
+        value = get_value()
+        assert get_value() is value
+
+        get_value.cache_clear()
+        assert get_value() is not value
+
+
+class TestIsGilEnabled:
+    @staticmethod
+    def test_builds_without_free_threading():
+        with mock.patch.object(threads, 'sys', spec=[]):
+            assert is_gil_enabled()
+
+    @staticmethod
+    def test_free_threaded_builds():
+        with mock.patch.object(threads.sys, '_is_gil_enabled', create=True, return_value=False):
+            assert not is_gil_enabled()